@@ -3,17 +3,52 @@ import os
 from agno.agent import Agent
 from agno.team import Team
 from agno.models.base import Model
+from agno.db.base import BaseDb
+from typing import Optional
 
-from agents.tools import WEATHER_AGENT, VEHICLES_AGENT, EMPLOYEES_AGENT, HARVEST_AGENT
+from agents.coordinator import PARALLEL_DELEGATE_TOOL, PARALLEL_MEMBERS_ENABLED, ParallelCoordinator
+from agents.profiles import RunProfile, apply_run_profile, get_run_profile
+from agents.tools import WEATHER_AGENT, VEHICLES_AGENT, EMPLOYEES_AGENT, HARVEST_AGENT, BRIEFING_AGENT
 
 from models.model import get_gemini_model, get_openrouter_model
 
+# Appended to the agents whose tools can return long per-day results (see mcp_server/compaction.py)
+COMPACT_RESULTS_INSTRUCTIONS = """
+        ──────────────────────────────────────────────────────────────────────
+        ### LONG RESULTS (TABLES, SUMMARY AND PAGES)
+        - Lists of records may come as tables: {"columns": [...], "rows": [[...], ...]}; every row follows the column order.
+        - When a result is larger than the tool's budget it contains a "summary" (totals) and a "pagination" entry:
+        only the first page of the detail rows is included.
+        - Answer from the summary whenever it is enough. Call the same tool again with the same arguments and page=2, 3, ...
+        only when the question really needs more detail rows, and never fetch every page of a long period.
+        """
+
+# Appended to the team lead's instructions when members can run in parallel (see agents/coordinator.py)
+PARALLEL_DELEGATION_INSTRUCTIONS = f"""
+            ────────────────────────────────────────────────
+            SEVERAL AGENTS FOR ONE QUESTION → {PARALLEL_DELEGATE_TOOL} (ONE call)
+            ────────────────────────────────────────────────
+            When a question needs two or more agents (and get_farm_briefing does not cover it), do NOT
+            delegate to them one after another. Call {PARALLEL_DELEGATE_TOOL} once with one entry per agent:
+            tasks=[{{"member_id": "<agent id>", "task": "<complete task, with every date and name it needs>"}}, ...]
+            The agents work at the same time and their answers come back in one result, one section per agent.
+            A section marked PARTIAL comes from an agent that ran out of time: use what it contains and say
+            which part of the answer is incomplete. A section marked FAILED has no data: say so, never fill it in.
+            Use delegate_task_to_member only when a single agent is needed.
+        """
+
 def build_farmers_team(agent1_model: Model,
                        agent2_model: Model,
                        agent3_model: Model,
                        agent4_model: Model,
-                       team_model: Model) -> Team:
-    
+                       team_model: Model,
+                       db: Optional[BaseDb] = None,
+                       num_history_runs: int = 5,
+                       parallel_members: bool = PARALLEL_MEMBERS_ENABLED,
+                       coordinator: Optional[ParallelCoordinator] = None,
+                       profile: Optional[RunProfile] = None) -> Team:
+    profile = profile or get_run_profile()
+
     weather_agent = Agent(
         tools=[WEATHER_AGENT],
         model=agent1_model,
@@ -84,7 +119,7 @@ def build_farmers_team(agent1_model: Model,
 
         You MUST only base your analysis on the weather data returned by the tools.
         Never make up weather values for dates that are not present in tool results.
-        """,
+        """ + COMPACT_RESULTS_INSTRUCTIONS,
         expected_output="""
         "A clear, structured weather report or weather analysis based solely on the retrieved tool data. 
         The output may include:
@@ -98,8 +133,8 @@ def build_farmers_team(agent1_model: Model,
         The output MUST NOT contain hallucinated data. 
         Only analyze and summarize what the tools return.
         """,
-        debug_mode=True,
-        debug_level=2,
+        debug_mode=profile.debug_mode,
+        debug_level=profile.debug_level,
         markdown=True
     )
 
@@ -218,8 +253,8 @@ def build_farmers_team(agent1_model: Model,
             Only analyze what the tools return.d
 
         """,
-        debug_mode=True,
-        debug_level=2,
+        debug_mode=profile.debug_mode,
+        debug_level=profile.debug_level,
         markdown=True
     )
 
@@ -335,7 +370,7 @@ def build_farmers_team(agent1_model: Model,
 
             All conclusions must be derived strictly from the tool outputs.
 
-        """,
+        """ + COMPACT_RESULTS_INSTRUCTIONS,
         expected_output="""
             A well-formatted summary of employee information based on tool results, including:
 
@@ -351,8 +386,8 @@ def build_farmers_team(agent1_model: Model,
             Everything must be based exclusively on tool-returned data.
 
         """,
-        debug_mode=True,
-        debug_level=2,
+        debug_mode=profile.debug_mode,
+        debug_level=profile.debug_level,
         markdown=True
     )
 
@@ -370,11 +405,13 @@ def build_farmers_team(agent1_model: Model,
                 You are an autonomous Harvest Yield & Crop Analytics Agent.  
             You ONLY have access to the following tools:
 
-            1. get_wheat_yield_for_a_specific_period(start_day, start_month, start_year, end_day, end_month, end_year)
-            2. get_tomatoes_yield_for_a_specific_period(start_day, start_month, start_year, end_day, end_month, end_year)
-            3. get_sunflower_yield_for_a_specific_period(start_day, start_month, start_year, end_day, end_month, end_year)
-            4. get_beans_yield_for_a_specific_period(start_day, start_month, start_year, end_day, end_month, end_year)
-            5. get_harvest_stats_with_a_specific_note(note)
+            1. get_crops_yield_for_a_specific_period(crops, start_day, start_month, start_year, end_day, end_month, end_year, granularity)
+            2. get_wheat_yield_for_a_specific_period(start_day, start_month, start_year, end_day, end_month, end_year)
+            3. get_tomatoes_yield_for_a_specific_period(start_day, start_month, start_year, end_day, end_month, end_year)
+            4. get_sunflower_yield_for_a_specific_period(start_day, start_month, start_year, end_day, end_month, end_year)
+            5. get_beans_yield_for_a_specific_period(start_day, start_month, start_year, end_day, end_month, end_year)
+            6. get_harvest_stats_with_a_specific_note(note)
+            7. get_weather_harvest_correlation(start_day, start_month, start_year, end_day, end_month, end_year, max_lag_days, rolling_window_days, include_rolling_means)
 
             Your job is to answer ANY user request related to:
             • crop yield  
@@ -387,6 +424,7 @@ def build_farmers_team(agent1_model: Model,
             • identifying productivity patterns over time  
             • multi-day summaries for any crop  
             • total harvest production reporting
+            • how temperature affects yield and fuel consumption (correlations, lags, regression)
 
             ──────────────────────────────────────────────────────────────────────
             ### WHEN THE TEAM LEAD SHOULD CALL THIS AGENT
@@ -413,6 +451,10 @@ def build_farmers_team(agent1_model: Model,
             - “Which crop showed the highest yield per hectare during August?”  
             - “Did we harvest more beans on weekends or weekdays?”
 
+            ● **Weather impact on yield or fuel**  
+            - “Does heat lower our tomato yield?”  
+            - “How does temperature affect fuel use, and with what delay?”
+
             Do NOT call this agent for:
             ● Employee information  
             ● Vehicle fuel/maintenance  
@@ -425,6 +467,10 @@ def build_farmers_team(agent1_model: Model,
 
             Choose tools strictly based on crop:
 
+            ➤ More than one crop for the same period (e.g. "yields for beans, tomatoes, wheat and sunflower")  
+            → get_crops_yield_for_a_specific_period with all requested crops in ONE call  
+            (granularity "week" or "month" for long periods, "day" otherwise)
+
             ➤ Wheat  
             → get_wheat_yield_for_a_specific_period  
             
@@ -440,6 +486,9 @@ def build_farmers_team(agent1_model: Model,
             ➤ Special filter: harvest days with a specific note  
             → get_harvest_stats_with_a_specific_note
 
+            ➤ Effect of temperature on yield or fuel consumption  
+            → get_weather_harvest_correlation (do NOT fetch weather and yields separately and compare them yourself)
+
             ALWAYS:
             • Use exact dates the user provides  
             • Interpret ranges as inclusive of both start and end  
@@ -493,7 +542,7 @@ def build_farmers_team(agent1_model: Model,
 
             The output MUST look like a professional agronomic report — clear, analytical, and based on measurable data.
 
-        """,
+        """ + COMPACT_RESULTS_INSTRUCTIONS,
         expected_output="""
                 A structured and easy-to-read harvest analysis report including:
 
@@ -511,17 +560,23 @@ def build_farmers_team(agent1_model: Model,
             The final answer must feel like a professional agronomist’s harvest summary with tables and insights.
 
         """,
-        debug_mode=True,
-        debug_level=2,
+        debug_mode=profile.debug_mode,
+        debug_level=profile.debug_level,
         markdown=True
     )
 
     from agno.models.openrouter import OpenRouter
+
+    team_tools = [BRIEFING_AGENT]
+    if parallel_members:
+        coordinator = coordinator or ParallelCoordinator()
+        team_tools.append(coordinator.delegate_tasks_to_members_in_parallel)
     
-    return Team(
+    team = Team(
         # tools=[WEATHER_AGENT, AGENT2, AGENT3],
         # model=OpenRouter(id="gpt-5-mini"),
         model = team_model,
+        tools=team_tools,
         
         name="Farm Operations Team Lead Agent",
         role="""
@@ -545,6 +600,7 @@ def build_farmers_team(agent1_model: Model,
             4. Wait for the agent’s tool output
             5. Convert the output into a clean, structured, human-friendly final answer
             6. Never call a second agent unless the user explicitly asks something that requires multiple domains
+            7. For compound questions that need several domains at once, call the get_farm_briefing tool yourself (see below)
 
             ──────────────────────────────────────────────────────────────────────
             ### HOW TO ROUTE REQUESTS
@@ -622,6 +678,30 @@ def build_farmers_team(agent1_model: Model,
 
             Never mix agents unless the user explicitly requests cross-domain analysis.
 
+            ────────────────────────────────────────────────
+            COMPOUND QUESTIONS → get_farm_briefing (ONE call)
+            ────────────────────────────────────────────────
+            When ONE user message asks for several of: upcoming or recent weather, who must be paid,
+            upcoming birthdays, fuel/oil cost for the last days, yields for one or more crops,
+            do NOT delegate to each agent. Call get_farm_briefing once with the reference date and
+            all the needed sections:
+            • "weather_next_days" / "weather_last_days"  (horizon_days / lookback_days)
+            • "payroll", "birthdays"                      (horizon_days from the reference date)
+            • "fuel_cost"                                 (lookback_days ending yesterday)
+            • "crop_yields"                               (crops + yield_start_* / yield_end_* period)
+
+            Example:
+            User: “Today is 16 November 2025. Weather next week, who gets paid next week,
+            oil cost for the last 7 days, yields for all crops July 14-21 2025.”
+            → get_farm_briefing(day=16, month=11, year=2025,
+                sections=["weather_next_days", "payroll", "fuel_cost", "crop_yields"],
+                horizon_days=7, lookback_days=7,
+                yield_start_day=14, yield_start_month=7, yield_start_year=2025,
+                yield_end_day=21, yield_end_month=7, yield_end_year=2025)
+
+            Delegate to a specialist agent only for what the briefing does not cover
+            (e.g. per-employee working hours, harvest notes, single-day oil price).
+
             ────────────────────────────────────────────────
             ### RESPONSE REQUIREMENTS
 
@@ -646,7 +726,7 @@ def build_farmers_team(agent1_model: Model,
             • Invent any data not coming from tools or user
             • Combine data from different domains unless asked
             • Answer with raw JSON unless the user explicitly wants raw output
-            • Call tools directly (only the specialist agents do that)
+            • Call tools directly (only the specialist agents do that) - the only exception is get_farm_briefing
 
             ────────────────────────────────────────────────
             ### SUMMARY OF YOUR WORKFLOW
@@ -659,7 +739,7 @@ def build_farmers_team(agent1_model: Model,
             6. Receive tool results  
             7. Convert into a professional final report  
 
-        """,
+        """ + (PARALLEL_DELEGATION_INSTRUCTIONS if parallel_members else ""),
         expected_output="""
                 A polished, well-structured final answer that:
 
@@ -678,7 +758,13 @@ def build_farmers_team(agent1_model: Model,
         add_datetime_to_context=True,
         show_members_responses=True,
         members=[weather_agent, vehicles_agent, employees_agent, harvest_agent],
-        debug_mode=True,
-        debug_level=2,
+        # Per-session conversation memory (only when a db is given, e.g. by agents.service)
+        db=db,
+        add_history_to_context=db is not None,
+        num_history_runs=num_history_runs,
+        debug_mode=profile.debug_mode,
+        debug_level=profile.debug_level,
         markdown=True,
-    )
\ No newline at end of file
+    )
+    apply_run_profile(team, profile)
+    return team
\ No newline at end of file
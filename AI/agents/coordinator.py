@@ -0,0 +1,197 @@
+"""
+Parallel coordination of the farmers team members.
+
+agno's team lead delegates with delegate_task_to_member, one member per tool
+call; models usually wait for one member before asking the next, so a
+question about weather, payroll, fuel and harvest costs the sum of four
+member runs. The team lead gets one more tool instead,
+delegate_tasks_to_members_in_parallel, which takes every (member, task) pair
+of the question at once:
+
+    - member runs start together, at most AGENT_MAX_PARALLEL_MEMBERS at a time;
+    - every member gets AGENT_MEMBER_TIMEOUT_SECONDS; a member that runs out of
+      time is stopped and contributes a partial answer (the text it streamed so
+      far and the tool results it already received) instead of failing the run;
+    - the answers are merged in the team's member order, whatever order the
+      runs finish in, so the same question always gives the team lead the same
+      context.
+
+Inside a member run the MCP tool calls of one model response already run
+concurrently (agno gathers them); agents.tools caps them process-wide.
+"""
+import asyncio
+import json
+import logging
+import os
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from agno.run import RunContext
+from agno.run.agent import RunEvent, RunOutput
+from agno.utils.team import get_member_id
+
+logger = logging.getLogger(__name__)
+
+PARALLEL_MEMBERS_ENABLED = os.getenv("AGENT_PARALLEL_MEMBERS", "true").lower() in ("1", "true", "yes")
+
+MAX_PARALLEL_MEMBERS = int(os.getenv("AGENT_MAX_PARALLEL_MEMBERS", "4"))
+
+MEMBER_TIMEOUT_SECONDS = float(os.getenv("AGENT_MEMBER_TIMEOUT_SECONDS", "90"))
+
+PARALLEL_DELEGATE_TOOL = "delegate_tasks_to_members_in_parallel"
+
+# Tool results quoted in a partial answer are cut to this many characters each
+PARTIAL_RESULT_CHARS = 1500
+
+# Runs whose member results are kept for results_for() (benchmarks, debugging)
+KEPT_RUNS = 64
+
+
+@dataclass
+class MemberResult:
+    member_id: str
+    member_name: str
+    task: str
+    # "ok", "timeout" or "error"
+    status: str
+    content: str
+    seconds: float
+    tool_results: list = field(default_factory=list)
+    run_output: Optional[RunOutput] = None
+
+    def as_text(self) -> str:
+        if self.status == "ok":
+            header = f"## {self.member_name}"
+        elif self.status == "timeout":
+            header = f"## {self.member_name} (PARTIAL: stopped at the member time limit)"
+        else:
+            header = f"## {self.member_name} (FAILED)"
+
+        parts = [header, f"Task: {self.task}", self.content or "(no answer)"]
+        if self.status != "ok" and self.tool_results:
+            parts.append("Tool results received before it stopped:")
+            parts.extend(f"- {name}: {result[:PARTIAL_RESULT_CHARS]}" for name, result in self.tool_results)
+        return "\n".join(parts)
+
+
+class ParallelCoordinator:
+    """Runs the member tasks of one team lead tool call concurrently"""
+
+    def __init__(self,
+                 max_parallel: int = MAX_PARALLEL_MEMBERS,
+                 member_timeout_seconds: float = MEMBER_TIMEOUT_SECONDS):
+        self.max_parallel = max(1, max_parallel)
+        self.member_timeout_seconds = member_timeout_seconds
+        self._runs: OrderedDict[str, list[MemberResult]] = OrderedDict()
+
+    def results_for(self, run_id: str) -> list[MemberResult]:
+        """Member results of a team run (empty when the run did not delegate in parallel)"""
+        return self._runs.get(run_id, [])
+
+    async def delegate_tasks_to_members_in_parallel(self, tasks: list[dict], team: Any,
+                                                    run_context: Optional[RunContext] = None) -> str:
+        """
+        Tool description: Delegate independent tasks to several member agents at once. The members work
+        in parallel and their answers come back together, one section per member in the team's member order.
+        Use it whenever a question needs more than one member; never call delegate_task_to_member repeatedly
+        for the same question instead.
+        Input: tasks: list of {"member_id": <member id>, "task": <complete, self-contained task for that member>},
+        at most one entry per member.
+        Output: The answer of every member. A member that ran out of time is marked PARTIAL and comes with the
+        tool results it received; a member that failed is marked FAILED.
+        """
+        members = {get_member_id(member): member for member in team.members}
+        order = list(members)
+
+        # One task per member: repeated entries for the same member are joined
+        planned: dict[str, list[str]] = {}
+        unknown = []
+        for entry in tasks or []:
+            member_id = str(entry.get("member_id") or "").strip()
+            task = str(entry.get("task") or "").strip()
+            member_id = next((known for known in order
+                              if member_id.lower() in (known.lower(), (members[known].name or "").lower())), None) \
+                or member_id
+            if member_id not in members:
+                unknown.append(member_id)
+            elif task:
+                planned.setdefault(member_id, []).append(task)
+
+        if not planned:
+            return json.dumps({"error": "No valid member task", "unknown_members": unknown, "member_ids": order})
+
+        semaphore = asyncio.Semaphore(self.max_parallel)
+
+        async def run(member_id: str) -> MemberResult:
+            async with semaphore:
+                return await self._run_member(members[member_id], member_id, "\n".join(planned[member_id]))
+
+        results = await asyncio.gather(*(run(member_id) for member_id in planned))
+        results = sorted(results, key=lambda result: order.index(result.member_id))
+
+        if run_context is not None:
+            self._runs[run_context.run_id] = self._runs.get(run_context.run_id, []) + results
+            while len(self._runs) > KEPT_RUNS:
+                self._runs.popitem(last=False)
+
+        sections = [result.as_text() for result in results]
+        if unknown:
+            sections.append(f"Unknown member ids (not delegated): {', '.join(unknown)}. Valid ids: {', '.join(order)}")
+        return "\n\n".join(sections)
+
+    async def _run_member(self, member: Any, member_id: str, task: str) -> MemberResult:
+        """Stream one member run until it finishes or its time is up"""
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        deadline = start + self.member_timeout_seconds
+
+        content: list[str] = []
+        tool_results: list[tuple[str, str]] = []
+        run_output = None
+        status = "ok"
+
+        run = member.arun(task, stream=True, stream_events=True, yield_run_output=True)
+        try:
+            while True:
+                try:
+                    event = await asyncio.wait_for(run.__anext__(), timeout=max(0.0, deadline - loop.time()))
+                except StopAsyncIteration:
+                    break
+
+                if isinstance(event, RunOutput):
+                    run_output = event
+                    continue
+                kind = getattr(event, "event", None)
+                if kind == RunEvent.run_content.value and event.content:
+                    content.append(str(event.content))
+                elif kind == RunEvent.tool_call_completed.value and event.tool is not None:
+                    tool_results.append((event.tool.tool_name, str(event.tool.result or "")))
+                elif kind == RunEvent.run_error.value:
+                    status = "error"
+                    content.append(str(event.content or "Member run failed"))
+        except asyncio.TimeoutError:
+            status = "timeout"
+            logger.warning(f"{member.name} did not finish within {self.member_timeout_seconds}s, using its partial answer")
+        except Exception as e:
+            status = "error"
+            content.append(f"Member run failed: {e}")
+            logger.exception(f"{member.name} failed")
+        finally:
+            await run.aclose()
+
+        if run_output is not None and status == "ok" and run_output.content is not None:
+            text = run_output.content if isinstance(run_output.content, str) else str(run_output.content)
+        else:
+            text = "".join(content)
+
+        return MemberResult(
+            member_id=member_id,
+            member_name=member.name or member_id,
+            task=task,
+            status=status,
+            content=text,
+            seconds=round(loop.time() - start, 3),
+            tool_results=tool_results,
+            run_output=run_output,
+        )
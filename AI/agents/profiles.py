@@ -0,0 +1,125 @@
+"""
+Run profiles of the farmers team.
+
+The team and its members carry several kilobytes of static text (role,
+instructions, expected_output) that go into every system prompt. A profile
+decides how that text is sent and how much a run logs:
+
+    development - debug dumps on (debug_level 2), full instructions; what
+                  build_farmers_team always did.
+    production  - no debug dumps; the static system prompts are kept as a
+                  stable prefix so the provider can cache them. Models with
+                  provider-side prompt caching get the full text (Claude:
+                  cache_system_prompt is switched on; OpenAI and Gemini 2.5
+                  cache long prefixes by themselves). Models without it get
+                  the compact instructions instead (compact_text): the same
+                  rules without decoration, indentation and the "when the
+                  team lead should call you" sections, which only the team
+                  lead needs and already has.
+
+AGENT_RUN_PROFILE selects the default profile.
+"""
+import os
+import re
+from dataclasses import dataclass
+from typing import Optional
+
+from agno.models.base import Model
+
+RUN_PROFILE = os.getenv("AGENT_RUN_PROFILE", "development")
+
+
+@dataclass(frozen=True)
+class RunProfile:
+    name: str
+    debug_mode: bool = False
+    debug_level: int = 1
+    # "full", "compact", or "auto": compact unless the model caches prompts on the provider side
+    instructions: str = "full"
+    # Switch on explicit provider prompt caching where the model supports it
+    prompt_caching: bool = False
+
+
+RUN_PROFILES = {
+    "development": RunProfile("development", debug_mode=True, debug_level=2),
+    "production": RunProfile("production", instructions="auto", prompt_caching=True),
+}
+
+
+def get_run_profile(name: Optional[str] = None) -> RunProfile:
+    name = (name or RUN_PROFILE).strip().lower()
+    if name not in RUN_PROFILES:
+        raise ValueError(f"Unknown run profile {name!r}, expected one of {sorted(RUN_PROFILES)}")
+    return RUN_PROFILES[name]
+
+
+# Model ids whose provider caches long prompt prefixes without being asked
+_AUTOMATIC_CACHE_IDS = re.compile(r"^(openai/)?(gpt-|o\d)|^(google/)?gemini-2\.5|^deepseek", re.IGNORECASE)
+
+
+def prompt_caching_mode(model: Model) -> Optional[str]:
+    """"explicit" (has to be switched on), "automatic" (provider side, prefix based) or None"""
+    if hasattr(model, "cache_system_prompt"):
+        return "explicit"
+    if _AUTOMATIC_CACHE_IDS.search(str(getattr(model, "id", "") or "")):
+        return "automatic"
+    return None
+
+
+# ---------------------------------------------------------------- compaction
+
+_RULE_LINE = re.compile(r"^[\s─━═_\-]{6,}$")
+_BULLETS = re.compile(r"^(?:[●•➤▪]|→)\s*")
+# Sections written for the team lead; the members do not need them in their own prompt
+_LEAD_ONLY_SECTION = re.compile(r"^#+\s*WHEN THE TEAM LEAD (SHOULD|MUST) CALL", re.IGNORECASE)
+
+
+def compact_text(text: Optional[str]) -> Optional[str]:
+    """Same rules in fewer tokens: no rule lines, indentation, fancy bullets, blank runs or lead-only sections"""
+    if text is None:
+        return None
+
+    lines = []
+    skipping = False
+    for line in text.splitlines():
+        line = line.strip()
+        if line.startswith("#"):
+            skipping = bool(_LEAD_ONLY_SECTION.match(line))
+        if skipping or _RULE_LINE.match(line):
+            continue
+        line = _BULLETS.sub("- ", line)
+        if not line and (not lines or not lines[-1]):
+            continue
+        lines.append(re.sub(r"\s{2,}", " ", line))
+    return "\n".join(lines).strip()
+
+
+# ---------------------------------------------------------------- application
+
+def uses_compact_instructions(profile: RunProfile, model: Optional[Model]) -> bool:
+    if profile.instructions == "auto":
+        return model is None or prompt_caching_mode(model) is None
+    return profile.instructions == "compact"
+
+
+def _apply_to_agent(agent, profile: RunProfile) -> dict:
+    mode = prompt_caching_mode(agent.model) if agent.model is not None else None
+    if profile.prompt_caching and mode == "explicit":
+        agent.model.cache_system_prompt = True
+
+    use_compact = uses_compact_instructions(profile, agent.model)
+    if use_compact:
+        agent.role = compact_text(agent.role)
+        if isinstance(agent.instructions, str):
+            agent.instructions = compact_text(agent.instructions)
+        agent.expected_output = compact_text(agent.expected_output)
+
+    return {"prompt_caching": mode, "instructions": "compact" if use_compact else "full"}
+
+
+def apply_run_profile(team, profile: RunProfile) -> dict:
+    """Prompt caching and instruction set of the team and its members; returns what each agent got"""
+    applied = {team.name: _apply_to_agent(team, profile)}
+    for member in team.members:
+        applied[member.name] = _apply_to_agent(member, profile)
+    return applied
@@ -0,0 +1,358 @@
+"""
+Semantic response cache in front of the farmers team.
+
+A question is reduced to
+    - an intent: the farm domains it touches (weather, fuel, employees, harvest),
+    - date parameters: the reference date ("today") plus every explicit date and
+      number in the question, so "last 7 days" never matches "last 8 days",
+    - entities: the crops, employee roles, person names and quoted text
+      (notes) it names, so "wheat" never matches "beans" and "Ion Popescu"
+      never matches "Ana Popescu",
+    - a hashed character/word n-gram embedding of the remaining text.
+
+Answers are looked up in the bucket of the same (intent, date parameters,
+entities) and reused when the embedding is a near duplicate (cosine
+similarity above the threshold). Entries expire after a TTL and are dropped as soon as the
+data-version stamp of one of the collections behind their intent changes.
+"""
+import hashlib
+import os
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Optional
+
+import numpy as np
+
+from mcp_server.db import get_database
+
+EMBEDDING_DIM = 512
+
+# Collections behind every domain; a write to one of them invalidates the answers
+DOMAIN_COLLECTIONS = {
+    "weather": ("weather_logs",),
+    "fuel": ("harvest_logs",),
+    "employees": ("farmers", "harvest_logs"),
+    "harvest": ("harvest_logs",),
+}
+
+DOMAIN_KEYWORDS = {
+    "weather": ("weather", "forecast", "temperature", "rain", "sunny", "cloud", "vreme", "vremea", "temperatur", "ploaie"),
+    "fuel": ("oil", "fuel", "diesel", "liters", "litres", "motorina", "combustibil", "carburant"),
+    "employees": ("employee", "worker", "paid", "payday", "salary", "birthday", "working hours", "angajat",
+                  "plat", "salariu", "zi de nastere", "muncitor"),
+    "harvest": ("harvest", "yield", "wheat", "sunflower", "beans", "tomato", "hectare", "crop",
+                "recolt", "grau", "floarea", "fasole", "rosii", "productie"),
+}
+DOMAIN_WORDS = {word for words in DOMAIN_KEYWORDS.values() for word in words}
+
+CROP_KEYWORDS = {
+    "wheat": ("wheat", "grau"),
+    "sunflower": ("sunflower", "floarea"),
+    "beans": ("beans", "fasole"),
+    "tomatoes": ("tomato", "rosii"),
+}
+
+# Values of farmers.role; extra roles can be listed comma separated in AGENT_KNOWN_ROLES
+KNOWN_ROLES = tuple(dict.fromkeys(
+    ["Farm Manager", "Tractor Driver", "Combine Operator", "Sprayer Operator", "Harvest Worker"]
+    + [role.strip() for role in os.getenv("AGENT_KNOWN_ROLES", "").split(",") if role.strip()]
+))
+
+MONTHS = {
+    "january": 1, "february": 2, "march": 3, "april": 4, "may": 5, "june": 6, "july": 7,
+    "august": 8, "september": 9, "october": 10, "november": 11, "december": 12,
+    "ianuarie": 1, "februarie": 2, "martie": 3, "aprilie": 4, "mai": 5, "iunie": 6, "iulie": 7,
+    "septembrie": 9, "octombrie": 10, "noiembrie": 11, "decembrie": 12,
+}
+_MONTH_PATTERN = "|".join(sorted(MONTHS, key=len, reverse=True))
+
+# "16 november 2025", "november 16, 2025", "2025-11-16", "16.11.2025"
+_DATE_PATTERNS = [
+    (re.compile(rf"\b(\d{{1,2}})\s+({_MONTH_PATTERN})\s+(\d{{4}})\b"), lambda m: (int(m[3]), MONTHS[m[2]], int(m[1]))),
+    (re.compile(rf"\b({_MONTH_PATTERN})\s+(\d{{1,2}}),?\s+(\d{{4}})\b"), lambda m: (int(m[3]), MONTHS[m[1]], int(m[2]))),
+    (re.compile(r"\b(\d{4})-(\d{2})-(\d{2})\b"), lambda m: (int(m[1]), int(m[2]), int(m[3]))),
+    (re.compile(r"\b(\d{1,2})[./](\d{1,2})[./](\d{4})\b"), lambda m: (int(m[3]), int(m[2]), int(m[1]))),
+]
+_REFERENCE_PATTERN = re.compile(r"\b(today is|azi este|astazi este|azi e)\s+")
+_NUMBER_PATTERN = re.compile(r"\d+(?:[.,]\d+)?")
+_MONTH_WORD_PATTERN = re.compile(rf"\b({_MONTH_PATTERN})\b")
+
+_QUOTED_PATTERN = re.compile(r"[\"“„«]([^\"“”„«»]{2,})[\"”»]")
+_CAPITALIZED_PATTERN = re.compile(r"\b[A-ZĂÂÎȘŞȚŢ][\w'-]*")
+# "employee ion popescu", "angajatul ion popescu": a lowercase name after a person cue
+_PERSON_CUE_PATTERN = re.compile(
+    r"\b(?:employee|worker|angajat(?:ul|a)?|muncitor(?:ul)?|named|called|numit|numita|domnul|doamna)"
+    r"\s+([a-z]+)(?:\s+([a-z]+))?"
+)
+# Capitalized or cue-following words that are not names
+_NOT_NAMES = {
+    "i", "a", "an", "the", "what", "which", "who", "whom", "whose", "when", "where", "how", "why", "is", "are",
+    "was", "were", "do", "does", "did", "has", "have", "had", "can", "could", "will", "would", "should", "give",
+    "show", "tell", "list", "find", "get", "please", "me", "my", "us", "our", "we", "you", "for", "from", "with",
+    "without", "of", "in", "on", "at", "to", "by", "and", "or", "that", "this", "these", "those", "all", "every",
+    "each", "any", "many", "much", "most", "least", "more", "less", "last", "next", "today", "yesterday",
+    "tomorrow", "monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday", "mcp", "ron",
+    "eur", "cine", "care", "ce", "cat", "cati", "cand", "unde", "cu", "de", "din", "la", "pe", "si", "sau",
+    "azi", "ieri", "maine", "astazi", "lista", "arata", "spune", "da", "mi", "imi",
+}
+
+
+def fold_text(text: str) -> str:
+    """Lowercase and drop Romanian diacritics"""
+    return text.lower().translate(str.maketrans("ăâîșşțţ", "aaisstt"))
+
+
+def extract_dates(text: str) -> tuple:
+    """
+    Explicit dates of a folded question; returns (stated reference date or None,
+    the other dates in order of appearance, text with every date replaced by <date>).
+    "Today is 16 november 2025" states the reference date.
+    """
+    reference = None
+    found_dates = []
+
+    for pattern, to_ymd in _DATE_PATTERNS:
+        for match in pattern.finditer(text):
+            try:
+                found = date(*to_ymd(match))
+            except ValueError:
+                continue
+            preceding = text[max(0, match.start() - 16):match.start()]
+            if _REFERENCE_PATTERN.search(preceding):
+                reference = found
+            else:
+                found_dates.append((match.start(), found))
+        text = pattern.sub(" <date> ", text)
+    text = _REFERENCE_PATTERN.sub(" ", text)
+
+    return reference, [found for _, found in sorted(found_dates, key=lambda item: item[0])], text
+
+
+def extract_entities(question: str) -> tuple:
+    """
+    Crops, roles, person names and quoted text (notes) named in a question,
+    as sorted "kind:value" tokens. Two questions that differ only in one of
+    them read almost the same, but never have the same answer.
+    """
+    folded = fold_text(question)
+    entities = set()
+
+    for crop, words in CROP_KEYWORDS.items():
+        if any(re.search(rf"\b{word}", folded) for word in words):
+            entities.add(f"crop:{crop}")
+
+    role_words = set()
+    for role in KNOWN_ROLES:
+        folded_role = fold_text(role)
+        if re.search(rf"\b{re.escape(folded_role)}s?\b", folded):
+            entities.add(f"role:{folded_role}")
+            role_words.update(folded_role.split())
+
+    for quoted in _QUOTED_PATTERN.findall(question):
+        entities.add(f"quote:{' '.join(fold_text(quoted).split())}")
+
+    ignored = _NOT_NAMES | DOMAIN_WORDS | role_words | set(MONTHS) | {
+        word for words in CROP_KEYWORDS.values() for word in words
+    }
+    for sentence in re.split(r"[.?!;\n]+", question):
+        words = list(_CAPITALIZED_PATTERN.finditer(sentence))
+        for i, match in enumerate(words):
+            # The first word of a sentence is capitalized anyway: a name only when the next word is one too
+            starts_sentence = not sentence[:match.start()].strip()
+            next_adjacent = i + 1 < len(words) and not sentence[match.end():words[i + 1].start()].strip()
+            word = fold_text(match[0])
+            if word not in ignored and (not starts_sentence or next_adjacent):
+                entities.add(f"name:{word}")
+
+    for match in _PERSON_CUE_PATTERN.finditer(folded):
+        for word in match.groups():
+            if word is None or word in ignored:
+                break
+            entities.add(f"name:{word}")
+
+    return tuple(sorted(entities))
+
+
+def detect_domains(text: str) -> tuple:
+    """Farm domains whose keywords appear in a folded question"""
+    return tuple(sorted(
+        domain for domain, words in DOMAIN_KEYWORDS.items()
+        if any(re.search(rf"\b{word}", text) for word in words)
+    ))
+
+
+@dataclass
+class NormalizedQuestion:
+    text: str
+    intent: tuple
+    date_params: tuple
+    collections: tuple
+    entities: tuple = ()
+
+    @property
+    def bucket(self) -> tuple:
+        return self.intent, self.date_params, self.entities
+
+
+def normalize_question(question: str, today: Optional[date] = None) -> NormalizedQuestion:
+    """Split a question into intent, resolved date parameters, entities and normalized text"""
+    # The stated reference date ("Today is 16 november 2025") replaces the clock
+    stated, found_dates, text = extract_dates(fold_text(question))
+    reference = stated or today or date.today()
+    dates = [found.isoformat() for found in found_dates]
+
+    # Remaining numbers and months ("last 7 days", "July 14-21") are parameters, not wording
+    months = [str(MONTHS[name]) for name in _MONTH_WORD_PATTERN.findall(text)]
+    text = _MONTH_WORD_PATTERN.sub(" <month> ", text)
+    numbers = _NUMBER_PATTERN.findall(text)
+    text = _NUMBER_PATTERN.sub(" <n> ", text)
+    text = re.sub(r"[^\w<>]+", " ", text).strip()
+
+    intent = detect_domains(text)
+    collections = tuple(sorted({name for domain in intent for name in DOMAIN_COLLECTIONS[domain]}))
+
+    return NormalizedQuestion(
+        text=text,
+        intent=intent,
+        date_params=(reference.isoformat(), tuple(sorted(dates)), tuple(months), tuple(numbers)),
+        collections=collections,
+        entities=extract_entities(question),
+    )
+
+
+def embed(text: str) -> np.ndarray:
+    """Hashed bag of character 3-grams and words, L2-normalized"""
+    vector = np.zeros(EMBEDDING_DIM, dtype=np.float32)
+    padded = f" {text} "
+    features = [padded[i:i + 3] for i in range(len(padded) - 2)] + [f"w:{word}" for word in text.split()]
+
+    for feature in features:
+        digest = hashlib.blake2b(feature.encode(), digest_size=8).digest()
+        index = int.from_bytes(digest[:4], "little") % EMBEDDING_DIM
+        sign = 1.0 if digest[4] & 1 else -1.0
+        vector[index] += sign * (2.0 if feature.startswith("w:") else 1.0)
+
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm > 0 else vector
+
+
+@dataclass
+class CachedAnswer:
+    question: str
+    answer: str
+    embedding: np.ndarray
+    versions: tuple
+    expires_at: float
+
+
+@dataclass
+class ResponseCacheStats:
+    hits: int = 0
+    near_duplicate_hits: int = 0
+    misses: int = 0
+    uncacheable: int = 0
+    invalidated: int = 0
+    stored: int = 0
+
+    def as_dict(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            **self.__dict__,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+@dataclass
+class ResponseCache:
+    similarity_threshold: float = 0.9
+    ttl_seconds: float = 3600.0
+    max_entries: int = 1000
+    version_check_interval: float = 1.0
+
+    stats: ResponseCacheStats = field(default_factory=ResponseCacheStats)
+    _buckets: "OrderedDict[tuple, list[CachedAnswer]]" = field(default_factory=OrderedDict)
+    _versions: dict = field(default_factory=dict)
+
+    async def lookup(self, question: str, today: Optional[date] = None) -> Optional[str]:
+        """Cached answer for a (near-)duplicate question, None on a miss"""
+        normalized = normalize_question(question, today)
+        if not normalized.intent:
+            self.stats.uncacheable += 1
+            return None
+
+        entries = self._buckets.get(normalized.bucket)
+        if entries:
+            versions = await self._current_versions(normalized.collections)
+            now = time.monotonic()
+            fresh = [e for e in entries if e.expires_at >= now and e.versions == versions]
+            self.stats.invalidated += len(entries) - len(fresh)
+            entries[:] = fresh
+
+            if fresh:
+                embedding = embed(normalized.text)
+                similarities = np.stack([e.embedding for e in fresh]) @ embedding
+                best = int(np.argmax(similarities))
+                if similarities[best] >= self.similarity_threshold:
+                    self._buckets.move_to_end(normalized.bucket)
+                    self.stats.hits += 1
+                    if similarities[best] < 0.9999:
+                        self.stats.near_duplicate_hits += 1
+                    return fresh[best].answer
+
+        self.stats.misses += 1
+        return None
+
+    async def store(self, question: str, answer: str, today: Optional[date] = None) -> None:
+        normalized = normalize_question(question, today)
+        if not normalized.intent or not answer:
+            return
+
+        entry = CachedAnswer(
+            question=question,
+            answer=answer,
+            embedding=embed(normalized.text),
+            versions=await self._current_versions(normalized.collections),
+            expires_at=time.monotonic() + self.ttl_seconds,
+        )
+        self._buckets.setdefault(normalized.bucket, []).append(entry)
+        self._buckets.move_to_end(normalized.bucket)
+        self.stats.stored += 1
+
+        while sum(len(entries) for entries in self._buckets.values()) > self.max_entries:
+            _, oldest = next(iter(self._buckets.items()))
+            oldest.pop(0)
+            if not oldest:
+                self._buckets.popitem(last=False)
+
+    def clear(self) -> None:
+        self._buckets.clear()
+
+    def metrics(self) -> dict:
+        return {
+            **self.stats.as_dict(),
+            "entries": sum(len(entries) for entries in self._buckets.values()),
+            "buckets": len(self._buckets),
+        }
+
+    async def _current_versions(self, collections: tuple) -> tuple:
+        """Data-version stamps of the collections, re-read at most once per version_check_interval"""
+        now = time.monotonic()
+        versions = []
+        for name in collections:
+            checked = self._versions.get(name)
+            if checked is None or now - checked[0] >= self.version_check_interval:
+                doc = await get_database()["data_versions"].find_one({"_id": name}, {"version": 1})
+                checked = (now, int(doc.get("version", 0)) if doc else 0)
+                self._versions[name] = checked
+            versions.append(checked[1])
+        return tuple(versions)
+
+
+response_cache = ResponseCache(
+    similarity_threshold=float(os.getenv("AGENT_CACHE_SIMILARITY", "0.9")),
+    ttl_seconds=float(os.getenv("AGENT_CACHE_TTL_SECONDS", "3600")),
+    max_entries=int(os.getenv("AGENT_CACHE_MAX_ENTRIES", "1000")),
+)
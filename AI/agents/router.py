@@ -0,0 +1,449 @@
+"""
+Deterministic fast path in front of the farmers team.
+
+Simple lookups ("oil price on 12 March 2025", "employees with role Tractor
+Driver", "weather for the last 7 days") map one-to-one onto a single MCP tool.
+For those the router parses the dates and entities with rules, calls the tool
+directly over the shared MCP sessions and formats the answer from a template -
+no team model, no member agent model.
+
+Every rule yields a route with a confidence; questions that touch several
+domains, ask for analysis ("why", "compare", "trend"), chain several requests
+or name a person, role or location the tool takes no argument for lose
+confidence, and anything below ROUTER_MIN_CONFIDENCE goes to the team.
+"""
+import logging
+import os
+import re
+import time
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Awaitable, Callable, Optional
+
+from agents.response_cache import (
+    CROP_KEYWORDS, KNOWN_ROLES, MONTHS, detect_domains, extract_dates, extract_entities, fold_text,
+)
+from mcp_server.compaction import table_rows
+
+logger = logging.getLogger(__name__)
+
+ROUTER_ENABLED = os.getenv("AGENT_ROUTER_ENABLED", "1") == "1"
+ROUTER_MIN_CONFIDENCE = float(os.getenv("AGENT_ROUTER_MIN_CONFIDENCE", "0.8"))
+
+_MONTH_PATTERN = "|".join(sorted(MONTHS, key=len, reverse=True))
+
+# "july 14-21, 2025", "14-21 july 2025"
+_RANGE_PATTERNS = [
+    (re.compile(rf"\b({_MONTH_PATTERN})\s+(\d{{1,2}})\s*-\s*(\d{{1,2}}),?\s+(\d{{4}})\b"),
+     lambda m: (int(m[4]), MONTHS[m[1]], int(m[2]), int(m[3]))),
+    (re.compile(rf"\b(\d{{1,2}})\s*-\s*(\d{{1,2}})\s+({_MONTH_PATTERN})\s+(\d{{4}})\b"),
+     lambda m: (int(m[4]), MONTHS[m[3]], int(m[1]), int(m[2]))),
+]
+
+_LAST_DAYS_PATTERN = re.compile(r"\b(?:last|past|previous|ultimele)\s+(\d{1,3})\s+(?:days|zile)\b")
+_NEXT_DAYS_PATTERN = re.compile(r"\b(?:next|following|coming|urmatoarele)\s+(\d{1,3})\s+(?:days|zile)\b")
+_LAST_WEEK_PATTERN = re.compile(r"\b(?:last|past|previous) week\b|\bultima saptamana\b")
+_NEXT_WEEK_PATTERN = re.compile(r"\b(?:next|this|coming) week\b|\bsaptamana (?:viitoare|aceasta)\b")
+
+# Requests the templates cannot answer
+_ANALYSIS_PATTERN = re.compile(
+    r"\b(why|compare|comparison|versus|vs|trend|correlat|average|recommend|should|explain|predict|"
+    r"best|worst|de ce|compara|medie|recomanda)"
+)
+_CHAINING_PATTERN = re.compile(r"\b(also|then|as well|plus|si apoi|de asemenea)\b")
+# Context sentences that are not a request ("Today is ...", "I am in Timisoara")
+_CONTEXT_SENTENCE_PATTERN = re.compile(r"^\s*(<date>|i am in\b|i'm in\b|sunt in\b|we are in\b)")
+
+# Entity kinds (agents.response_cache.extract_entities) that narrow a question down: a route without
+# an argument for them would answer a different, broader question. "name" also covers locations
+_QUALIFIER_KINDS = ("name", "role")
+
+_ALL_CROPS_PATTERN = re.compile(r"\b(all|every|each) crops?\b|\btoate culturile\b")
+
+# Only a known role closing the question: "the role of Ion Popescu", "which role does X have" or
+# "role Tractor Driver and their birthdays" are not role lookups
+_ROLES_BY_NAME = {fold_text(role): role for role in KNOWN_ROLES}
+_ROLE_PATTERN = re.compile(
+    r"\b(?:role|rolul|position|job title)\s*(?:of|is|=|:)?\s*[\"']?("
+    + "|".join(re.escape(name) for name in sorted(_ROLES_BY_NAME, key=len, reverse=True))
+    + r")s?[\"']?\s*[?.!]*$"
+)
+
+
+@dataclass
+class ParsedQuestion:
+    original: str
+    text: str
+    domains: tuple
+    reference: date
+    dates: list
+    period: Optional[tuple] = None
+    window: Optional[tuple] = None
+    crops: list = field(default_factory=list)
+    requests: int = 1
+
+    def has(self, pattern: str) -> bool:
+        return re.search(pattern, self.text) is not None
+
+
+@dataclass
+class Route:
+    rule: str
+    group: str
+    tool: str
+    arguments: dict
+    template: Callable[[dict], str]
+    confidence: float = 1.0
+    # Entity kinds the tool arguments express
+    entity_kinds: tuple = ()
+
+
+@dataclass
+class RoutedAnswer:
+    answer: str
+    rule: str
+    tool: str
+    arguments: dict
+    data: dict
+    confidence: float
+
+
+def parse_question(question: str, today: Optional[date] = None) -> ParsedQuestion:
+    """Dates, periods, crops and domains of a question"""
+    text = fold_text(question)
+
+    # Day ranges first: "14-21 july 2025" would otherwise read as the single date 21 july 2025
+    period = None
+    for pattern, to_range in _RANGE_PATTERNS:
+        match = pattern.search(text)
+        if match:
+            year, month, first, last = to_range(match)
+            try:
+                period = (date(year, month, first), date(year, month, last))
+            except ValueError:
+                period = None
+            text = pattern.sub(" <date> ", text)
+
+    stated, dates, text = extract_dates(text)
+    reference = stated or today or date.today()
+    if period is None and len(dates) == 2:
+        period = tuple(sorted(dates))
+
+    window = None
+    for pattern, direction in ((_LAST_DAYS_PATTERN, "last"), (_NEXT_DAYS_PATTERN, "next")):
+        match = pattern.search(text)
+        if match:
+            window = (direction, int(match[1]))
+    if window is None and _LAST_WEEK_PATTERN.search(text):
+        window = ("last", 7)
+    elif window is None and _NEXT_WEEK_PATTERN.search(text):
+        window = ("next", 7)
+
+    crops = [crop for crop, words in CROP_KEYWORDS.items() if any(re.search(rf"\b{word}", text) for word in words)]
+    if not crops and _ALL_CROPS_PATTERN.search(text):
+        crops = list(CROP_KEYWORDS)
+
+    sentences = [s for s in re.split(r"[.?!;\n]+", text) if s.strip()]
+    requests = sum(1 for s in sentences if not _CONTEXT_SENTENCE_PATTERN.match(s)) or 1
+
+    return ParsedQuestion(
+        original=question,
+        text=text,
+        domains=detect_domains(text),
+        reference=reference,
+        dates=dates,
+        period=period,
+        window=window,
+        crops=crops,
+        requests=requests,
+    )
+
+
+def _ymd(prefix: str, day: date) -> dict:
+    return {f"{prefix}day": day.day, f"{prefix}month": day.month, f"{prefix}year": day.year}
+
+
+def _single_date(q: ParsedQuestion) -> Optional[date]:
+    """The one date a question is about; None when it names a period or several dates"""
+    if q.period is not None or q.window is not None or len(q.dates) > 1:
+        return None
+    if q.dates:
+        return q.dates[0]
+    if q.has(r"\b(today|azi|astazi)\b"):
+        return q.reference
+    if q.has(r"\b(yesterday|ieri)\b"):
+        return q.reference - timedelta(days=1)
+    if q.has(r"\b(tomorrow|maine)\b"):
+        return q.reference + timedelta(days=1)
+    return None
+
+
+def _period(q: ParsedQuestion) -> Optional[tuple]:
+    """An inclusive (start, end) period: explicit, or the last N days up to the reference date"""
+    if q.period is not None:
+        return q.period
+    if q.window is not None and q.window[0] == "last":
+        ending = q.reference - timedelta(days=1) if q.has(r"\bending yesterday\b") else q.reference
+        return ending - timedelta(days=q.window[1] - 1), ending
+    return None
+
+
+def _number(value, digits: int = 2) -> str:
+    return "n/a" if value is None else f"{float(value):,.{digits}f}"
+
+
+def _employee_name(employee: dict) -> str:
+    return f"{employee.get('first_name') or ''} {employee.get('last_name') or ''}".strip()
+
+
+def _weather_line(day: str, row: dict) -> str:
+    unit = row.get("temperature_unit") or "°C"
+    description = row.get("weather_description") or "no description"
+    return f"- {day}: {description}, {row.get('min_temp_celsius')} to {row.get('max_temp_celsius')} {unit}"
+
+
+# ---------------------------------------------------------------- templates
+
+def _oil_price_answer(data: dict) -> str:
+    if data.get("error") or data.get("oil_price_per_liter") is None:
+        return f"There is no oil price recorded for {data.get('date', 'that day')[:10]}."
+    return f"The oil price on {data['date']} was {_number(data['oil_price_per_liter'])} {data['currency']} per liter."
+
+
+def _oil_total_answer(data: dict) -> str:
+    if data.get("error"):
+        return f"No fuel consumption was recorded between {data['start_date']} and {data['end_date']}."
+    return (
+        f"Between {data['start_date']} and {data['end_date']} the farm used "
+        f"{_number(data['total_fuel_consumed_liters'], 1)} liters of fuel, "
+        f"costing {_number(data['total_fuel_cost'])} {data['currency']} in total."
+    )
+
+
+def _weather_day_answer(data: dict) -> str:
+    if not data:
+        return "There is no weather data for that day."
+    return "Weather:\n" + _weather_line(data["date"], data)
+
+
+def _weather_days_answer(data: dict) -> str:
+    if not data:
+        return "There is no weather data for that period."
+    if "days" not in data:
+        return "Weather:\n" + "\n".join(_weather_line(day, row) for day, row in data.items())
+
+    # Long windows come back compacted: a summary and the first page of days
+    summary = data.get("summary", {})
+    lines = [_weather_line(row["date"], row) for row in table_rows(data["days"])]
+    header = (f"Weather over {summary.get('days', len(lines))} days: "
+              f"{summary.get('min_temp_celsius')} to {summary.get('max_temp_celsius')} °C")
+    shown = f"\nFirst {len(lines)} days:" if data.get("pagination", {}).get("next_page") else ""
+    return header + shown + "\n" + "\n".join(lines)
+
+
+def _role_answer(data: dict) -> str:
+    employees = data.get("employees", [])
+    if not employees:
+        return "No employee has that role."
+    names = "\n".join(f"- {_employee_name(e)}" for e in employees)
+    return f"{data['total_employees_with_role']} employee(s) with the role {employees[0]['role']}:\n{names}"
+
+
+def _payday_answer(data: dict) -> str:
+    employees = data.get("employees", [])
+    if not employees:
+        return f"No employee has to be paid between {data['start_date']} and {data['end_date']}."
+    names = "\n".join(f"- {_employee_name(e)} on {e.get('payment_date') or 'day ' + str(e.get('payday'))}"
+                      for e in employees)
+    return (f"{data['total_employees_to_be_paid']} employee(s) have to be paid between "
+            f"{data['start_date']} and {data['end_date']}:\n{names}")
+
+
+def _birthday_answer(data: dict) -> str:
+    employees = data.get("employees", [])
+    if not employees:
+        return f"No employee has a birthday between {data['start_date']} and {data['end_date']}."
+    names = "\n".join(f"- {_employee_name(e)} on {e['birthday_day']:02d}.{e['birthday_month']:02d}" for e in employees)
+    return (f"{data['total_employees_with_birthday']} employee(s) have a birthday between "
+            f"{data['start_date']} and {data['end_date']}:\n{names}")
+
+
+def _yield_answer(data: dict) -> str:
+    if data.get("error"):
+        return f"The yield could not be computed: {data['error']}"
+    lines = [
+        f"- {crop}: {_number(view['total_harvested_kg'], 0)} kg on {_number(view['total_harvested_hectares'])} ha, "
+        f"{_number(view['overall_yield_kg_per_hectare'])} kg/ha"
+        for crop, view in data["crops"].items()
+    ]
+    return f"Yield between {data['start_date']} and {data['end_date']}:\n" + "\n".join(lines)
+
+
+# ---------------------------------------------------------------- rules
+
+def _oil_price_rule(q: ParsedQuestion) -> Optional[Route]:
+    day = _single_date(q)
+    if q.domains != ("fuel",) or day is None or not q.has(r"\b(price|pret|cost)"):
+        return None
+    return Route("oil_price_for_day", "mcp_vehicles_agent", "get_oil_price_for_a_specific_day",
+                 _ymd("", day), _oil_price_answer)
+
+
+def _oil_total_rule(q: ParsedQuestion) -> Optional[Route]:
+    period = _period(q)
+    if q.domains != ("fuel",) or period is None or not q.has(r"\b(spen[dt]|total|cost|cheltui|money|bani)"):
+        return None
+    return Route("oil_cost_for_period", "mcp_vehicles_agent", "get_total_oil_price_for_a_period_of_time",
+                 {**_ymd("start_", period[0]), **_ymd("end_", period[1])}, _oil_total_answer)
+
+
+def _weather_rule(q: ParsedQuestion) -> Optional[Route]:
+    if q.domains != ("weather",):
+        return None
+    if q.window is not None:
+        direction, days = q.window
+        if direction == "last":
+            return Route("weather_last_n_days", "mcp_weather_agent", "get_weather_info_for_last_n_days",
+                         {"number_of_days": days, **_ymd("today_", q.reference)}, _weather_days_answer)
+        return Route("weather_next_n_days", "mcp_weather_agent", "get_weather_info_for_the_next_n_days",
+                     {"days": days, **_ymd("today_", q.reference)}, _weather_days_answer)
+
+    day = _single_date(q)
+    if day is None:
+        return None
+    return Route("weather_for_day", "mcp_weather_agent", "get_weather_info_for_a_day",
+                 _ymd("", day), _weather_day_answer)
+
+
+def _role_rule(q: ParsedQuestion) -> Optional[Route]:
+    question = fold_text(q.original.strip())
+    match = _ROLE_PATTERN.search(question)
+    # The role name itself may contain domain words ("Harvest Worker")
+    if match is None or detect_domains(question[:match.start(1)]) not in ((), ("employees",)):
+        return None
+    # Stored as listed in KNOWN_ROLES ("Tractor Driver")
+    return Route("employees_with_role", "mcp_employees_agent", "get_employee_with_a_specific_role",
+                 {"role": _ROLES_BY_NAME[match[1]]}, _role_answer, entity_kinds=("role",))
+
+
+def _payday_rule(q: ParsedQuestion) -> Optional[Route]:
+    if q.domains != ("employees",) or not q.has(r"\b(paid|payday|pay|plati|platit)") or q.window is None:
+        return None
+    if q.window[0] != "next":
+        return None
+    return Route("employees_paid_next_n_days", "mcp_employees_agent", "get_employees_paid_in_n_days_from_date",
+                 {"n_days": q.window[1], **_ymd("start_", q.reference)}, _payday_answer)
+
+
+def _birthday_rule(q: ParsedQuestion) -> Optional[Route]:
+    if q.domains != ("employees",) or not q.has(r"\b(birthday|zi de nastere|aniversar)") or q.window is None:
+        return None
+    if q.window[0] != "next":
+        return None
+    return Route("birthdays_next_n_days", "mcp_employees_agent", "get_employees_bday_in_next_n_days_from_day_x",
+                 {"n": q.window[1], **_ymd("start_", q.reference)}, _birthday_answer)
+
+
+def _yield_rule(q: ParsedQuestion) -> Optional[Route]:
+    period = _period(q)
+    if q.domains != ("harvest",) or not q.crops or period is None or not q.has(r"\b(yield|harvest|recolt|product)"):
+        return None
+    return Route("crop_yield_for_period", "mcp_harvest_agent", "get_crops_yield_for_a_specific_period",
+                 {"crops": q.crops, **_ymd("start_", period[0]), **_ymd("end_", period[1]), "granularity": "day"},
+                 _yield_answer)
+
+
+RULES = [
+    _oil_price_rule, _oil_total_rule, _weather_rule, _role_rule, _payday_rule, _birthday_rule, _yield_rule,
+]
+
+
+def _request_entities(question: str) -> tuple:
+    """Entities of the request sentences; context ("I am in Timisoara") is not a qualifier"""
+    sentences = [s for s in re.findall(r"[^.?!;\n]+[.?!;\n]*", question) if s.strip()]
+    request = " ".join(s for s in sentences if not _CONTEXT_SENTENCE_PATTERN.match(fold_text(s)))
+    return extract_entities(request)
+
+
+def classify(question: str, today: Optional[date] = None) -> Optional[Route]:
+    """Best matching route with its confidence, None when no rule applies"""
+    q = parse_question(question, today)
+    routes = [route for route in (rule(q) for rule in RULES) if route is not None]
+    if not routes:
+        return None
+
+    confidence = 1.0
+    if len({route.tool for route in routes}) > 1:
+        confidence -= 0.5
+    if q.requests > 1 or _CHAINING_PATTERN.search(q.text):
+        confidence -= 0.4
+    if _ANALYSIS_PATTERN.search(q.text):
+        confidence -= 0.4
+
+    route = routes[0]
+    # "oil cost for the tractor driver Ion", "weather in Cluj": the tool would drop the qualifier
+    kinds = {entity.split(":", 1)[0] for entity in _request_entities(question)}
+    if any(kind in kinds and kind not in route.entity_kinds for kind in _QUALIFIER_KINDS):
+        confidence -= 0.5
+
+    route.confidence = round(max(confidence, 0.0), 2)
+    return route
+
+
+ToolCaller = Callable[[str, str, dict], Awaitable[dict]]
+
+
+@dataclass
+class RouterStats:
+    routed: int = 0
+    fell_back: int = 0
+    tool_errors: int = 0
+    routed_seconds: float = 0.0
+
+    def as_dict(self) -> dict:
+        total = self.routed + self.fell_back
+        return {
+            **self.__dict__,
+            "routed_ratio": round(self.routed / total, 4) if total else 0.0,
+            "avg_routed_ms": round(1000 * self.routed_seconds / self.routed, 1) if self.routed else 0.0,
+        }
+
+
+@dataclass
+class IntentRouter:
+    call_tool: ToolCaller
+    min_confidence: float = ROUTER_MIN_CONFIDENCE
+    enabled: bool = True
+    stats: RouterStats = field(default_factory=RouterStats)
+
+    async def answer(self, question: str, today: Optional[date] = None) -> Optional[RoutedAnswer]:
+        """Templated answer from a direct tool call, None when the team has to answer"""
+        route = classify(question, today) if self.enabled else None
+        if route is None or route.confidence < self.min_confidence:
+            self.stats.fell_back += 1
+            return None
+
+        start = time.perf_counter()
+        try:
+            data = await self.call_tool(route.group, route.tool, route.arguments)
+            answer = route.template(data)
+        except Exception as e:
+            # Whatever went wrong, the team still gets a chance to answer
+            logger.warning(f"Routed call {route.tool} failed, falling back to the team: {e}")
+            self.stats.tool_errors += 1
+            self.stats.fell_back += 1
+            return None
+
+        self.stats.routed += 1
+        self.stats.routed_seconds += time.perf_counter() - start
+        return RoutedAnswer(
+            answer=answer,
+            rule=route.rule,
+            tool=route.tool,
+            arguments=route.arguments,
+            data=data,
+            confidence=route.confidence,
+        )
+
+    def metrics(self) -> dict:
+        return {"enabled": self.enabled, "min_confidence": self.min_confidence, **self.stats.as_dict()}
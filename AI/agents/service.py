@@ -0,0 +1,392 @@
+"""
+Long-running agent service for the Frontend chat.
+
+The farmers team is built once at startup and reused by every request; the
+MCP sessions stay open (agents.tools.mcp_clients) and each conversation keeps
+its history in an in-memory agno db, keyed by session_id. Sessions idle for
+AGENT_SESSION_TTL_SECONDS are dropped, and at most AGENT_MAX_SESSIONS are
+kept (least recently used first out).
+
+At most AGENT_MAX_CONCURRENT_RUNS team runs execute at once; up to
+AGENT_MAX_QUEUED_REQUESTS more wait in line. Beyond that requests are
+rejected with 429, and a request that waits longer than
+AGENT_QUEUE_TIMEOUT_SECONDS gets 503 - both with Retry-After.
+
+Standalone questions first go through the deterministic router
+(agents.router): simple lookups are answered from one direct tool call and a
+template, without a team run or a queue slot. Repeated questions are then
+served from the response cache; only the rest reaches the team.
+
+The team runs with the production profile (agents.profiles: no debug dumps,
+cached or compact system prompts) unless AGENT_RUN_PROFILE says otherwise.
+
+Usage (from the AI directory, with the MCP host running):
+    uvicorn agents.service:app --host 0.0.0.0 --port 8010
+"""
+import asyncio
+import contextlib
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import AsyncIterator, Optional
+from uuid import uuid4
+
+from agno.db.base import SessionType
+from agno.db.in_memory import InMemoryDb
+from fastapi import FastAPI, HTTPException, status
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+
+from agents.agent import build_farmers_team
+from agents.profiles import get_run_profile
+from agents.response_cache import response_cache
+from agents.router import ROUTER_ENABLED, IntentRouter
+from agents.tools import mcp_clients
+from models.model import get_openrouter_model
+
+logger = logging.getLogger(__name__)
+
+MAX_CONCURRENT_RUNS = int(os.getenv("AGENT_MAX_CONCURRENT_RUNS", "4"))
+MAX_QUEUED_REQUESTS = int(os.getenv("AGENT_MAX_QUEUED_REQUESTS", "16"))
+QUEUE_TIMEOUT_SECONDS = float(os.getenv("AGENT_QUEUE_TIMEOUT_SECONDS", "30"))
+RUN_TIMEOUT_SECONDS = float(os.getenv("AGENT_RUN_TIMEOUT_SECONDS", "300"))
+
+# Previous question/answer pairs of a session added to the team context
+HISTORY_RUNS = int(os.getenv("AGENT_HISTORY_RUNS", "5"))
+
+# Server-side conversation histories kept in memory
+SESSION_TTL_SECONDS = float(os.getenv("AGENT_SESSION_TTL_SECONDS", "3600"))
+MAX_SESSIONS = int(os.getenv("AGENT_MAX_SESSIONS", "1000"))
+
+RUN_PROFILE = get_run_profile(os.getenv("AGENT_RUN_PROFILE", "production"))
+
+TEAM_CONTENT_EVENT = "TeamRunContent"
+TEAM_ERROR_EVENT = "TeamRunError"
+
+
+class QueueFullError(Exception):
+    pass
+
+
+class QueueTimeoutError(Exception):
+    pass
+
+
+class RunLimiter:
+    """Semaphore for the running team runs plus a bounded waiting line in front of it"""
+
+    def __init__(self, max_running: int, max_waiting: int, wait_timeout: float):
+        self.max_running = max_running
+        self.max_waiting = max_waiting
+        self.wait_timeout = wait_timeout
+        self._semaphore = asyncio.Semaphore(max_running)
+        self.running = 0
+        self.waiting = 0
+
+    def check_capacity(self) -> None:
+        """Raise QueueFullError when a new request could not even wait in line"""
+        if self.waiting >= self.max_waiting and self._semaphore.locked():
+            raise QueueFullError()
+
+    @contextlib.asynccontextmanager
+    async def slot(self):
+        self.check_capacity()
+
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout=self.wait_timeout)
+        except asyncio.TimeoutError:
+            raise QueueTimeoutError()
+        finally:
+            self.waiting -= 1
+
+        self.running += 1
+        try:
+            yield
+        finally:
+            self.running -= 1
+            self._semaphore.release()
+
+    def stats(self) -> dict:
+        return {
+            "running": self.running,
+            "waiting": self.waiting,
+            "max_running": self.max_running,
+            "max_waiting": self.max_waiting,
+        }
+
+
+class SessionExpiry:
+    """
+    Last use of every session in the agno db, least recently used first
+
+    touch() returns the sessions to delete: idle for longer than the TTL, or
+    the oldest ones beyond max_sessions.
+    """
+
+    def __init__(self, ttl_seconds: float, max_sessions: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_sessions = max(1, max_sessions)
+        self._last_used: OrderedDict[str, float] = OrderedDict()
+
+    def touch(self, session_id: str) -> list[str]:
+        now = time.monotonic()
+        self._last_used[session_id] = now
+        self._last_used.move_to_end(session_id)
+
+        expired = []
+        for candidate, last_used in self._last_used.items():
+            if len(self._last_used) - len(expired) > self.max_sessions or now - last_used > self.ttl_seconds:
+                expired.append(candidate)
+            else:
+                break
+        for candidate in expired:
+            del self._last_used[candidate]
+        return expired
+
+    def forget(self, session_id: str) -> None:
+        self._last_used.pop(session_id, None)
+
+    def __len__(self) -> int:
+        return len(self._last_used)
+
+
+class ChatMessage(BaseModel):
+    role: str
+    content: str
+
+
+class ChatRequest(BaseModel):
+    """Same body as the Frontend AIChat component sends"""
+    message: str = Field(..., min_length=1)
+    farmer_id: Optional[str] = None
+    session_id: Optional[str] = None
+    # Ignored when the session already has server-side history
+    conversation_history: list[ChatMessage] = []
+
+
+limiter = RunLimiter(MAX_CONCURRENT_RUNS, MAX_QUEUED_REQUESTS, QUEUE_TIMEOUT_SECONDS)
+sessions = SessionExpiry(SESSION_TTL_SECONDS, MAX_SESSIONS)
+intent_router = IntentRouter(call_tool=mcp_clients.call_tool, enabled=ROUTER_ENABLED)
+team = None
+
+
+@contextlib.asynccontextmanager
+async def lifespan(app: FastAPI):
+    global team
+    team = build_farmers_team(
+        get_openrouter_model(), get_openrouter_model(), get_openrouter_model(),
+        get_openrouter_model(), get_openrouter_model(),
+        db=InMemoryDb(), num_history_runs=HISTORY_RUNS, profile=RUN_PROFILE
+    )
+    try:
+        await mcp_clients.ensure_connected()
+    except ConnectionError as e:
+        # Sessions are retried before every run
+        logger.warning(f"MCP host not reachable at startup: {e}")
+
+    yield
+
+    await mcp_clients.close()
+
+
+app = FastAPI(title="Farm Agents Service", lifespan=lifespan)
+
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["*"],
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+)
+
+
+def _session_id(request: ChatRequest) -> str:
+    return request.session_id or request.farmer_id or str(uuid4())
+
+
+def _first_message(request: ChatRequest) -> str:
+    """New sessions get the client-side history as context, later turns use the server memory"""
+    if not request.conversation_history:
+        return request.message
+    history = "\n".join(f"{m.role}: {m.content}" for m in request.conversation_history[-10:])
+    return f"Previous conversation:\n{history}\n\nCurrent question: {request.message}"
+
+
+def _is_standalone(request: ChatRequest, session_id: str) -> bool:
+    """A question without conversation context - the only kind whose answer can be cached"""
+    if request.conversation_history and any(m.role == "user" for m in request.conversation_history):
+        return False
+    return team.db is None or team.db.get_session(session_id=session_id, session_type=SessionType.TEAM) is None
+
+
+def _touch_session(session_id: str) -> None:
+    """Mark the session as used and delete the histories that expired or overflow"""
+    for expired in sessions.touch(session_id):
+        if team.db is not None:
+            team.db.delete_session(session_id=expired)
+
+
+async def _prepare_run(request: ChatRequest) -> tuple:
+    session_id = _session_id(request)
+    _touch_session(session_id)
+    has_history = team.db is not None and team.db.get_session(session_id=session_id, session_type=SessionType.TEAM) is not None
+    message = request.message if has_history else _first_message(request)
+
+    try:
+        await mcp_clients.ensure_connected()
+    except ConnectionError as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
+
+    return session_id, message
+
+
+def _busy_error(error: Exception) -> HTTPException:
+    if isinstance(error, QueueFullError):
+        return HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many questions in progress, try again shortly",
+            headers={"Retry-After": "5"}
+        )
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="The agents are busy, try again shortly",
+        headers={"Retry-After": "10"}
+    )
+
+
+@app.post("/api/v1/ai-chat/query")
+async def query(request: ChatRequest) -> dict:
+    """Full answer in one response"""
+    session_id = _session_id(request)
+    standalone = _is_standalone(request, session_id)
+
+    # Simple lookups and repeated questions are answered without a team run (and without a queue slot)
+    if standalone:
+        routed = await intent_router.answer(request.message)
+        if routed is not None:
+            return {"answer": routed.answer, "session_id": session_id, "data": routed.data,
+                    "function_called": routed.tool, "cached": False}
+
+        cached = await response_cache.lookup(request.message)
+        if cached is not None:
+            return {"answer": cached, "session_id": session_id, "data": None, "function_called": None, "cached": True}
+
+    try:
+        async with limiter.slot():
+            session_id, message = await _prepare_run(request)
+            response = await asyncio.wait_for(
+                team.arun(message, session_id=session_id, user_id=request.farmer_id),
+                timeout=RUN_TIMEOUT_SECONDS
+            )
+    except (QueueFullError, QueueTimeoutError) as e:
+        raise _busy_error(e)
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail="The agents did not answer in time")
+
+    if standalone and response.content:
+        await response_cache.store(request.message, str(response.content))
+
+    return {
+        "answer": response.content,
+        "session_id": session_id,
+        "data": None,
+        "function_called": None,
+        "cached": False,
+    }
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+@app.post("/api/v1/ai-chat/stream")
+async def stream(request: ChatRequest) -> StreamingResponse:
+    """Answer streamed as Server-Sent Events: `token` events, then `done` (or `error`)"""
+    session_id = _session_id(request)
+    standalone = _is_standalone(request, session_id)
+
+    if standalone:
+        routed = await intent_router.answer(request.message)
+        cached = None if routed is not None else await response_cache.lookup(request.message)
+        if routed is not None or cached is not None:
+            async def immediate_events() -> AsyncIterator[str]:
+                yield _sse("session", {"session_id": session_id})
+                yield _sse("token", {"content": routed.answer if routed is not None else cached})
+                yield _sse("done", {"session_id": session_id, "cached": cached is not None,
+                                    "function_called": routed.tool if routed is not None else None})
+
+            return StreamingResponse(immediate_events(), media_type="text/event-stream",
+                                     headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+    # A full queue is a real 429 before the stream starts. The slot itself is taken
+    # inside the generator, so it is released by the same code that acquired it -
+    # a response whose body is never iterated holds nothing
+    try:
+        limiter.check_capacity()
+    except QueueFullError as e:
+        raise _busy_error(e)
+
+    session_id, message = await _prepare_run(request)
+
+    async def events() -> AsyncIterator[str]:
+        yield _sse("session", {"session_id": session_id})
+        try:
+            async with limiter.slot():
+                loop = asyncio.get_running_loop()
+                deadline = loop.time() + RUN_TIMEOUT_SECONDS
+                run = team.arun(message, stream=True, session_id=session_id, user_id=request.farmer_id)
+                answer = []
+                try:
+                    while True:
+                        try:
+                            event = await asyncio.wait_for(run.__anext__(), timeout=max(0.0, deadline - loop.time()))
+                        except StopAsyncIteration:
+                            break
+
+                        kind = getattr(event, "event", None)
+                        if kind == TEAM_CONTENT_EVENT and event.content:
+                            answer.append(str(event.content))
+                            yield _sse("token", {"content": event.content})
+                        elif kind == TEAM_ERROR_EVENT:
+                            yield _sse("error", {"detail": getattr(event, "content", None) or "Agent run failed"})
+                            return
+                    if standalone and answer:
+                        await response_cache.store(request.message, "".join(answer))
+                    yield _sse("done", {"session_id": session_id, "cached": False})
+                except asyncio.TimeoutError:
+                    yield _sse("error", {"detail": "The agents did not answer in time"})
+                finally:
+                    await run.aclose()
+        except (QueueFullError, QueueTimeoutError) as e:
+            yield _sse("error", {"detail": _busy_error(e).detail})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@app.delete("/api/v1/ai-chat/sessions/{session_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_session(session_id: str):
+    """Forget the server-side history of a conversation"""
+    team.db.delete_session(session_id=session_id)
+    sessions.forget(session_id)
+
+
+@app.get("/health")
+async def health() -> dict:
+    return {
+        "status": "ok",
+        "run_profile": RUN_PROFILE.name,
+        "runs": limiter.stats(),
+        "sessions": len(sessions),
+        "router": intent_router.metrics(),
+        "response_cache": response_cache.metrics(),
+        "mcp_sessions": await mcp_clients.health(),
+        "mcp_calls": mcp_clients.call_stats(),
+    }
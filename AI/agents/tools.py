@@ -1,26 +1,214 @@
-from agno.tools.mcp import MCPTools
-
-WEATHER_AGENT = MCPTools(
-    url = "http://127.0.0.1:8000/mcp/mcp_weather_agent/mcp",
-    transport= "streamable-http",
-    timeout_seconds= 1000
-)
-
-VEHICLES_AGENT = MCPTools(
-    url = "http://127.0.0.1:8000/mcp/mcp_vehicles_agent/mcp",
-    transport= "streamable-http",
-    timeout_seconds= 1000
-)
-
-EMPLOYEES_AGENT = MCPTools(
-    url = "http://127.0.0.1:8000/mcp/mcp_employees_agent/mcp",
-    transport= "streamable-http",
-    timeout_seconds= 1000
-)
-
-HARVEST_AGENT  = MCPTools(
-    url = "http://127.0.0.1:8000/mcp/mcp_harvest_agent/mcp",
-    transport= "streamable-http",
-    timeout_seconds= 1000
-)
+import asyncio
+import json
+import logging
+import os
+import time
+from datetime import timedelta
+from typing import Optional
 
+from agno.tools.mcp import MCPTools, StreamableHTTPClientParams
+
+logger = logging.getLogger(__name__)
+
+# Single MCP host (mcp_server.mcp_tools:app); every tool group is mounted under /mcp/<group>/mcp
+MCP_BASE_URL = os.getenv("MCP_BASE_URL", "http://127.0.0.1:8000")
+
+# Upper bound for one tool call (the server side gives up after 15-30 seconds)
+MCP_CALL_TIMEOUT_SECONDS = int(os.getenv("MCP_CALL_TIMEOUT_SECONDS", "60"))
+
+# How often a reused session is pinged before it is handed to an agent run
+MCP_HEALTH_CHECK_INTERVAL_SECONDS = float(os.getenv("MCP_HEALTH_CHECK_INTERVAL_SECONDS", "30"))
+
+# Tool calls in flight at once over all sessions (parallel members and the tool calls agno gathers per response)
+MCP_MAX_CONCURRENT_CALLS = int(os.getenv("MCP_MAX_CONCURRENT_CALLS", "8"))
+
+
+class MCPClientManager:
+    """
+    Long-lived MCP client sessions shared by every agent run.
+
+    Each tool group gets one MCPTools client, created up front (so agents can
+    be built with it) but connected lazily on first use. A connected session
+    keeps its HTTP client, and therefore its keep-alive connections, for the
+    lifetime of the process. Sessions are pinged at most once per
+    health_check_interval and reconnected when the ping fails.
+
+    Every session is opened and closed inside its own background task: the MCP
+    transport uses anyio cancel scopes that must be exited by the task that
+    entered them, while tool calls can come from any task.
+
+    Call ensure_connected() before a run (cheap while the sessions are healthy):
+    agno only connects/closes MCP clients around a run when they are not
+    connected yet, which is exactly the re-handshake this manager avoids.
+
+    Every tool call of every session, from agent runs and from call_tool(),
+    waits for one of max_concurrent_calls slots, so parallel member runs
+    cannot flood the MCP host (and its Mongo pool).
+    """
+
+    def __init__(self,
+                 base_url: str = MCP_BASE_URL,
+                 call_timeout_seconds: int = MCP_CALL_TIMEOUT_SECONDS,
+                 health_check_interval_seconds: float = MCP_HEALTH_CHECK_INTERVAL_SECONDS,
+                 max_concurrent_calls: int = MCP_MAX_CONCURRENT_CALLS):
+        self.base_url = base_url.rstrip("/")
+        self.call_timeout_seconds = call_timeout_seconds
+        self.health_check_interval_seconds = health_check_interval_seconds
+        self.max_concurrent_calls = max(1, max_concurrent_calls)
+
+        self._call_slots = asyncio.Semaphore(self.max_concurrent_calls)
+        self._calls_in_flight = 0
+        self._peak_calls_in_flight = 0
+
+        self._clients: dict[str, MCPTools] = {}
+        self._holders: dict[str, tuple[asyncio.Task, asyncio.Event]] = {}
+        self._last_check: dict[str, float] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+
+    def client(self, group: str) -> MCPTools:
+        """The (possibly not yet connected) client of a tool group"""
+        if group not in self._clients:
+            self._clients[group] = MCPTools(
+                transport="streamable-http",
+                server_params=StreamableHTTPClientParams(
+                    url=f"{self.base_url}/mcp/{group}/mcp",
+                    timeout=timedelta(seconds=self.call_timeout_seconds),
+                ),
+                timeout_seconds=self.call_timeout_seconds,
+            )
+        return self._clients[group]
+
+    async def ensure_connected(self, groups: Optional[list[str]] = None) -> None:
+        """Connect (or health-check and reconnect) the given groups, all of them by default"""
+        await asyncio.gather(*(self._ensure_group(group) for group in (groups or list(self._clients))))
+
+    async def call_tool(self, group: str, tool: str, arguments: dict) -> dict:
+        """Call one tool outside of an agent run and return its (JSON) result"""
+        await self.ensure_connected([group])
+        result = await self.client(group).session.call_tool(
+            tool, arguments, read_timeout_seconds=timedelta(seconds=self.call_timeout_seconds)
+        )
+
+        text = "".join(getattr(item, "text", "") for item in result.content)
+        if result.isError:
+            raise RuntimeError(f"{tool} failed: {text}")
+
+        # FastMCP wraps non-object return values as {"result": ...}
+        data = result.structuredContent
+        if data is None:
+            data = json.loads(text) if text else {}
+        elif set(data) == {"result"}:
+            data = data["result"]
+        return data
+
+    def call_stats(self) -> dict:
+        return {
+            "max_concurrent_calls": self.max_concurrent_calls,
+            "in_flight": self._calls_in_flight,
+            "peak_in_flight": self._peak_calls_in_flight,
+        }
+
+    async def health(self) -> dict:
+        """Ping every connected session; groups that were never used report None"""
+        async def check(group: str):
+            client = self._clients[group]
+            if not client.initialized:
+                return None
+            try:
+                return await asyncio.wait_for(client.is_alive(), timeout=5)
+            except asyncio.TimeoutError:
+                return False
+
+        groups = list(self._clients)
+        results = await asyncio.gather(*(check(group) for group in groups))
+        return dict(zip(groups, results))
+
+    async def close(self) -> None:
+        """Close every session (process shutdown)"""
+        await asyncio.gather(*(self._disconnect(group) for group in list(self._holders)))
+
+    async def _ensure_group(self, group: str) -> None:
+        lock = self._locks.setdefault(group, asyncio.Lock())
+        async with lock:
+            client = self.client(group)
+            holder = self._holders.get(group)
+
+            if holder is not None and client.initialized and not holder[0].done():
+                now = time.monotonic()
+                if now - self._last_check.get(group, 0.0) < self.health_check_interval_seconds:
+                    return
+                try:
+                    alive = await asyncio.wait_for(client.is_alive(), timeout=5)
+                except asyncio.TimeoutError:
+                    alive = False
+                if alive:
+                    self._last_check[group] = now
+                    return
+                logger.warning(f"MCP session for {group} is not responding, reconnecting")
+
+            await self._disconnect(group)
+            await self._connect(group)
+
+    async def _connect(self, group: str) -> None:
+        client = self.client(group)
+        ready = asyncio.Event()
+        stop = asyncio.Event()
+
+        async def hold():
+            try:
+                await client.connect()
+                ready.set()
+                await stop.wait()
+            finally:
+                ready.set()
+                await client.close()
+
+        task = asyncio.create_task(hold(), name=f"mcp-session-{group}")
+        self._holders[group] = (task, stop)
+        await ready.wait()
+
+        if not client.initialized:
+            await self._disconnect(group)
+            raise ConnectionError(f"Could not connect to the MCP server at {self.base_url}/mcp/{group}/mcp")
+        self._limit_calls(client.session)
+        self._last_check[group] = time.monotonic()
+
+    def _limit_calls(self, session) -> None:
+        """Route the session's call_tool (used by the agno tool entrypoints) through the shared call slots"""
+        call_tool = session.call_tool
+
+        async def limited_call_tool(*args, **kwargs):
+            async with self._call_slots:
+                self._calls_in_flight += 1
+                self._peak_calls_in_flight = max(self._peak_calls_in_flight, self._calls_in_flight)
+                try:
+                    return await call_tool(*args, **kwargs)
+                finally:
+                    self._calls_in_flight -= 1
+
+        session.call_tool = limited_call_tool
+
+    async def _disconnect(self, group: str) -> None:
+        holder = self._holders.pop(group, None)
+        if holder is None:
+            return
+        task, stop = holder
+        stop.set()
+        try:
+            await task
+        except Exception as e:
+            logger.warning(f"Closing the MCP session for {group} failed: {e}")
+
+
+# Shared by the whole process
+mcp_clients = MCPClientManager()
+
+WEATHER_AGENT = mcp_clients.client("mcp_weather_agent")
+
+VEHICLES_AGENT = mcp_clients.client("mcp_vehicles_agent")
+
+EMPLOYEES_AGENT = mcp_clients.client("mcp_employees_agent")
+
+HARVEST_AGENT = mcp_clients.client("mcp_harvest_agent")
+
+BRIEFING_AGENT = mcp_clients.client("mcp_briefing_agent")
@@ -0,0 +1,167 @@
+"""
+Seeded farm database for the benchmarks.
+
+Builds the collections the MCP tools read - farmers, harvest_logs,
+weather_logs, employee_daily_hours, data_versions - from a
+random.Random(seed), so every run of a benchmark sees exactly the same data.
+Documents have the same shape as the Backend writes them (native dates,
+farmer_id strings in equipment, birth_month_day/payday on farmers, the
+precomputed (day, employee) rows), plus the indexes the tools rely on.
+"""
+import random
+from datetime import date, datetime, timedelta
+
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+# Never seeded: the production database name of mcp_server.db
+PROTECTED_DATABASES = {"farmer_assessment_db"}
+
+FIRST_NAMES = ["Ion", "Maria", "Andrei", "Elena", "Mihai", "Ana", "Gheorghe", "Ioana", "Vasile", "Cristina",
+               "Alexandru", "Mihaela", "Florin", "Gabriela", "Nicolae", "Daniela"]
+LAST_NAMES = ["Popescu", "Ionescu", "Popa", "Dumitru", "Stan", "Stoica", "Gheorghe", "Rusu", "Munteanu", "Matei"]
+ROLES = ["Tractor Driver", "Combine Operator", "Harvest Worker", "Harvest Worker", "Sprayer Operator", "Farm Manager"]
+EQUIPMENT_TYPES = {
+    "Tractor Driver": "Tractor",
+    "Combine Operator": "Combine Harvester",
+    "Sprayer Operator": "Sprayer",
+    "Harvest Worker": "Truck",
+}
+WEATHER_DESCRIPTIONS = ["Sunny", "Partly cloudy", "Cloudy", "Light rain", "Rain", "Thunderstorm"]
+# kg per hectare, as in the seed import
+CROP_YIELDS = {"wheat": 4000, "sunflower": 2000, "beans": 2000, "tomatoes": 50000}
+LOCATION = "Timisoara, Romania"
+
+
+def _farmers(rng: random.Random, count: int) -> list:
+    farmers = []
+    for worker_id in range(1, count + 1):
+        birth = date(1965, 1, 1) + timedelta(days=rng.randrange(0, 365 * 35))
+        sex = 1 if rng.random() < 0.5 else 2
+        cnp = f"{sex if birth.year < 2000 else sex + 4}{birth:%y%m%d}35{worker_id:03d}{rng.randrange(10)}"
+        first_name, last_name = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        role = ROLES[(worker_id - 1) % len(ROLES)]
+        farmers.append({
+            "_id": ObjectId(),
+            "first_name": first_name,
+            "last_name": last_name,
+            "cnp": cnp,
+            "birth_month_day": birth.month * 100 + birth.day,
+            "email": f"{first_name.lower()}.{last_name.lower()}{worker_id}@farm.ro",
+            "age": 2025 - birth.year,
+            "worker_id": worker_id,
+            "role": role,
+            "payday": rng.choice([1, 5, 10, 15, 20, 25, 28]),
+            "county": "Timis",
+            "city": "Timisoara",
+            "created_at": datetime(2025, 1, 1),
+        })
+    return farmers
+
+
+def _harvest_logs(rng: random.Random, farmers: list, start: date, days: int) -> list:
+    operators = [farmer for farmer in farmers if farmer["role"] in EQUIPMENT_TYPES]
+    logs = []
+    for offset in range(days):
+        day = start + timedelta(days=offset)
+        weekend = day.weekday() >= 5
+        crew = rng.sample(operators, k=max(1, len(operators) // (3 if weekend else 1) - rng.randrange(3)))
+
+        hectares = {crop: round(rng.uniform(0, 6 if crop != "tomatoes" else 1.5) * (0.3 if weekend else 1), 2)
+                    for crop in CROP_YIELDS}
+        logs.append({
+            "date": datetime.combine(day, datetime.min.time()),
+            "notes": "Weekend" if weekend else rng.choice(["Normal", "Normal", "Normal", "Rain delay", "Equipment maintenance"]),
+            **{f"{crop}_harvested_hectares": value for crop, value in hectares.items()},
+            **{f"{crop}_harvested_kg": round(hectares[crop] * CROP_YIELDS[crop] * rng.uniform(0.8, 1.2), 2)
+               for crop in CROP_YIELDS},
+            "oil_price_per_liter": round(7.2 + 0.4 * rng.random(), 2),
+            "equipment": [
+                {
+                    "equipment_type": EQUIPMENT_TYPES[farmer["role"]],
+                    "farmer_id": str(farmer["_id"]),
+                    "work_hours": round(rng.uniform(2, 10), 1),
+                    "fuel_consumed_liters": round(rng.uniform(10, 80), 1),
+                }
+                for farmer in crew
+            ],
+            "farmer_id": None,
+            "created_at": datetime.combine(day, datetime.min.time()),
+        })
+    return logs
+
+
+def _employee_daily_hours(harvest_logs: list) -> list:
+    """The rows the Backend keeps in employee_daily_hours (HarvestService.employee_daily_hours_pipeline)"""
+    rows = []
+    for log in harvest_logs:
+        hours = {}
+        for usage in log["equipment"]:
+            per_type = hours.setdefault(usage["farmer_id"], {})
+            per_type[usage["equipment_type"]] = per_type.get(usage["equipment_type"], 0) + usage["work_hours"]
+        for farmer_id, per_type in hours.items():
+            rows.append({
+                "_id": {"day": log["date"].strftime("%Y-%m-%d"), "farmer_id": farmer_id},
+                "date": log["date"],
+                "tasks": [{"equipment_type": equipment_type, "work_hours": work_hours}
+                          for equipment_type, work_hours in sorted(per_type.items())],
+                "total_work_hours_for_day": sum(per_type.values()),
+            })
+    return rows
+
+
+def _weather_logs(rng: random.Random, start: date, days: int) -> list:
+    logs = []
+    for offset in range(days):
+        day = start + timedelta(days=offset)
+        # Seasonal curve peaking in late July
+        seasonal = 18 + 12 * (1 - abs((day.timetuple().tm_yday - 205) / 182))
+        high = round(seasonal + rng.uniform(-4, 4), 1)
+        logs.append({
+            "location": LOCATION,
+            "date": datetime.combine(day, datetime.min.time()),
+            "max_temp_celsius": high,
+            "min_temp_celsius": round(high - rng.uniform(6, 12), 1),
+            "weather_description": rng.choice(WEATHER_DESCRIPTIONS),
+            "temperature_unit": "°C",
+            "data_sources": ["benchmark-fixture"],
+            "imported_at": datetime(2025, 1, 1),
+        })
+    return logs
+
+
+async def seed_farm_database(db: AsyncIOMotorDatabase,
+                             seed: int = 7,
+                             start: date = date(2025, 6, 1),
+                             days: int = 183,
+                             workers: int = 24) -> dict:
+    """Drop and re-create the fixture collections; returns the document counts"""
+    if db.name in PROTECTED_DATABASES:
+        raise ValueError(f"Refusing to seed the fixture into {db.name}")
+
+    rng = random.Random(seed)
+    farmers = _farmers(rng, workers)
+    harvest_logs = _harvest_logs(rng, farmers, start, days)
+    collections = {
+        "farmers": farmers,
+        "harvest_logs": harvest_logs,
+        "weather_logs": _weather_logs(rng, start, days),
+        "employee_daily_hours": _employee_daily_hours(harvest_logs),
+    }
+
+    for name, documents in collections.items():
+        await db[name].drop()
+        await db[name].insert_many(documents)
+
+    await db.harvest_logs.create_index("date", unique=True)
+    await db.weather_logs.create_index([("location", 1), ("date", 1)], unique=True)
+    await db.weather_logs.create_index("date")
+    await db.farmers.create_index("role")
+    await db.farmers.create_index("payday")
+    await db.farmers.create_index("birth_month_day")
+    await db.employee_daily_hours.create_index("date")
+
+    await db.data_versions.drop()
+    await db.data_versions.insert_many([{"_id": name, "version": 1} for name in ("farmers", "harvest_logs", "weather_logs")])
+
+    return {name: len(documents) for name, documents in collections.items()}
@@ -0,0 +1,148 @@
+"""
+Fast-path router benchmark.
+
+Replays a fixed question set through the deterministic router (agents.router):
+routing accuracy against the expected tool, coverage and classification time.
+With --tools the routed questions are answered end to end over the MCP host;
+with --team the same questions also go through the farmers team, which gives
+the latency and the LLM tokens the fast path saves (the router uses none).
+
+Usage (from the AI directory; --tools/--team need the MCP host running):
+    python -m benchmarks.intent_router
+    python -m benchmarks.intent_router --tools --team
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from datetime import date
+
+from agents.router import ROUTER_MIN_CONFIDENCE, IntentRouter, classify
+from agents.tools import mcp_clients
+
+# Same reference date as AI/main.py
+REFERENCE_DATE = date(2025, 11, 16)
+
+# (question, tool the router should call - None when the team has to answer)
+QUESTIONS = [
+    ("What was the oil price on 12 November 2025?", "get_oil_price_for_a_specific_day"),
+    ("Cat a costat motorina pe 12.11.2025?", "get_oil_price_for_a_specific_day"),
+    ("Today is 16 november 2025. What was the oil price yesterday?", "get_oil_price_for_a_specific_day"),
+    ("How much money did we spend on oil between 1 november 2025 and 15 november 2025?",
+     "get_total_oil_price_for_a_period_of_time"),
+    ("Today is 16 november 2025. Tell me how much money we spent on oil in the last 7 days, ending yesterday.",
+     "get_total_oil_price_for_a_period_of_time"),
+    ("Weather on 2025-11-10", "get_weather_info_for_a_day"),
+    ("Today is 16 november 2025. How was the weather in the last 7 days?", "get_weather_info_for_last_n_days"),
+    ("Today is 16 november 2025. I am in Timisoara, Romania. How will the weather be next week?",
+     "get_weather_info_for_the_next_n_days"),
+    ("Show me the employees with role Tractor Driver", "get_employee_with_a_specific_role"),
+    ("Which employees have the role Harvest Worker?", "get_employee_with_a_specific_role"),
+    ("What is the role of Ion Popescu?", None),
+    ("How many employees have the role Tractor Driver and what are their birthdays?", None),
+    ("Today is 16 november 2025. Which employees must be paid in the next 10 days?",
+     "get_employees_paid_in_n_days_from_date"),
+    ("Today is 16 november 2025. Whose birthday is in the next 30 days?",
+     "get_employees_bday_in_next_n_days_from_day_x"),
+    ("What is the yield for beans and tomatoes from July 14-21, 2025?", "get_crops_yield_for_a_specific_period"),
+    ("Wheat harvest between 1 july 2025 and 31 july 2025", "get_crops_yield_for_a_specific_period"),
+    # Compound or analytical questions stay with the team
+    ("Why was the wheat yield lower in July 2025 than in June?", None),
+    ("Tell me the weather next week and how much we spent on oil in the last 7 days", None),
+    ("Compare the sunflower yield of July 14-21, 2025 with the weather of those days", None),
+    ("Today is 16 november 2025. Give me a briefing for the farm", None),
+    ("Should we harvest the tomatoes tomorrow?", None),
+    # Qualifiers the tool has no argument for
+    ("What was the total oil cost in the last 30 days for the tractor driver Ion?", None),
+    ("What was the weather on 3 March 2025 in Cluj?", None),
+]
+
+
+def classification_report(rounds: int) -> list:
+    rows = []
+    for question, expected in QUESTIONS:
+        timings = []
+        for _ in range(rounds):
+            start = time.perf_counter()
+            route = classify(question, REFERENCE_DATE)
+            timings.append(time.perf_counter() - start)
+
+        routed = route is not None and route.confidence >= ROUTER_MIN_CONFIDENCE
+        rows.append({
+            "question": question,
+            "expected": expected,
+            "tool": route.tool if routed else None,
+            "confidence": route.confidence if route is not None else 0.0,
+            "classify_us": 1e6 * statistics.median(timings),
+        })
+    return rows
+
+
+async def fast_path_seconds(router: IntentRouter, question: str) -> float:
+    start = time.perf_counter()
+    await router.answer(question, REFERENCE_DATE)
+    return time.perf_counter() - start
+
+
+async def team_run(team, question: str) -> tuple:
+    """(seconds, total tokens) of one team run"""
+    start = time.perf_counter()
+    response = await team.arun(question)
+    elapsed = time.perf_counter() - start
+    metrics = getattr(response, "metrics", None)
+    tokens = (metrics.input_tokens or 0) + (metrics.output_tokens or 0) if metrics is not None else 0
+    return elapsed, tokens
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rounds", type=int, default=200, help="classification repetitions per question")
+    parser.add_argument("--tools", action="store_true", help="answer the routed questions over the MCP host")
+    parser.add_argument("--team", action="store_true", help="also run the routed questions through the team")
+    args = parser.parse_args()
+
+    rows = classification_report(args.rounds)
+    correct = sum(1 for row in rows if row["tool"] == row["expected"])
+    routed = [row for row in rows if row["tool"] is not None]
+
+    print(f"Intent router benchmark ({len(rows)} questions, min confidence {ROUTER_MIN_CONFIDENCE})\n")
+    for row in rows:
+        mark = "ok " if row["tool"] == row["expected"] else "BAD"
+        print(f"{mark} {row['confidence']:.2f} {row['classify_us']:>7.1f}us  {row['tool'] or 'team':<46} {row['question'][:60]}")
+    print(f"\naccuracy {correct}/{len(rows)}, routed {len(routed)}/{len(rows)}, "
+          f"median classification {statistics.median(row['classify_us'] for row in rows):.1f}us")
+
+    if not (args.tools or args.team):
+        return
+
+    try:
+        await mcp_clients.ensure_connected([
+            "mcp_weather_agent", "mcp_vehicles_agent", "mcp_employees_agent", "mcp_harvest_agent"
+        ])
+        router = IntentRouter(call_tool=mcp_clients.call_tool)
+        fast = {row["question"]: await fast_path_seconds(router, row["question"]) for row in routed}
+        print(f"\nfast path: median {1000 * statistics.median(fast.values()):.1f}ms, "
+              f"total {sum(fast.values()):.2f}s for {len(fast)} questions")
+
+        if args.team:
+            from agents.agent import build_farmers_team
+            from models.model import get_openrouter_model
+
+            team = build_farmers_team(get_openrouter_model(), get_openrouter_model(), get_openrouter_model(),
+                                      get_openrouter_model(), get_openrouter_model())
+            slow_seconds, tokens = [], 0
+            for question in fast:
+                elapsed, used = await team_run(team, question)
+                slow_seconds.append(elapsed)
+                tokens += used
+                print(f"team {elapsed:>6.2f}s {used:>7} tokens  fast path {1000 * fast[question]:>7.1f}ms  {question[:50]}")
+
+            print(f"\nteam: median {statistics.median(slow_seconds):.2f}s, total {sum(slow_seconds):.2f}s")
+            print(f"saved {sum(slow_seconds) - sum(fast.values()):.2f}s and {tokens} LLM tokens "
+                  f"({tokens / len(fast):.0f} per routed question)")
+    finally:
+        await mcp_clients.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,83 @@
+"""
+Concurrency benchmark for the MCP tools.
+
+Issues the same batch of tool calls sequentially and in parallel
+(asyncio.gather) and reports wall time plus the worst event loop stall,
+which shows whether one slow query blocks every other tool.
+
+Usage (from the AI directory):
+    python -m benchmarks.mcp_concurrency --parallel 32
+"""
+import argparse
+import asyncio
+import time
+
+from mcp_server import db
+from mcp_server import mcp_tools
+
+
+def build_calls(reference_day: int, reference_month: int, reference_year: int):
+    """A representative mix of tool calls (same reference date as AI/main.py)"""
+    return [
+        lambda: mcp_tools.get_weather_info_for_last_n_days(7, reference_day, reference_month, reference_year),
+        lambda: mcp_tools.get_weather_info_for_the_next_n_days(7, reference_day, reference_month, reference_year),
+        lambda: mcp_tools.get_total_oil_price_for_a_period_of_time(9, 11, 2025, 15, 11, 2025),
+        lambda: mcp_tools.get_employees_paid_in_n_days_from_date(7, reference_day, reference_month, reference_year),
+        lambda: mcp_tools.get_stats_about_employees_tasks_from_last_n_days(30, reference_day, reference_month, reference_year),
+        lambda: mcp_tools.get_wheat_yield_for_a_specific_period(14, 7, 2025, 21, 7, 2025),
+        lambda: mcp_tools.get_tomatoes_yield_for_a_specific_period(14, 7, 2025, 21, 7, 2025),
+        lambda: mcp_tools.get_sunflower_yield_for_a_specific_period(14, 7, 2025, 21, 7, 2025),
+        lambda: mcp_tools.get_beans_yield_for_a_specific_period(14, 7, 2025, 21, 7, 2025),
+    ]
+
+
+async def measure_loop_lag(stop: asyncio.Event, interval: float = 0.01) -> float:
+    """Return the largest delay between scheduled and actual wake-ups of a ticker task"""
+    worst = 0.0
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        expected = loop.time() + interval
+        await asyncio.sleep(interval)
+        worst = max(worst, loop.time() - expected)
+    return worst
+
+
+async def run_batch(calls, parallel: bool) -> tuple[float, float]:
+    stop = asyncio.Event()
+    lag_task = asyncio.create_task(measure_loop_lag(stop))
+
+    start = time.perf_counter()
+    if parallel:
+        await asyncio.gather(*(call() for call in calls))
+    else:
+        for call in calls:
+            await call()
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    worst_lag = await lag_task
+    return elapsed, worst_lag
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--parallel", type=int, default=32, help="number of tool calls per batch")
+    args = parser.parse_args()
+
+    base_calls = build_calls(16, 11, 2025)
+    calls = [base_calls[i % len(base_calls)] for i in range(args.parallel)]
+
+    await db.ping()
+    # Warm-up so pool connections are already open
+    await run_batch(base_calls, parallel=True)
+
+    for label, parallel in (("sequential", False), ("parallel", True)):
+        elapsed, worst_lag = await run_batch(calls, parallel)
+        print(f"{label:<11} {len(calls):>4} calls  {elapsed:>8.3f}s  "
+              f"{len(calls) / elapsed:>8.1f} calls/s  worst loop stall {worst_lag * 1000:>7.1f} ms")
+
+    db.close_client()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
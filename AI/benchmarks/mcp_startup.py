@@ -0,0 +1,104 @@
+"""
+Startup time and memory of the MCP host.
+
+Compares the single host (every tool group in one process) against the old
+layout with one process per tool group (ports 8001-8004). Every process is a
+uvicorn worker started with MCP_GROUPS; it is ready once /health answers.
+Memory is the resident set size from /proc (Linux).
+
+Usage (from the AI directory):
+    python -m benchmarks.mcp_startup --rounds 3
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+from mcp_server.mcp_tools import MCP_SERVERS
+
+AI_DIR = Path(__file__).resolve().parent.parent
+
+
+def rss_mb(pid: int):
+    """Resident memory of a process in MB, None where /proc is not available"""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        return None
+    return None
+
+
+def start_host(groups: list, port: int, env: dict | None = None) -> subprocess.Popen:
+    env = {**os.environ, **(env or {}), "MCP_GROUPS": ",".join(groups)}
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "mcp_server.mcp_tools:app", "--host", "127.0.0.1", "--port", str(port)],
+        cwd=AI_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+
+
+def wait_ready(port: int, timeout: float) -> None:
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/health", timeout=5).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.05)
+    raise TimeoutError(f"MCP host on port {port} did not become ready in {timeout}s")
+
+
+def measure_layout(layout: list, base_port: int, timeout: float) -> tuple:
+    """Start every process of a layout at once; returns (seconds until all are ready, total RSS MB)"""
+    start = time.perf_counter()
+    processes = [start_host(groups, base_port + i) for i, groups in enumerate(layout)]
+    try:
+        for i in range(len(layout)):
+            wait_ready(base_port + i, timeout)
+        elapsed = time.perf_counter() - start
+
+        memory = [rss_mb(process.pid) for process in processes]
+        total_memory = sum(memory) if None not in memory else None
+        return elapsed, total_memory
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--base-port", type=int, default=8101)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    args = parser.parse_args()
+
+    groups = list(MCP_SERVERS)
+    layouts = {
+        "single host": [groups],
+        "one process per group": [[name] for name in groups],
+    }
+
+    print(f"MCP startup benchmark ({len(groups)} tool groups, {args.rounds} rounds)\n")
+    for name, layout in layouts.items():
+        times, memory = [], []
+        for _ in range(args.rounds):
+            elapsed, total_memory = measure_layout(layout, args.base_port, args.timeout)
+            times.append(elapsed)
+            memory.append(total_memory)
+
+        best = min(times)
+        rss = f"{max(m for m in memory):>8.1f} MB" if None not in memory else "     n/a"
+        print(f"{name:<24} {len(layout)} process(es)  ready in {best:>6.2f}s (best)  RSS {rss}")
+
+
+if __name__ == "__main__":
+    main()
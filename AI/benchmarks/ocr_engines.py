@@ -0,0 +1,72 @@
+"""
+OCR engine benchmark (ocr.engine).
+
+Measures the per-page cost of each available engine: pytesseract (one
+tesseract process per page, language models loaded every time) and
+tesserocr (in-process API, models loaded once). The fixed overhead is
+timed on a small blank image, where recognition itself costs next to
+nothing; with sample scans the preprocessed pages are OCR'd as well. The
+first call of each engine (model loading) is reported separately.
+
+Usage (from the AI directory):
+    python -m benchmarks.ocr_engines
+    python -m benchmarks.ocr_engines scans/*.jpg --rounds 5
+"""
+import argparse
+import statistics
+import time
+
+import numpy as np
+
+from ocr import engine as ocr_engine
+from ocr.document_processor import DocumentProcessor
+
+
+def _timed(engine, image, lang: str) -> float:
+    start = time.perf_counter()
+    engine.recognize(image, lang=lang)
+    return time.perf_counter() - start
+
+
+def measure(name: str, pages: list, rounds: int, lang: str) -> dict:
+    engine = ocr_engine.get_engine(name)
+    blank = np.full((64, 256), 255, dtype=np.uint8)
+
+    first_call = _timed(engine, blank, lang)
+    overhead = [_timed(engine, blank, lang) for _ in range(rounds)]
+    page_seconds = [_timed(engine, page, lang) for _ in range(rounds) for page in pages]
+    return {
+        "first_call_ms": first_call * 1000,
+        "overhead_ms": statistics.median(overhead) * 1000,
+        "page_ms": statistics.median(page_seconds) * 1000 if page_seconds else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("files", nargs="*", help="sample scans (images or PDFs)")
+    parser.add_argument("--rounds", type=int, default=10, help="repetitions per image")
+    parser.add_argument("--lang", default="ron+eng")
+    parser.add_argument("--tesseract-path", help="path to the tesseract executable (pytesseract)")
+    args = parser.parse_args()
+
+    processor = DocumentProcessor(args.tesseract_path)
+    pages = [
+        processor.preprocess_image(page)
+        for file_path in args.files
+        for page in processor.iter_pages(file_path)
+    ]
+
+    engines = ["pytesseract"] + (["tesserocr"] if ocr_engine.tesserocr is not None else [])
+    if len(engines) == 1:
+        print("tesserocr is not installed: only the pytesseract baseline is measured\n")
+
+    print(f"{'engine':<12} {'first call':>11} {'per-page overhead':>18} {'per page':>10}")
+    for name in engines:
+        result = measure(name, pages, args.rounds, args.lang)
+        page = f"{result['page_ms']:>8.0f}ms" if result["page_ms"] is not None else f"{'-':>10}"
+        print(f"{name:<12} {result['first_call_ms']:>9.0f}ms {result['overhead_ms']:>16.1f}ms {page}")
+
+
+if __name__ == "__main__":
+    main()
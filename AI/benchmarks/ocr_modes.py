@@ -0,0 +1,78 @@
+"""
+OCR mode benchmark (DocumentProcessor.ocr_mode).
+
+Runs every document through its extractor twice, once with full-page OCR
+('full') and once with region-of-interest OCR and early exit ('roi'), and
+prints the latency of each, the pages and regions actually OCR'd, and which
+extracted fields differ between the two. Needs Tesseract and Poppler; the
+OCR cache is not used.
+
+Usage (from the AI directory):
+    python -m benchmarks.ocr_modes cni scans/ci_*.jpg
+    python -m benchmarks.ocr_modes parcel docs/extras_cf.pdf --rounds 3
+"""
+import argparse
+import statistics
+import time
+
+from ocr.certificate_extractor import CertificateExtractor
+from ocr.cni_extractor import CNIExtractor
+from ocr.parcel_extractor import ParcelExtractor
+
+EXTRACTORS = {
+    "cni": (CNIExtractor, "extract_cni_data"),
+    "certificate": (CertificateExtractor, "extract_certificate_data"),
+    "parcel": (ParcelExtractor, "extract_parcel_data"),
+}
+
+MODES = ("full", "roi")
+
+
+def run(document_type: str, file_path: str, mode: str, rounds: int, tesseract_path: str = None) -> dict:
+    extractor_class, method = EXTRACTORS[document_type]
+    extractor = extractor_class(tesseract_path)
+    extractor.ocr_mode = mode
+
+    seconds = []
+    result = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        result = getattr(extractor, method)(file_path)
+        seconds.append(time.perf_counter() - start)
+    return {"seconds": statistics.median(seconds), "result": result}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("document_type", choices=sorted(EXTRACTORS))
+    parser.add_argument("files", nargs="+", help="documents of that type")
+    parser.add_argument("--rounds", type=int, default=1, help="runs per document and mode (median is reported)")
+    parser.add_argument("--tesseract-path", help="path to the tesseract executable")
+    args = parser.parse_args()
+
+    totals = {mode: 0.0 for mode in MODES}
+    for file_path in args.files:
+        runs = {mode: run(args.document_type, file_path, mode, args.rounds, args.tesseract_path) for mode in MODES}
+        for mode in MODES:
+            totals[mode] += runs[mode]["seconds"]
+
+        full, roi = runs["full"]["result"], runs["roi"]["result"]
+        differing = sorted(
+            field for field in full["extracted_data"]
+            if full["extracted_data"].get(field) != roi["extracted_data"].get(field)
+        )
+        print(f"{file_path}")
+        print(f"  full {runs['full']['seconds']:7.2f}s  pages {full['page_count']}")
+        print(f"  roi  {runs['roi']['seconds']:7.2f}s  pages {roi['page_count']}  "
+              f"mode {roi.get('ocr_mode', 'pages')}  regions {roi.get('regions_read', '-')}  "
+              f"early exit {roi.get('early_exit')}")
+        print(f"  speedup {runs['full']['seconds'] / max(runs['roi']['seconds'], 1e-9):5.1f}x  "
+              f"differing fields: {', '.join(differing) or '-'}")
+
+    if len(args.files) > 1:
+        print(f"\ntotal  full {totals['full']:.2f}s  roi {totals['roi']:.2f}s  "
+              f"speedup {totals['full'] / max(totals['roi'], 1e-9):.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Preprocessing profile benchmark (ocr.preprocessing).
+
+OCRs every page of the sample scans with each preprocessing profile and
+prints, per profile, the median preprocessing and OCR time per page, the
+mean Tesseract confidence and its difference to the 'quality' profile (the
+previous, always-denoise pipeline), and which denoisers the noise estimate
+selected. Needs Tesseract and Poppler.
+
+Usage (from the AI directory):
+    python -m benchmarks.preprocessing scans/*.jpg docs/*.pdf
+    python -m benchmarks.preprocessing scans/*.jpg --profiles quality fast
+"""
+import argparse
+import statistics
+import time
+from collections import Counter
+
+from ocr.document_processor import DocumentProcessor
+from ocr.preprocessing import PREPROCESSING_PROFILES
+
+
+def measure(processor: DocumentProcessor, pages: list, profile: str) -> dict:
+    processor.preprocessing_profile = profile
+    preprocess_seconds, ocr_seconds, confidences, denoisers = [], [], [], Counter()
+
+    for page in pages:
+        start = time.perf_counter()
+        processor.preprocess_image(page)
+        preprocess_seconds.append(time.perf_counter() - start)
+        denoisers[processor.last_preprocessing["denoiser"]] += 1
+
+        # extract_text_from_image preprocesses again; its OCR share is the difference
+        start = time.perf_counter()
+        _, confidence = processor.extract_text_from_image(page)
+        ocr_seconds.append(max(0.0, time.perf_counter() - start - preprocess_seconds[-1]))
+        confidences.append(confidence)
+
+    return {
+        "preprocess_ms": statistics.median(preprocess_seconds) * 1000,
+        "ocr_ms": statistics.median(ocr_seconds) * 1000,
+        "confidence": statistics.mean(confidences),
+        "denoisers": dict(denoisers),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("files", nargs="+", help="sample scans (images or PDFs)")
+    parser.add_argument("--profiles", nargs="+", choices=sorted(PREPROCESSING_PROFILES),
+                        default=list(PREPROCESSING_PROFILES))
+    parser.add_argument("--tesseract-path", help="path to the tesseract executable")
+    args = parser.parse_args()
+
+    processor = DocumentProcessor(args.tesseract_path)
+    pages = [page for file_path in args.files for page in processor.iter_pages(file_path)]
+    print(f"{len(pages)} pages from {len(args.files)} files\n")
+
+    results = {profile: measure(processor, pages, profile) for profile in args.profiles}
+    baseline = results.get("quality")
+
+    print(f"{'profile':<10} {'preprocess':>12} {'ocr':>10} {'total':>10} {'confidence':>11} {'vs quality':>11}  denoisers")
+    for profile, result in results.items():
+        delta = f"{result['confidence'] - baseline['confidence']:+.3f}" if baseline else "-"
+        print(f"{profile:<10} {result['preprocess_ms']:>10.0f}ms {result['ocr_ms']:>8.0f}ms "
+              f"{result['preprocess_ms'] + result['ocr_ms']:>8.0f}ms {result['confidence']:>11.3f} {delta:>11}  "
+              f"{', '.join(f'{name} x{count}' for name, count in result['denoisers'].items())}")
+
+
+if __name__ == "__main__":
+    main()
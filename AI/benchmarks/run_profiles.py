@@ -0,0 +1,140 @@
+"""
+Run profile benchmark (agents.profiles).
+
+Without --live: builds the team once per profile and prints, per agent, the
+instruction set it got, the provider prompt caching it can use and the size
+of its static system prompt (role + instructions + expected output), in
+tokens estimated as characters / 4. No network.
+
+With --live (needs the MCP host and the model API key): asks the same
+questions through the team with every profile, streaming, and records the
+time to the first answer token, the wall time and the tokens of the team
+lead and its members - input, cached input (cache_read_tokens as reported by
+the provider) and output. The first round of a profile starts with a cold
+provider cache; the later rounds show what the cache saves.
+
+Usage (from the AI directory):
+    python -m benchmarks.run_profiles
+    python -m benchmarks.run_profiles --live --rounds 3
+    python -m benchmarks.run_profiles --model-id google/gemini-2.0-flash-001
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from agno.run.team import TeamRunOutput
+
+from agents.agent import build_farmers_team
+from agents.coordinator import ParallelCoordinator
+from agents.profiles import RUN_PROFILES, get_run_profile, prompt_caching_mode, uses_compact_instructions
+from agents.tools import mcp_clients
+from models.model import get_openrouter_model
+
+CHARS_PER_TOKEN = 4
+
+TEAM_CONTENT_EVENT = "TeamRunContent"
+
+QUESTIONS = [
+    "Today is 16 november 2025. How much money did we spend on oil in the last 7 days, ending yesterday?",
+    "Which employees have the role Tractor Driver, and how was the weather on 10 November 2025?",
+    "What were the yields for beans and wheat from July 14-21, 2025?",
+]
+
+
+def _static_tokens(agent) -> int:
+    texts = [agent.role, agent.instructions if isinstance(agent.instructions, str) else None, agent.expected_output]
+    return sum(len(text) for text in texts if text) // CHARS_PER_TOKEN
+
+
+def build_team(profile_name: str, model_id: str = None, coordinator: ParallelCoordinator = None):
+    models = [get_openrouter_model(id=model_id) if model_id else get_openrouter_model() for _ in range(5)]
+    return build_farmers_team(*models, profile=get_run_profile(profile_name), coordinator=coordinator)
+
+
+def static_report(model_id: str = None) -> None:
+    for name in RUN_PROFILES:
+        profile = get_run_profile(name)
+        team = build_team(name, model_id)
+        total = 0
+        print(f"\n{name} (debug_mode={team.debug_mode})")
+        for agent in [team] + list(team.members):
+            tokens = _static_tokens(agent)
+            total += tokens
+            instructions = "compact" if uses_compact_instructions(profile, agent.model) else "full"
+            print(f"  {agent.name:<52} {instructions:<8} caching={prompt_caching_mode(agent.model) or '-':<10} "
+                  f"{tokens:>6} static prompt tokens")
+        print(f"  {'total':<52} {'':<8} {'':<19} {total:>6}")
+
+
+def _run_tokens(output, coordinator: ParallelCoordinator) -> dict:
+    # Members delegated in parallel are not in member_responses, the coordinator keeps their runs
+    runs = [output] + list(output.member_responses or []) + [
+        result.run_output for result in coordinator.results_for(output.run_id) if result.run_output is not None
+    ]
+    totals = {"input_tokens": 0, "cache_read_tokens": 0, "output_tokens": 0}
+    for run in runs:
+        metrics = getattr(run, "metrics", None)
+        if metrics is None:
+            continue
+        for key in totals:
+            totals[key] += getattr(metrics, key, 0) or 0
+    return totals
+
+
+async def live_run(team, coordinator: ParallelCoordinator, question: str) -> dict:
+    start = time.perf_counter()
+    first_token = None
+    output = None
+    async for event in team.arun(question, stream=True, yield_run_output=True):
+        if getattr(event, "event", None) == TEAM_CONTENT_EVENT and event.content and first_token is None:
+            first_token = time.perf_counter() - start
+        elif isinstance(event, TeamRunOutput):
+            output = event
+    return {
+        "ttft_seconds": first_token,
+        "wall_seconds": time.perf_counter() - start,
+        **(_run_tokens(output, coordinator) if output is not None else {}),
+    }
+
+
+async def live_report(rounds: int, model_id: str = None) -> None:
+    await mcp_clients.ensure_connected()
+    try:
+        for name in RUN_PROFILES:
+            coordinator = ParallelCoordinator()
+            team = build_team(name, model_id, coordinator)
+            runs = []
+            for round_number in range(rounds):
+                for question in QUESTIONS:
+                    runs.append({"round": round_number, **await live_run(team, coordinator, question)})
+
+            for label, selected in (("cold", [r for r in runs if r["round"] == 0]),
+                                    ("warm", [r for r in runs if r["round"] > 0])):
+                if not selected:
+                    continue
+                ttft = [r["ttft_seconds"] for r in selected if r["ttft_seconds"] is not None]
+                print(f"{name:<12} {label}  ttft median {statistics.median(ttft) if ttft else float('nan'):6.2f}s  "
+                      f"wall median {statistics.median(r['wall_seconds'] for r in selected):6.2f}s  "
+                      f"input {sum(r.get('input_tokens', 0) for r in selected) / len(selected):8.0f}  "
+                      f"cached {sum(r.get('cache_read_tokens', 0) for r in selected) / len(selected):8.0f}  "
+                      f"output {sum(r.get('output_tokens', 0) for r in selected) / len(selected):6.0f} tokens per run")
+    finally:
+        await mcp_clients.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--live", action="store_true", help="run the questions against the real model")
+    parser.add_argument("--rounds", type=int, default=2, help="rounds of the question set per profile (--live)")
+    parser.add_argument("--model-id", help="model id for every agent (default: MODEL_ID)")
+    args = parser.parse_args()
+
+    static_report(args.model_id)
+    if args.live:
+        print()
+        asyncio.run(live_report(args.rounds, args.model_id))
+
+
+if __name__ == "__main__":
+    main()
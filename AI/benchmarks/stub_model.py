@@ -0,0 +1,141 @@
+"""
+Deterministic local stand-in for the LLMs of the farmers team.
+
+Every agent of the team gets a StubModel with its role ("team" for the team
+lead, "weather", "vehicles", "employees", "harvest" for the members). All of
+them share one StubScript holding the plan of the current question: which
+tool calls each role makes. On its first turn a stub answers with the
+scripted tool calls (the team lead delegates to the scripted members - all
+of them in one delegate_tasks_to_members_in_parallel call when the team has
+it - and calls its own tools); once tool results are in the context it
+answers with a short text. No network, no randomness: the only variable
+cost left in a team run is agno itself, the MCP transport and the tools.
+
+Token usage is reported as characters / 4 of the messages sent to the
+model, a stable proxy for the prompt size.
+"""
+import asyncio
+import json
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Iterator, Optional
+
+from agno.models.base import Model
+from agno.models.metrics import Metrics
+from agno.models.response import ModelResponse
+
+CHARS_PER_TOKEN = 4
+
+DELEGATE_TOOL = "delegate_task_to_member"
+
+PARALLEL_DELEGATE_TOOL = "delegate_tasks_to_members_in_parallel"
+
+
+@dataclass
+class StubScript:
+    # role -> [(tool name, arguments)]
+    calls: dict = field(default_factory=dict)
+    # role -> agno member id, filled in once the team is built
+    member_ids: dict = field(default_factory=dict)
+    question: str = ""
+    # Scripted tools the agent did not have (a broken plan or a renamed tool)
+    missing_tools: list = field(default_factory=list)
+
+    def load(self, question: str, calls: dict) -> None:
+        self.question = question
+        self.calls = calls
+        self.missing_tools = []
+
+    def plan_for(self, role: str, parallel: bool = False) -> list:
+        plan = list(self.calls.get(role, []))
+        if role == "team":
+            members = [self.member_ids[member] for member in self.calls if member != "team" and member in self.member_ids]
+            if parallel and len(members) > 1:
+                delegated = [(PARALLEL_DELEGATE_TOOL, {
+                    "tasks": [{"member_id": member_id, "task": self.question} for member_id in members]})]
+            else:
+                delegated = [(DELEGATE_TOOL, {"member_id": member_id, "task": self.question}) for member_id in members]
+            plan = delegated + plan
+        return plan
+
+
+def _message_text(message: Any) -> str:
+    content = getattr(message, "content", None)
+    if content is None:
+        return ""
+    return content if isinstance(content, str) else json.dumps(content, default=str)
+
+
+@dataclass
+class StubModel(Model):
+    id: str = "stub-model"
+    name: str = "StubModel"
+    provider: str = "Local"
+
+    role: str = "team"
+    script: Optional[StubScript] = None
+    # Simulated model latency per call
+    think_seconds: float = 0.0
+
+    def _respond(self, messages: list, tools: Optional[list]) -> ModelResponse:
+        available = {tool.get("function", {}).get("name") for tool in tools or [] if isinstance(tool, dict)}
+
+        # Tool results after the last user message: this is the answering turn
+        last_user = max((i for i, m in enumerate(messages) if m.role == "user"), default=-1)
+        results = [m for m in messages[last_user + 1:] if m.role == "tool"]
+
+        prompt_chars = sum(len(_message_text(m)) for m in messages)
+        response = ModelResponse(role="assistant")
+
+        if not results:
+            calls = []
+            plan = self.script.plan_for(self.role, parallel=PARALLEL_DELEGATE_TOOL in available) if self.script else []
+            for i, (tool, arguments) in enumerate(plan):
+                if tool not in available:
+                    self.script.missing_tools.append(f"{self.role}:{tool}")
+                    continue
+                calls.append({
+                    "id": f"call_{self.role}_{i}",
+                    "type": "function",
+                    "function": {"name": tool, "arguments": json.dumps(arguments)},
+                })
+            if calls:
+                response.tool_calls = calls
+
+        if not response.tool_calls:
+            result_chars = sum(len(_message_text(m)) for m in results)
+            response.content = (f"[{self.role}] answer based on {len(results)} tool result(s) "
+                                f"({result_chars} characters).")
+
+        output_chars = len(response.content or "") + len(json.dumps(response.tool_calls))
+        response.response_usage = Metrics(
+            input_tokens=prompt_chars // CHARS_PER_TOKEN,
+            output_tokens=output_chars // CHARS_PER_TOKEN,
+            total_tokens=(prompt_chars + output_chars) // CHARS_PER_TOKEN,
+        )
+        return response
+
+    def invoke(self, messages: list, assistant_message=None, response_format=None, tools=None,
+               tool_choice=None, run_response=None, **kwargs) -> ModelResponse:
+        return self._respond(messages, tools)
+
+    async def ainvoke(self, messages: list, assistant_message=None, response_format=None, tools=None,
+                      tool_choice=None, run_response=None, **kwargs) -> ModelResponse:
+        if self.think_seconds:
+            await asyncio.sleep(self.think_seconds)
+        return self._respond(messages, tools)
+
+    def invoke_stream(self, messages: list, assistant_message=None, response_format=None, tools=None,
+                      tool_choice=None, run_response=None, **kwargs) -> Iterator[ModelResponse]:
+        yield self._respond(messages, tools)
+
+    async def ainvoke_stream(self, messages: list, assistant_message=None, response_format=None, tools=None,
+                             tool_choice=None, run_response=None, **kwargs) -> AsyncIterator[ModelResponse]:
+        if self.think_seconds:
+            await asyncio.sleep(self.think_seconds)
+        yield self._respond(messages, tools)
+
+    def _parse_provider_response(self, response: Any, **kwargs) -> ModelResponse:
+        return response
+
+    def _parse_provider_response_delta(self, response: Any) -> ModelResponse:
+        return response
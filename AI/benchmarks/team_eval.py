@@ -0,0 +1,337 @@
+"""
+Evaluation and latency harness for the farmers team.
+
+Seeds a local MongoDB database with the deterministic fixture
+(benchmarks.fixtures), starts the MCP host on it, builds the team with
+StubModel everywhere (benchmarks.stub_model - no network, no LLM) and
+replays a suite of farm questions. Each question has a scripted plan (which
+agent calls which tool), so what is measured is the team machinery: agno,
+the MCP sessions and transport, the tools and MongoDB.
+
+Recorded per question and per agent: wall time, tool calls, tool latency,
+tool result sizes and the prompt size seen by the model. Multi-agent
+questions are delegated in parallel (agents.coordinator) unless --sequential
+is given; slowest_member_seconds next to wall_seconds shows how close a run
+gets to its slowest branch (--think-ms makes the model calls cost time).
+The JSON report can be compared against a previous one (--baseline);
+regressions beyond the tolerance make the process exit with status 1.
+
+Usage (from the AI directory, with a local MongoDB):
+    python -m benchmarks.team_eval --output team_eval.json
+    python -m benchmarks.team_eval --baseline team_eval.json --tolerance 0.25
+    python -m benchmarks.team_eval --cases compound_delegation --think-ms 300 [--sequential]
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from benchmarks.fixtures import seed_farm_database
+from benchmarks.mcp_startup import AI_DIR, start_host, wait_ready
+from benchmarks.stub_model import DELEGATE_TOOL, PARALLEL_DELEGATE_TOOL, StubModel, StubScript
+
+ROLES = ("weather", "vehicles", "employees", "harvest")
+
+# Reference date of the questions (inside the fixture, same as AI/main.py)
+TODAY = {"day": 16, "month": 11, "year": 2025}
+
+SUITE = [
+    {
+        "id": "oil_price_day",
+        "question": "What was the oil price on 12 November 2025?",
+        "calls": {"vehicles": [("get_oil_price_for_a_specific_day", {"day": 12, "month": 11, "year": 2025})]},
+    },
+    {
+        "id": "fuel_cost_last_7_days",
+        "question": "Today is 16 november 2025. How much money did we spend on oil in the last 7 days, ending yesterday?",
+        "calls": {"vehicles": [("get_total_oil_price_for_a_period_of_time", {
+            "start_day": 9, "start_month": 11, "start_year": 2025, "end_day": 15, "end_month": 11, "end_year": 2025})]},
+    },
+    {
+        "id": "weather_next_week",
+        "question": "Today is 16 november 2025. How will the weather be next week?",
+        "calls": {"weather": [("get_weather_info_for_the_next_n_days", {
+            "days": 7, "today_day": 16, "today_month": 11, "today_year": 2025})]},
+    },
+    {
+        "id": "weather_last_90_days",
+        "question": "Today is 16 november 2025. Summarize the weather of the last 90 days.",
+        "calls": {"weather": [("get_weather_info_for_last_n_days", {
+            "number_of_days": 90, "today_day": 16, "today_month": 11, "today_year": 2025})]},
+    },
+    {
+        "id": "employees_by_role",
+        "question": "Which employees have the role Tractor Driver?",
+        "calls": {"employees": [("get_employee_with_a_specific_role", {"role": "Tractor Driver"})]},
+    },
+    {
+        "id": "employee_tasks_90_days",
+        "question": "Today is 16 november 2025. Who worked the most hours in the last 90 days, and on which equipment?",
+        "calls": {"employees": [("get_stats_about_employees_tasks_from_last_n_days", {
+            "n": 90, "start_day": 16, "start_month": 11, "start_year": 2025})]},
+    },
+    {
+        "id": "crop_yields_july",
+        "question": "What were the yields for beans, tomatoes, wheat and sunflower from July 14-21, 2025?",
+        "calls": {"harvest": [("get_crops_yield_for_a_specific_period", {
+            "crops": ["beans", "tomatoes", "wheat", "sunflower"], "start_day": 14, "start_month": 7, "start_year": 2025,
+            "end_day": 21, "end_month": 7, "end_year": 2025})]},
+    },
+    {
+        "id": "weather_harvest_correlation",
+        "question": "How did the temperature affect the yields between 1 July 2025 and 30 September 2025?",
+        "calls": {"harvest": [("get_weather_harvest_correlation", {
+            "start_day": 1, "start_month": 7, "start_year": 2025, "end_day": 30, "end_month": 9, "end_year": 2025})]},
+    },
+    {
+        "id": "compound_briefing_tool",
+        "question": ("Today is 16 november 2025. Tell me how the weather will be this next week, who must be paid "
+                     "this next week and how much we spent on oil in the last 7 days."),
+        "calls": {"team": [("get_farm_briefing", {
+            **TODAY, "sections": ["weather_next_days", "payroll", "fuel_cost"]})]},
+    },
+    {
+        "id": "compound_delegation",
+        "question": ("Today is 16 november 2025. Tell me how the weather will be this next week, who must be paid "
+                     "this next week, how much we spent on oil in the last 7 days and the wheat yield from July 14-21, 2025."),
+        "calls": {
+            "weather": [("get_weather_info_for_the_next_n_days", {
+                "days": 7, "today_day": 16, "today_month": 11, "today_year": 2025})],
+            "employees": [("get_employees_paid_in_n_days_from_date", {
+                "n_days": 7, "start_day": 16, "start_month": 11, "start_year": 2025})],
+            "vehicles": [("get_total_oil_price_for_a_period_of_time", {
+                "start_day": 9, "start_month": 11, "start_year": 2025, "end_day": 15, "end_month": 11, "end_year": 2025})],
+            "harvest": [("get_wheat_yield_for_a_specific_period", {
+                "start_day": 14, "start_month": 7, "start_year": 2025, "end_day": 21, "end_month": 7, "end_year": 2025})],
+        },
+    },
+]
+
+# Metrics compared against the baseline (lower is better)
+TRACKED_METRICS = ("wall_seconds", "tool_calls", "tool_result_bytes", "prompt_tokens")
+
+
+def _tool_record(tool) -> dict:
+    metrics = getattr(tool, "metrics", None)
+    return {
+        "tool": tool.tool_name,
+        "seconds": round(metrics.duration, 4) if metrics is not None and metrics.duration is not None else None,
+        "result_bytes": len((tool.result or "").encode("utf-8")),
+        "error": bool(tool.tool_call_error),
+    }
+
+
+def _agent_record(name: str, run) -> dict:
+    tools = [_tool_record(tool) for tool in (run.tools or [])]
+    metrics = run.metrics
+    return {
+        "agent": name,
+        "seconds": round(metrics.duration, 4) if metrics is not None and metrics.duration is not None else None,
+        "prompt_tokens": metrics.input_tokens if metrics is not None else 0,
+        "tool_calls": len(tools),
+        "tool_seconds": round(sum(tool["seconds"] or 0 for tool in tools), 4),
+        "tool_result_bytes": sum(tool["result_bytes"] for tool in tools),
+        "tools": tools,
+    }
+
+
+async def run_case(team, script: StubScript, case: dict, mcp_clients, coordinator) -> dict:
+    script.load(case["question"], case["calls"])
+    await mcp_clients.ensure_connected()
+
+    start = time.perf_counter()
+    response = await team.arun(case["question"])
+    wall_seconds = time.perf_counter() - start
+
+    # Members delegated in parallel run outside agno's delegation, their runs are kept by the coordinator
+    member_runs = list(response.member_responses) + [
+        result.run_output for result in coordinator.results_for(response.run_id) if result.run_output is not None
+    ]
+    agents = [_agent_record("team", response)] + [
+        _agent_record(member.agent_name or member.agent_id or "member", member) for member in member_runs
+    ]
+    member_seconds = [agent["seconds"] or 0 for agent in agents[1:]]
+
+    # Delegations are team tools too, but not data calls
+    data_tools = [tool for agent in agents for tool in agent["tools"]
+                  if tool["tool"] not in (DELEGATE_TOOL, PARALLEL_DELEGATE_TOOL)]
+    return {
+        "id": case["id"],
+        "question": case["question"],
+        "status": getattr(response.status, "value", str(response.status)),
+        "wall_seconds": round(wall_seconds, 4),
+        "slowest_member_seconds": round(max(member_seconds, default=0.0), 4),
+        "member_seconds": round(sum(member_seconds), 4),
+        "tool_calls": len(data_tools),
+        "tool_seconds": round(sum(tool["seconds"] or 0 for tool in data_tools), 4),
+        "tool_result_bytes": sum(tool["result_bytes"] for tool in data_tools),
+        "prompt_tokens": sum(agent["prompt_tokens"] for agent in agents),
+        "tool_errors": sum(1 for tool in data_tools if tool["error"]),
+        "missing_tools": list(script.missing_tools),
+        "agents": agents,
+    }
+
+
+def per_agent_totals(cases: list) -> dict:
+    totals = defaultdict(lambda: {"runs": 0, "seconds": 0.0, "tool_calls": 0, "tool_seconds": 0.0,
+                                  "tool_result_bytes": 0, "max_tool_result_bytes": 0, "prompt_tokens": 0})
+    for case in cases:
+        for agent in case["agents"]:
+            entry = totals[agent["agent"]]
+            entry["runs"] += 1
+            entry["seconds"] = round(entry["seconds"] + (agent["seconds"] or 0), 4)
+            entry["tool_calls"] += agent["tool_calls"]
+            entry["tool_seconds"] = round(entry["tool_seconds"] + agent["tool_seconds"], 4)
+            entry["tool_result_bytes"] += agent["tool_result_bytes"]
+            entry["max_tool_result_bytes"] = max([entry["max_tool_result_bytes"]] +
+                                                 [tool["result_bytes"] for tool in agent["tools"]])
+            entry["prompt_tokens"] += agent["prompt_tokens"]
+    return dict(totals)
+
+
+def summarize(rounds: list) -> list:
+    """One entry per question: the median over the rounds of every tracked metric, the last round's details"""
+    cases = []
+    for per_round in zip(*rounds):
+        case = dict(per_round[-1])
+        for metric in TRACKED_METRICS + ("tool_seconds", "slowest_member_seconds", "member_seconds"):
+            case[metric] = round(statistics.median(run[metric] for run in per_round), 4)
+        case["wall_seconds_all_rounds"] = [run["wall_seconds"] for run in per_round]
+        cases.append(case)
+    return cases
+
+
+def compare(report: dict, baseline: dict, tolerance: float) -> list:
+    """Tracked metrics that grew by more than the tolerance (timings also need to grow by 10ms)"""
+    previous = {case["id"]: case for case in baseline.get("cases", [])}
+    regressions = []
+    for case in report["cases"]:
+        old = previous.get(case["id"])
+        if old is None:
+            continue
+        for metric in TRACKED_METRICS:
+            before, after = old.get(metric), case.get(metric)
+            if before is None or after is None:
+                continue
+            if after > before * (1 + tolerance) and (metric != "wall_seconds" or after - before > 0.01):
+                regressions.append({"id": case["id"], "metric": metric, "baseline": before, "current": after})
+    return regressions
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=AI_DIR, capture_output=True,
+                              text=True, timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mongo-url", default=os.getenv("BENCHMARK_MONGO_URL", "mongodb://127.0.0.1:27017"))
+    parser.add_argument("--database", default="farm_benchmark")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--port", type=int, default=8120)
+    parser.add_argument("--rounds", type=int, default=3, help="runs per question (medians are reported)")
+    parser.add_argument("--think-ms", type=float, default=0.0, help="simulated latency of every model call")
+    parser.add_argument("--profile", default="production", help="run profile of the team (agents.profiles)")
+    parser.add_argument("--sequential", action="store_true", help="no parallel delegation (one member at a time)")
+    parser.add_argument("--member-timeout", type=float, help="per-member time limit of the parallel delegation")
+    parser.add_argument("--cases", nargs="*", help="ids of the questions to run (default: all)")
+    parser.add_argument("--output", default="team_eval.json")
+    parser.add_argument("--baseline", help="previous report to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args()
+
+    suite = [case for case in SUITE if not args.cases or case["id"] in args.cases]
+
+    mongo = AsyncIOMotorClient(args.mongo_url, serverSelectionTimeoutMS=5000)
+    counts = await seed_farm_database(mongo[args.database], seed=args.seed)
+    mongo.close()
+    print(f"Seeded {args.database}: {counts}")
+
+    host = start_host([], args.port, env={"MONGO_API_KEY": args.mongo_url, "MONGO_DATABASE_NAME": args.database})
+    try:
+        wait_ready(args.port, timeout=60)
+
+        # The MCP clients read their URL at import time
+        os.environ["MCP_BASE_URL"] = f"http://127.0.0.1:{args.port}"
+        from agno.utils.team import get_member_id
+        from agents.agent import build_farmers_team
+        from agents.coordinator import MEMBER_TIMEOUT_SECONDS, ParallelCoordinator
+        from agents.profiles import get_run_profile
+        from agents.tools import mcp_clients
+
+        script = StubScript()
+        models = {role: StubModel(role=role, script=script, think_seconds=args.think_ms / 1000)
+                  for role in ROLES + ("team",)}
+        coordinator = ParallelCoordinator(member_timeout_seconds=args.member_timeout or MEMBER_TIMEOUT_SECONDS)
+        team = build_farmers_team(models["weather"], models["vehicles"], models["employees"], models["harvest"],
+                                  models["team"], parallel_members=not args.sequential, coordinator=coordinator,
+                                  profile=get_run_profile(args.profile))
+        for member, role in zip(team.members, ROLES):
+            script.member_ids[role] = get_member_id(member)
+
+        rounds = []
+        try:
+            for _ in range(args.rounds):
+                rounds.append([await run_case(team, script, case, mcp_clients, coordinator) for case in suite])
+        finally:
+            await mcp_clients.close()
+    finally:
+        host.terminate()
+        host.wait()
+
+    cases = summarize(rounds)
+    report = {
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "git_commit": _git_commit(),
+        "settings": {
+            "seed": args.seed, "rounds": args.rounds, "think_ms": args.think_ms,
+            "profile": args.profile, "parallel_members": not args.sequential,
+            "member_timeout": coordinator.member_timeout_seconds,
+            "max_parallel_members": coordinator.max_parallel, "max_concurrent_tool_calls": mcp_clients.max_concurrent_calls,
+            "python": platform.python_version(), "platform": platform.platform(),
+        },
+        "cases": cases,
+        "per_agent": per_agent_totals(cases),
+        "totals": {metric: round(sum(case[metric] for case in cases), 4) for metric in TRACKED_METRICS + ("tool_seconds",)},
+    }
+
+    for case in cases:
+        problems = ", ".join(filter(None, [
+            f"{case['tool_errors']} tool error(s)" if case["tool_errors"] else "",
+            f"missing {case['missing_tools']}" if case["missing_tools"] else "",
+        ]))
+        print(f"{case['id']:<28} {case['wall_seconds']:>7.3f}s (slowest member {case['slowest_member_seconds']:.3f}s)  "
+              f"{case['tool_calls']:>2} tool call(s) "
+              f"{case['tool_seconds']:>7.3f}s  {case['tool_result_bytes']:>8} B  {case['prompt_tokens']:>7} prompt tokens  "
+              f"{problems}")
+
+    exit_code = 0
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        report["regressions"] = regressions
+        for regression in regressions:
+            print(f"REGRESSION {regression['id']} {regression['metric']}: "
+                  f"{regression['baseline']} -> {regression['current']}")
+        exit_code = 1 if regressions else 0
+
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nReport written to {args.output}")
+    sys.exit(exit_code)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -220,6 +220,11 @@ def example_batch_processing():
     success_count = sum(1 for r in results if r['success'])
     print(f"\n✅ Successfully processed: {success_count}/{len(documents)}")
     
+    stats = processor.last_batch_stats
+    if stats:
+        print(f"⏱️  {stats.pages} pages in {stats.seconds:.1f}s on {stats.workers} workers "
+              f"({stats.pages_per_second:.2f} pages/s)")
+    
     for i, result in enumerate(results, 1):
         if result['success']:
             print(f"  {i}. ✅ {result['file_path']}")
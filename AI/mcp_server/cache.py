@@ -0,0 +1,190 @@
+"""
+Range-query result cache shared by the MCP harvest and weather tools.
+
+Tools ask for the per-day rows of a date range instead of querying MongoDB
+directly. Entries are keyed on a normalized (namespace, params, range):
+a request for a sub-range is served by slicing any cached superset, entries
+are evicted LRU + TTL, and every entry remembers the data-version stamp of
+its collection (the `data_versions` collection, bumped by the Backend
+harvest feed and the import scripts) so writes invalidate it.
+"""
+import asyncio
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Optional, Union
+
+from mcp_server.db import get_database
+
+RowsLoader = Callable[[Any, Any], Awaitable[list[dict]]]
+
+
+@dataclass
+class CacheEntry:
+    rows: list[dict]
+    version: Any
+    expires_at: float
+
+
+@dataclass
+class ToolStats:
+    hits: int = 0
+    superset_hits: int = 0
+    misses: int = 0
+
+    def as_dict(self) -> dict:
+        total = self.hits + self.superset_hits + self.misses
+        return {
+            "hits": self.hits,
+            "superset_hits": self.superset_hits,
+            "misses": self.misses,
+            "hit_ratio": round((self.hits + self.superset_hits) / total, 4) if total else 0.0,
+        }
+
+
+def normalize_params(params: Optional[dict]) -> tuple:
+    """Turn tool params into a hashable, order-independent key"""
+    if not params:
+        return ()
+
+    def _freeze(value):
+        if isinstance(value, dict):
+            return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+        if isinstance(value, (list, tuple, set)):
+            return tuple(sorted(_freeze(v) for v in value))
+        return value
+
+    return _freeze(params)
+
+
+class RangeQueryCache:
+    def __init__(self,
+                 max_entries: int = 256,
+                 ttl_seconds: float = 300.0,
+                 version_check_interval: float = 1.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.version_check_interval = version_check_interval
+
+        # (namespace, params, start, end) -> CacheEntry, in LRU order
+        self._entries: "OrderedDict[tuple, CacheEntry]" = OrderedDict()
+        self._in_flight: dict[tuple, asyncio.Future] = {}
+        self._versions: dict[str, tuple[float, int]] = {}
+        self._stats: dict[str, ToolStats] = {}
+
+    async def get_rows(self,
+                       tool: str,
+                       namespace: str,
+                       collection: Union[str, tuple],
+                       start: Any,
+                       end: Any,
+                       loader: RowsLoader,
+                       params: Optional[dict] = None,
+                       date_key: str = "date",
+                       allow_superset: bool = True) -> list[dict]:
+        """
+        Return the rows with start <= row[date_key] < end.
+
+        `loader(start, end)` is only awaited on a miss. The returned rows are
+        shared with other callers and must not be mutated. Rows built from
+        several collections (joins) pass a tuple of collection names; a write
+        to any of them invalidates the entry.
+        """
+        stats = self._stats.setdefault(tool, ToolStats())
+        params_key = normalize_params(params)
+        if isinstance(collection, tuple):
+            version = tuple([await self._current_version(name) for name in collection])
+        else:
+            version = await self._current_version(collection)
+        now = time.monotonic()
+
+        exact_key = (namespace, params_key, start, end)
+        entry = self._valid_entry(exact_key, version, now)
+        if entry is not None:
+            stats.hits += 1
+            return entry.rows
+
+        if allow_superset:
+            for key in list(reversed(self._entries)):
+                entry_namespace, entry_params, entry_start, entry_end = key
+                if entry_namespace != namespace or entry_params != params_key:
+                    continue
+                if entry_start <= start and end <= entry_end:
+                    entry = self._valid_entry(key, version, now)
+                    if entry is not None:
+                        stats.superset_hits += 1
+                        return [row for row in entry.rows if start <= row.get(date_key) < end]
+
+        stats.misses += 1
+
+        # Concurrent misses for the same range share one query
+        pending = self._in_flight.get(exact_key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[exact_key] = future
+        try:
+            rows = await loader(start, end)
+            self._store(exact_key, rows, version)
+            future.set_result(rows)
+            return rows
+        except BaseException as e:
+            future.set_exception(e)
+            # Nobody else may be awaiting the future; avoid "exception never retrieved"
+            future.exception()
+            raise
+        finally:
+            self._in_flight.pop(exact_key, None)
+
+    def invalidate(self, namespace: Optional[str] = None):
+        """Drop every entry (or every entry of one namespace)"""
+        if namespace is None:
+            self._entries.clear()
+            return
+        for key in [k for k in self._entries if k[0] == namespace]:
+            del self._entries[key]
+
+    def stats(self) -> dict:
+        """Hit ratios per tool plus global size information"""
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "tools": {tool: s.as_dict() for tool, s in sorted(self._stats.items())},
+        }
+
+    def _valid_entry(self, key: tuple, version: Any, now: float) -> Optional[CacheEntry]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at < now or entry.version != version:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _store(self, key: tuple, rows: list[dict], version: Any):
+        self._entries[key] = CacheEntry(rows=rows, version=version, expires_at=time.monotonic() + self.ttl_seconds)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def _current_version(self, collection: str) -> int:
+        """Data-version stamp of a collection, re-read at most once per version_check_interval"""
+        now = time.monotonic()
+        checked = self._versions.get(collection)
+        if checked is not None and now - checked[0] < self.version_check_interval:
+            return checked[1]
+
+        doc = await get_database()["data_versions"].find_one({"_id": collection}, {"version": 1})
+        version = int(doc.get("version", 0)) if doc else 0
+        self._versions[collection] = (now, version)
+        return version
+
+
+range_cache = RangeQueryCache(
+    max_entries=int(os.getenv("MCP_CACHE_MAX_ENTRIES", "256")),
+    ttl_seconds=float(os.getenv("MCP_CACHE_TTL_SECONDS", "300")),
+)
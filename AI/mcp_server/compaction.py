@@ -0,0 +1,257 @@
+"""
+Token-budget compaction of tool results before they reach the agents.
+
+Every result goes through compact(result, tool, page):
+    - lists of records are encoded as tables ({"columns": [...], "rows": [[...]]}),
+      so the keys are written once instead of once per row;
+    - a result that still exceeds the tool's token budget is answered summary
+      first: the tool summary (totals per employee, temperature extremes, ...)
+      plus the first page of every detail table, sized to fit the budget;
+    - page=1, 2, ... drills down into the detail rows, with the same page size.
+
+Budgets are estimated as characters / CHARS_PER_TOKEN of the compact JSON and
+can be tuned per tool with MCP_TOKEN_BUDGETS="tool=4000,other_tool=1500".
+"""
+import json
+import math
+import os
+import re
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+CHARS_PER_TOKEN = 4
+
+COMPACTION_ENABLED = os.getenv("MCP_COMPACTION_ENABLED", "true").lower() in ("1", "true", "yes")
+
+DEFAULT_TOKEN_BUDGET = int(os.getenv("MCP_DEFAULT_TOKEN_BUDGET", "2000"))
+
+TOOL_TOKEN_BUDGETS = {
+    "get_stats_about_employees_tasks_from_last_n_days": 3000,
+    "get_crops_yield_for_a_specific_period": 2500,
+    "get_weather_harvest_correlation": 3000,
+    "get_farm_briefing": 4000,
+}
+
+# Lists shorter than this stay records - a table saves nothing on two rows
+MIN_TABLE_ROWS = 3
+
+# Smallest page handed out, even when the summary alone uses the whole budget
+MIN_PAGE_SIZE = 1
+
+_DATE_KEY = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+
+
+def _budget_overrides() -> dict:
+    overrides = {}
+    for item in os.getenv("MCP_TOKEN_BUDGETS", "").split(","):
+        name, _, value = item.partition("=")
+        if name.strip() and value.strip().isdigit():
+            overrides[name.strip()] = int(value)
+    return overrides
+
+
+TOOL_TOKEN_BUDGETS.update(_budget_overrides())
+
+
+def token_budget(tool: str) -> int:
+    return TOOL_TOKEN_BUDGETS.get(tool, DEFAULT_TOKEN_BUDGET)
+
+
+def estimate_tokens(value: Any) -> int:
+    text = json.dumps(value, ensure_ascii=False, separators=(",", ":"), default=str)
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def is_table(value: Any) -> bool:
+    return isinstance(value, dict) and set(value) == {"columns", "rows"}
+
+
+def to_table(records: list) -> dict:
+    """Records -> {"columns", "rows"}; nested record lists become tables too"""
+    columns = list(dict.fromkeys(key for record in records for key in record))
+    return {
+        "columns": columns,
+        "rows": [[encode_tables(record.get(column)) for column in columns] for record in records],
+    }
+
+
+def table_rows(table: dict) -> list:
+    """Inverse of to_table (top level only)"""
+    return [dict(zip(table["columns"], row)) for row in table["rows"]]
+
+
+def encode_tables(value: Any) -> Any:
+    if isinstance(value, list):
+        if len(value) >= MIN_TABLE_ROWS and all(isinstance(item, dict) for item in value):
+            return to_table(value)
+        return [encode_tables(item) for item in value]
+    if isinstance(value, dict) and not is_table(value):
+        return {key: encode_tables(item) for key, item in value.items()}
+    return value
+
+
+def _is_date_map(value: Any) -> bool:
+    """The weather tools key their rows by "YYYY-MM-DD" instead of returning a list"""
+    return (
+        isinstance(value, dict) and len(value) >= MIN_TABLE_ROWS
+        and all(_DATE_KEY.match(str(key)) and isinstance(item, dict) for key, item in value.items())
+    )
+
+
+def _find_tables(value: Any, path: tuple = ()) -> list:
+    """(path, table) of every table outside other tables"""
+    if is_table(value):
+        return [(path, value)]
+    if isinstance(value, dict):
+        return [found for key, item in value.items() for found in _find_tables(item, path + (key,))]
+    return []
+
+
+# ---------------------------------------------------------------- summaries
+
+def _employee_tasks_summary(result: dict) -> dict:
+    totals = {}
+    daily = []
+    for day in result.get("daily_stats", []):
+        day_hours = 0.0
+        for employee in day.get("employees", []):
+            entry = totals.setdefault(employee.get("id"), {
+                "id": employee.get("id"),
+                "name": f"{employee.get('first_name') or ''} {employee.get('last_name') or ''}".strip(),
+                "role": employee.get("role"),
+                "days_worked": 0,
+                "total_work_hours": 0.0,
+                "hours_by_equipment": defaultdict(float),
+            })
+            hours = float(employee.get("total_work_hours_for_day") or 0)
+            entry["days_worked"] += 1
+            entry["total_work_hours"] += hours
+            for task in employee.get("tasks", []):
+                entry["hours_by_equipment"][task.get("equipment_type")] += float(task.get("work_hours") or 0)
+            day_hours += hours
+        daily.append({"date": day.get("date"), "employees_worked": day.get("total_employees_worked"),
+                      "work_hours": round(day_hours, 2)})
+
+    employees = sorted(totals.values(), key=lambda e: e["total_work_hours"], reverse=True)
+    for entry in employees:
+        entry["total_work_hours"] = round(entry["total_work_hours"], 2)
+        entry["hours_by_equipment"] = {k: round(v, 2) for k, v in entry["hours_by_equipment"].items()}
+
+    return {"employee_totals": to_table(employees) if employees else [], "daily_totals": to_table(daily) if daily else []}
+
+
+def _weather_summary(days: list) -> dict:
+    highs = [d["max_temp_celsius"] for d in days if d.get("max_temp_celsius") is not None]
+    lows = [d["min_temp_celsius"] for d in days if d.get("min_temp_celsius") is not None]
+    descriptions = defaultdict(int)
+    for d in days:
+        descriptions[d.get("weather_description") or "unknown"] += 1
+
+    return {
+        "days": len(days),
+        "max_temp_celsius": max(highs, default=None),
+        "min_temp_celsius": min(lows, default=None),
+        "mean_max_temp_celsius": round(sum(highs) / len(highs), 1) if highs else None,
+        "mean_min_temp_celsius": round(sum(lows) / len(lows), 1) if lows else None,
+        "days_by_description": dict(sorted(descriptions.items(), key=lambda item: -item[1])),
+    }
+
+
+SUMMARIZERS: dict[str, Callable[[dict], dict]] = {
+    "get_stats_about_employees_tasks_from_last_n_days": _employee_tasks_summary,
+    "get_weather_info_for_last_n_days": lambda result: _weather_summary(result["days"]),
+    "get_weather_info_for_the_next_n_days": lambda result: _weather_summary(result["days"]),
+}
+
+
+# ---------------------------------------------------------------- compaction
+
+@dataclass
+class CompactionStats:
+    calls: int = 0
+    compacted: int = 0
+    tokens_in: int = 0
+    tokens_out: int = 0
+
+    def as_dict(self) -> dict:
+        return {
+            **self.__dict__,
+            "saved_ratio": round(1 - self.tokens_out / self.tokens_in, 4) if self.tokens_in else 0.0,
+        }
+
+
+_stats: dict[str, CompactionStats] = defaultdict(CompactionStats)
+
+
+def compaction_stats() -> dict:
+    return {tool: stats.as_dict() for tool, stats in sorted(_stats.items())}
+
+
+def compact(result: Any, tool: str, page: Optional[int] = 0) -> Any:
+    """
+    Fit a tool result into the tool's token budget. page=0 returns the whole
+    (table-encoded) result when it fits, summary first otherwise; page >= 1
+    returns that page of the detail rows; page=None returns the result as is.
+    """
+    if page is None or not COMPACTION_ENABLED or not isinstance(result, dict) or "error" in result:
+        return result
+
+    stats = _stats[tool]
+    stats.calls += 1
+    tokens_in = estimate_tokens(result)
+    stats.tokens_in += tokens_in
+
+    budget = token_budget(tool)
+    if _is_date_map(result):
+        if not page and tokens_in <= budget:
+            stats.tokens_out += tokens_in
+            return result
+        result = {"days": [{"date": key, **item} for key, item in result.items()]}
+
+    encoded = encode_tables(result)
+    if not page and estimate_tokens(encoded) <= budget:
+        stats.tokens_out += estimate_tokens(encoded)
+        return encoded
+
+    # Detail tables of the result itself; the summary is never paged
+    tables = _find_tables(encoded)
+    compacted = encoded
+    summarize = SUMMARIZERS.get(tool)
+    if summarize is not None:
+        compacted["summary"] = summarize(result)
+
+    if tables:
+        _paginate(compacted, tables, budget, page or 1)
+
+    stats.compacted += 1
+    stats.tokens_out += estimate_tokens(compacted)
+    return compacted
+
+
+def _paginate(compacted: dict, tables: list, budget: int, page: int) -> None:
+    """Slice every detail table (in place) to the same page; the page size fits the first page in the budget"""
+    all_rows = [table["rows"] for _, table in tables]
+    row_tokens = sum(estimate_tokens(rows) / max(len(rows), 1) for rows in all_rows)
+
+    # Cost of the result without any detail row
+    for _, table in tables:
+        table["rows"] = []
+    available = budget - estimate_tokens(compacted) - 60
+    page_size = max(MIN_PAGE_SIZE, math.floor(available / row_tokens)) if row_tokens > 0 else MIN_PAGE_SIZE
+
+    total_rows = {".".join(map(str, path)): len(rows) for (path, _), rows in zip(tables, all_rows)}
+    pages = max(1, math.ceil(max(total_rows.values()) / page_size))
+
+    for (_, table), rows in zip(tables, all_rows):
+        table["rows"] = rows[(page - 1) * page_size:page * page_size]
+
+    compacted["pagination"] = {
+        "page": page,
+        "pages": pages,
+        "page_size": page_size,
+        "total_rows": total_rows,
+        "next_page": page + 1 if page < pages else None,
+    }
+    if page < pages:
+        compacted["pagination"]["hint"] = "call the tool again with the same arguments and page=<n> for more detail rows"
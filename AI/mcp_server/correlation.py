@@ -0,0 +1,226 @@
+"""
+Weather - harvest correlation analytics.
+
+Works on per-day rows produced by `weather_harvest_pipeline` (the weather_logs
+of one location joined with harvest_logs on the native date): every metric
+becomes a NumPy array on a continuous daily axis (missing days are NaN), so
+lagged correlations, rolling means and regressions are a few vectorized
+operations.
+
+The AI and the Backend ship separately. This file is the source; the Backend
+copy (Backend/app/services/correlation.py) is generated from it by
+Backend/scripts/sync_correlation.py and must not be edited by hand.
+"""
+from datetime import date, datetime
+from typing import Optional
+
+import numpy as np
+
+CROPS = ("wheat", "tomatoes", "sunflower", "beans")
+
+# Weather metrics correlated against yield and fuel
+TEMPERATURE_METRICS = ("mean_temp_celsius", "max_temp_celsius", "min_temp_celsius")
+
+# Correlations from fewer paired days than this are not meaningful
+MIN_PAIRED_DAYS = 3
+
+
+def weather_harvest_pipeline(start: datetime, end: datetime, location: Optional[str] = None) -> list:
+    """
+    Aggregation on weather_logs: one row per weather day with its temperatures
+    and, through a $lookup on the native date, that day's crop kg/hectares and
+    total fuel from harvest_logs. Weather drives the join because it has a row
+    for every day, which the lagged correlations need.
+
+    harvest_logs have no location, so the weather of a single location is
+    joined: `location`, or else the location with the most weather days in
+    the period (ties by name).
+    """
+    match = {"date": {"$gte": start, "$lt": end}}
+    if location:
+        match = {"location": location, **match}
+
+    harvest_fields = [f"{crop}_harvested_kg" for crop in CROPS] + [f"{crop}_harvested_hectares" for crop in CROPS]
+
+    single_location = []
+    if not location:
+        # Several locations on the same day would each be matched to that day's harvest
+        single_location = [
+            {"$group": {"_id": "$location", "days": {"$push": "$$ROOT"}, "count": {"$sum": 1}}},
+            {"$sort": {"count": -1, "_id": 1}},
+            {"$limit": 1},
+            {"$unwind": "$days"},
+            {"$replaceWith": "$days"},
+        ]
+
+    return [
+        {"$match": match},
+        *single_location,
+        {"$sort": {"date": 1}},
+        {"$lookup": {
+            "from": "harvest_logs",
+            "localField": "date",
+            "foreignField": "date",
+            "pipeline": [
+                {"$project": {
+                    "_id": 0,
+                    "fuel_consumed_liters": {"$sum": "$equipment.fuel_consumed_liters"},
+                    **{field: 1 for field in harvest_fields},
+                }},
+            ],
+            "as": "harvest",
+        }},
+        {"$set": {"harvest": {"$first": "$harvest"}}},
+        {"$project": {
+            "_id": 0,
+            "date": 1,
+            "location": 1,
+            "max_temp_celsius": 1,
+            "min_temp_celsius": 1,
+            "fuel_consumed_liters": "$harvest.fuel_consumed_liters",
+            **{field: f"$harvest.{field}" for field in harvest_fields},
+        }},
+    ]
+
+
+def _daily_series(rows: list) -> tuple:
+    """Place row values on a continuous daily axis; returns (days, {metric: array})"""
+    first = rows[0]["date"]
+    offsets = np.array([(row["date"] - first).days for row in rows])
+    n_days = int(offsets[-1]) + 1
+
+    def column(key: str) -> np.ndarray:
+        values = np.full(n_days, np.nan)
+        values[offsets] = [np.nan if row.get(key) is None else float(row[key]) for row in rows]
+        return values
+
+    series = {
+        "max_temp_celsius": column("max_temp_celsius"),
+        "min_temp_celsius": column("min_temp_celsius"),
+        "fuel_consumed_liters": column("fuel_consumed_liters"),
+    }
+    series["mean_temp_celsius"] = (series["max_temp_celsius"] + series["min_temp_celsius"]) / 2
+
+    for crop in CROPS:
+        kg = column(f"{crop}_harvested_kg")
+        hectares = column(f"{crop}_harvested_hectares")
+        with np.errstate(divide="ignore", invalid="ignore"):
+            series[f"{crop}_kg_per_hectare"] = np.where(hectares > 0, kg / hectares, np.nan)
+
+    days = np.datetime64(first.date(), "D") + np.arange(n_days)
+    return days, series
+
+
+def _round(value, digits: int = 4):
+    return None if value is None or not np.isfinite(value) else round(float(value), digits)
+
+
+def lagged_correlation(weather: np.ndarray, target: np.ndarray, lag: int) -> Optional[float]:
+    """Pearson r between weather on day t - lag and the target on day t"""
+    if lag >= len(target):
+        return None
+
+    x = weather[:len(weather) - lag]
+    y = target[lag:]
+    mask = np.isfinite(x) & np.isfinite(y)
+    if mask.sum() < MIN_PAIRED_DAYS:
+        return None
+
+    x, y = x[mask], y[mask]
+    if x.std() == 0 or y.std() == 0:
+        return None
+    return _round(np.corrcoef(x, y)[0, 1])
+
+
+def rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """NaN-aware trailing mean; needs at least half of the window to be present"""
+    present = np.isfinite(values)
+    sums = np.cumsum(np.where(present, values, 0.0))
+    counts = np.cumsum(present)
+
+    sums[window:] = sums[window:] - sums[:-window]
+    counts[window:] = counts[window:] - counts[:-window]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        means = sums / counts
+    means[counts < max(1, (window + 1) // 2)] = np.nan
+    return means
+
+
+def linear_regression(weather: np.ndarray, target: np.ndarray) -> Optional[dict]:
+    """Least-squares fit target = slope * weather + intercept on the paired days"""
+    mask = np.isfinite(weather) & np.isfinite(target)
+    if mask.sum() < MIN_PAIRED_DAYS or weather[mask].std() == 0:
+        return None
+
+    slope, intercept = np.polyfit(weather[mask], target[mask], 1)
+    predicted = slope * weather[mask] + intercept
+    residual = np.sum((target[mask] - predicted) ** 2)
+    total = np.sum((target[mask] - target[mask].mean()) ** 2)
+
+    return {
+        "slope_per_celsius": _round(slope),
+        "intercept": _round(intercept),
+        "r_squared": _round(1 - residual / total) if total > 0 else None,
+        "paired_days": int(mask.sum()),
+    }
+
+
+def _target_report(series: dict, target: np.ndarray, max_lag_days: int) -> dict:
+    return {
+        "days_with_data": int(np.isfinite(target).sum()),
+        "lagged_correlations": {
+            metric: {str(lag): lagged_correlation(series[metric], target, lag) for lag in range(max_lag_days + 1)}
+            for metric in TEMPERATURE_METRICS
+        },
+        "regression_on_mean_temp": linear_regression(series["mean_temp_celsius"], target),
+    }
+
+
+def correlation_report(rows: list, max_lag_days: int = 3, rolling_window_days: int = 7,
+                       window_start: Optional[date] = None) -> dict:
+    """
+    Lagged correlations (weather leading yield/fuel by 0..max_lag_days days),
+    a regression on the mean temperature per crop and for fuel, and rolling
+    means of every series. `rows` must be sorted by date and come from one location.
+
+    Rows before `window_start` are the lead-in loaded for the lags: only their
+    weather is used. Yield and fuel, the day counts and the rolling means
+    cover window_start onwards.
+    """
+    if not rows:
+        return {"location": None, "days_with_weather": 0, "days_with_harvest": 0, "crops": {}, "fuel": None,
+                "rolling_means": []}
+
+    days, series = _daily_series(rows)
+
+    in_window = np.ones(len(days), dtype=bool)
+    if window_start is not None:
+        if isinstance(window_start, datetime):
+            window_start = window_start.date()
+        in_window = days >= np.datetime64(window_start, "D")
+
+    target_keys = ["fuel_consumed_liters"] + [f"{crop}_kg_per_hectare" for crop in CROPS]
+    for key in target_keys:
+        series[key] = np.where(in_window, series[key], np.nan)
+
+    crops = {crop: _target_report(series, series[f"{crop}_kg_per_hectare"], max_lag_days) for crop in CROPS}
+    fuel = _target_report(series, series["fuel_consumed_liters"], max_lag_days)
+
+    rolling_keys = ["mean_temp_celsius"] + target_keys
+    rolling = {key: rolling_mean(series[key], rolling_window_days) for key in rolling_keys}
+    rolling_means = [
+        {"date": str(day), **{key: _round(rolling[key][i], 2) for key in rolling_keys}}
+        for i, day in enumerate(days) if in_window[i]
+    ]
+
+    return {
+        "location": rows[0].get("location"),
+        "days_with_weather": int((np.isfinite(series["mean_temp_celsius"]) & in_window).sum()),
+        "days_with_harvest": int(np.isfinite(series["fuel_consumed_liters"]).sum()),
+        "max_lag_days": max_lag_days,
+        "rolling_window_days": rolling_window_days,
+        "crops": crops,
+        "fuel": fuel,
+        "rolling_means": rolling_means,
+    }
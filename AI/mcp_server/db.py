@@ -1,66 +1,89 @@
 import os
-import pymongo
-from pymongo import MongoClient
-import json
+import datetime
 
-connection_string = os.getenv("MONGO_API_KEY")
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase, AsyncIOMotorCollection
 
-client = MongoClient(connection_string)
+DATABASE_NAME = os.getenv("MONGO_DATABASE_NAME", "farmer_assessment_db")
 
-db = client['farmer_assessment_db']
+# Connection pool tuned for many short, concurrent tool queries.
+# The client is created lazily on first use (inside the running event loop),
+# so importing this module has no side effects.
+POOL_SETTINGS = {
+    "maxPoolSize": int(os.getenv("MONGO_MAX_POOL_SIZE", "50")),
+    "minPoolSize": int(os.getenv("MONGO_MIN_POOL_SIZE", "2")),
+    "maxIdleTimeMS": int(os.getenv("MONGO_MAX_IDLE_TIME_MS", "60000")),
+    "waitQueueTimeoutMS": int(os.getenv("MONGO_WAIT_QUEUE_TIMEOUT_MS", "5000")),
+    "serverSelectionTimeoutMS": int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", "5000")),
+    "connectTimeoutMS": int(os.getenv("MONGO_CONNECT_TIMEOUT_MS", "5000")),
+    "retryReads": True,
+}
 
-# Access your collection
-collection_crops = db['crops']
-collection_applications = db['applications']
-collection_assesments = db['assesments']
-collection_documents = db['documents']
-collection_farmers = db['farmers']
-collection_harvest_logs = db['harvest_logs']
-collection_inventory = db['inventory']
-collection_orders = db['orders']
-collection_tasks = db['tasks']
-collection_weather = db["weather_logs"]
-collection_farmers= db["farmers"]
+# Server-side limit for a single query, so a cancelled tool call does not
+# keep a query running on the cluster
+QUERY_MAX_TIME_MS = int(os.getenv("MONGO_QUERY_MAX_TIME_MS", "10000"))
 
-import datetime
+# Collection names
+CROPS = "crops"
+APPLICATIONS = "applications"
+ASSESMENTS = "assesments"
+DOCUMENTS = "documents"
+FARMERS = "farmers"
+HARVEST_LOGS = "harvest_logs"
+INVENTORY = "inventory"
+ORDERS = "orders"
+TASKS = "tasks"
+WEATHER_LOGS = "weather_logs"
+EMPLOYEE_DAILY_HOURS = "employee_daily_hours"
 
-from bson import ObjectId
+_client = None
+
+
+def get_client() -> AsyncIOMotorClient:
+    """Return the shared Motor client, creating it on first use"""
+    global _client
+    if _client is None:
+        _client = AsyncIOMotorClient(os.getenv("MONGO_API_KEY"), **POOL_SETTINGS)
+    return _client
 
-def serialize_datetime(obj):
-    if isinstance(obj, datetime.datetime):
-        return obj.isoformat()
-    if isinstance(obj, ObjectId):
-        return str(obj)
-    raise TypeError("Type not serializable")
 
-# documents = collection_crops.find()
-# for doc in documents:
-#     print(json.dumps(doc, indent=4, default=serialize_datetime))
+def get_database() -> AsyncIOMotorDatabase:
+    return get_client()[DATABASE_NAME]
 
-# print("----------------------------------------------------------------------")
 
-# query = {
-#     "estimated_yield": {"$gte": 50},
-#     "crop_name": "Porumb"
-# }
+def get_collection(name: str) -> AsyncIOMotorCollection:
+    return get_database()[name]
 
-# documents = collection_crops.find(query)
 
-# for doc in documents:
-#     print(json.dumps(doc, indent=4, default=serialize_datetime))
+def collection_weather() -> AsyncIOMotorCollection:
+    return get_collection(WEATHER_LOGS)
 
-# print("----------------------------------------------------------------------")
 
-# # Query for documents with notes = "Intense work"
-# query = {
-#     "notes": "Intensive work"
-# }
+def collection_harvest_logs() -> AsyncIOMotorCollection:
+    return get_collection(HARVEST_LOGS)
 
-# # Get the count
-# count = collection_harvest_logs.count_documents(query)
-# print(f"Found {count} documents with 'Intense work' notes")
 
-# # Retrieve and display the documents
-# documents = collection_harvest_logs.find(query)
-# for doc in documents:
-#     print(json.dumps(doc, indent=4, default=serialize_datetime))
\ No newline at end of file
+def collection_farmers() -> AsyncIOMotorCollection:
+    return get_collection(FARMERS)
+
+
+async def ping() -> bool:
+    """Check that the cluster is reachable (also warms up the pool)"""
+    await get_client().admin.command("ping")
+    return True
+
+
+def close_client():
+    """Close the shared client; the next get_client() call opens a new one"""
+    global _client
+    if _client is not None:
+        _client.close()
+        _client = None
+
+
+def serialize_datetime(obj):
+    if isinstance(obj, datetime.datetime):
+        return obj.isoformat()
+    if isinstance(obj, ObjectId):
+        return str(obj)
+    raise TypeError("Type not serializable")
@@ -3,10 +3,21 @@ import httpx
 from mcp.server.fastmcp import FastMCP
 from fastapi import FastAPI
 import asyncio
+import calendar
+import contextlib
+import functools
+import logging
+import os
 from fastapi.middleware.cors import CORSMiddleware
 
 # from mcp_server.db import serialize_datetime
-from mcp_server.db import collection_weather, collection_harvest_logs, collection_farmers
+from mcp_server.db import (
+    collection_weather, collection_harvest_logs, collection_farmers, get_collection, ping, close_client,
+    QUERY_MAX_TIME_MS, HARVEST_LOGS, WEATHER_LOGS, FARMERS, EMPLOYEE_DAILY_HOURS
+)
+from mcp_server.cache import range_cache
+from mcp_server.correlation import weather_harvest_pipeline, correlation_report
+from mcp_server.compaction import compact, compaction_stats
 
 import json
 
@@ -14,6 +25,23 @@ from datetime import datetime, timedelta
 
 from bson import ObjectId
 
+logger = logging.getLogger(__name__)
+
+# Default upper bound for a single tool call; slow tools get their own value
+DEFAULT_TOOL_TIMEOUT_SECONDS = float(os.getenv("MCP_TOOL_TIMEOUT_SECONDS", "15"))
+
+# Location of the weather logs queried by the weather tools; weather_logs is keyed
+# on (location, date). Empty = every location (served by the plain date index)
+WEATHER_LOCATION = os.getenv("MCP_WEATHER_LOCATION", "")
+
+# Fields of a harvest log needed by the daily range tools (oil, working hours)
+HARVEST_DAILY_PROJECTION = {
+    "_id": 0,
+    "date": 1,
+    "oil_price_per_liter": 1,
+    "equipment": 1,
+}
+
 def serialize_datetime(dt):
     """Helper function to serialize datetime objects"""
     if dt is None:
@@ -32,24 +60,80 @@ def serialize_objectid(obj_id):
         return str(obj_id)
     return obj_id
 
-app = FastAPI()
-
-# Add CORS middleware to the main FastAPI app
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  # Allow all origins for development
-    allow_credentials=True,
-    allow_methods=["*"],  # Allow all methods including OPTIONS
-    allow_headers=["*"],
-)
+def tool_timeout(seconds: float = DEFAULT_TOOL_TIMEOUT_SECONDS):
+    """
+    Bound the runtime of an async tool. On timeout the tool returns an error
+    dict (like the other "no data" answers) instead of hanging the agent.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            try:
+                return await asyncio.wait_for(func(*args, **kwargs), timeout=seconds)
+            except asyncio.TimeoutError:
+                return {
+                    "error": f"Tool {func.__name__} timed out after {seconds} seconds",
+                    "tool": func.__name__
+                }
+        return wrapper
+    return decorator
+
+async def _load_harvest_rows(start: datetime, end: datetime) -> list:
+    cursor = collection_harvest_logs().find(
+        {"date": {"$gte": start, "$lt": end}},
+        HARVEST_DAILY_PROJECTION
+    ).sort("date", 1).max_time_ms(QUERY_MAX_TIME_MS)
+    return await cursor.to_list(None)
+
+async def get_harvest_rows(tool: str, start: datetime, end: datetime) -> list:
+    """Daily harvest rows with start <= date < end, served from the shared range cache"""
+    return await range_cache.get_rows(tool, "harvest_logs:daily", HARVEST_LOGS, start, end, _load_harvest_rows)
+
+def weather_range_query(start: datetime, end: datetime) -> dict:
+    """
+    Query adapter for weather_logs: native dates, optionally pinned to one
+    location, so a range is a single scan of the (location, date) index.
+    """
+    query = {"date": {"$gte": start, "$lt": end}}
+    if WEATHER_LOCATION:
+        query = {"location": WEATHER_LOCATION, **query}
+    return query
+
+async def _load_weather_rows(start: datetime, end: datetime) -> list:
+    cursor = collection_weather().find(
+        weather_range_query(start, end),
+        {"_id": 0}
+    ).sort("date", 1).max_time_ms(QUERY_MAX_TIME_MS)
+    return await cursor.to_list(None)
+
+async def get_weather_rows(tool: str, start: datetime, end: datetime) -> list:
+    """Weather rows with start <= date < end, served from the shared range cache"""
+    return await range_cache.get_rows(tool, "weather_logs:daily", WEATHER_LOGS, start, end, _load_weather_rows,
+                                      params={"location": WEATHER_LOCATION})
+
+def format_weather_row(doc: dict) -> dict:
+    """Weather fields returned by the weather tools (date as "YYYY-MM-DD")"""
+    return {
+        "max_temp_celsius": doc.get("max_temp_celsius"),
+        "min_temp_celsius": doc.get("min_temp_celsius"),
+        "weather_description": doc.get("weather_description"),
+        "location": doc.get("location"),
+        "temperature_unit": doc.get("temperature_unit"),
+        "data_sources": doc.get("data_sources"),
+        "imported_at": serialize_datetime(doc.get("imported_at")),
+    }
 
-mcp_weather_agent = FastMCP("Agent Weather MCP server", stateless_http=True, port=8001)
-mcp_vehicles_agent = FastMCP("Agent Vehicles MCP server", stateless_http=True, port=8002)
-mcp_employees_agent = FastMCP("Agent Employees MCP server", stateless_http=True, port=8003)
-mcp_harvest_agent = FastMCP("Agent Harvest MCP server", stateless_http=True, port=8004)
+# All tool groups are served by one host app (see create_app at the bottom)
+mcp_weather_agent = FastMCP("Agent Weather MCP server", stateless_http=True)
+mcp_vehicles_agent = FastMCP("Agent Vehicles MCP server", stateless_http=True)
+mcp_employees_agent = FastMCP("Agent Employees MCP server", stateless_http=True)
+mcp_harvest_agent = FastMCP("Agent Harvest MCP server", stateless_http=True)
+mcp_briefing_agent = FastMCP("Agent Farm Briefing MCP server", stateless_http=True)
     
 @mcp_weather_agent.tool()
-async def get_weather_info_for_last_n_days(number_of_days: int, today_day: int, today_month:int, today_year: int) -> dict:
+@tool_timeout()
+async def get_weather_info_for_last_n_days(number_of_days: int, today_day: int, today_month:int, today_year: int,
+                                           page: int = 0) -> dict:
     """
         Tool description:
             Tool used to get information about the weather for the past n days, starting from
@@ -58,6 +142,8 @@ async def get_weather_info_for_last_n_days(number_of_days: int, today_day: int,
         Input: 
             type: (int), name: days, equal with n from the description above, and means the number of days to fetch the weather information from the past relative to today.
             type: (int), name: today_day, today_month, today_year represents the date (day - month - year) that we are currently in.
+            type: (int), name: page, 0 (default) returns the full result when it fits the token budget, otherwise a summary plus the first
+        page of the detail rows; 1, 2, ... returns that page of the detail rows (see "pagination" in the output).
 
         Output:
             type: (dict), meaning: a mapping for the weather (temperature and possible description) for the days that have been requested when calling this tool. 
@@ -66,40 +152,24 @@ async def get_weather_info_for_last_n_days(number_of_days: int, today_day: int,
     # Build the "today" date
     today = datetime(today_year, today_month, today_day)
 
-    # Build list of date strings in format "YYYY-MM-DD"
-    requested_dates = [
-        (today - timedelta(days=i)).strftime("%Y-%m-%d")
-        for i in range(number_of_days)
-    ]
-
-    # Build query: find all documents WHERE date ∈ requested_dates
-    query = {
-        "date": {"$in": requested_dates}
-    }
+    # The last n days, today included
+    start = today - timedelta(days=number_of_days - 1)
+    end = today + timedelta(days=1)
 
-    # Convert cursor to list to avoid serialization issues
-    cursor = collection_weather.find(query)
-    documents = list(cursor)
+    documents = await get_weather_rows("get_weather_info_for_last_n_days", start, end)
 
-    # Build response dictionary
+    # Build response dictionary, keyed by "YYYY-MM-DD"
     results = {}
 
     for doc in documents:
-        date_key = doc.get("date")
-        results[date_key] = {
-            "max_temp_celsius": doc.get("max_temp_celsius"),
-            "min_temp_celsius": doc.get("min_temp_celsius"),
-            "weather_description": doc.get("weather_description"),
-            "location": doc.get("location"),
-            "temperature_unit": doc.get("temperature_unit"),
-            "imported_at": serialize_datetime(doc.get("imported_at"))
-            # Note: Removed _id from results since it's not needed and causes serialization issues
-        }
+        results[doc["date"].strftime("%Y-%m-%d")] = format_weather_row(doc)
 
-    return results
+    return compact(results, "get_weather_info_for_last_n_days", page)
 
 @mcp_weather_agent.tool()
-async def get_weather_info_for_the_next_n_days(days: int, today_day: int, today_month:int, today_year: int) -> dict:
+@tool_timeout()
+async def get_weather_info_for_the_next_n_days(days: int, today_day: int, today_month:int, today_year: int,
+                                               page: int = 0) -> dict:
     """
         Tool description:
             Tool used to get information about the weather for the next n days (! if available !), starting from
@@ -108,38 +178,29 @@ async def get_weather_info_for_the_next_n_days(days: int, today_day: int, today_
         Input: 
             type: (int), name: days, equal with n from the description above, and means the number of days to fetch the weather information from the past relative to today.
             type: (int), name: today_day, today_month, today_year represents the date (day - month - year) that we are currently in.
+            type: (int), name: page, 0 (default) returns the full result when it fits the token budget, otherwise a summary plus the first
+        page of the detail rows; 1, 2, ... returns that page of the detail rows (see "pagination" in the output).
 
         Output:
             type: (dict), meaning: a mapping for the weather (temperature and possible description) for the days that have been requested when calling this tool. 
     """
 
-    today = datetime(today_year, today_month, today_day).strftime("%Y-%m-%d")
-
-    # Query for dates greater than today
-    query = {
-        "date": {"$gt": today}
-    }
+    today = datetime(today_year, today_month, today_day)
 
-    # Sort ascending (nearest dates first), limit N days
-    cursor = collection_weather.find(query).sort("date", 1).limit(days)
+    # The n days after today, sorted ascending (nearest dates first)
+    start = today + timedelta(days=1)
+    end = today + timedelta(days=days + 1)
 
-    documents = list(cursor)
+    documents = await get_weather_rows("get_weather_info_for_the_next_n_days", start, end)
 
     results = {}
     for doc in documents:
-        date_key = doc.get("date")
-        results[date_key] = {
-            "max_temp_celsius": doc.get("max_temp_celsius"),
-            "min_temp_celsius": doc.get("min_temp_celsius"),
-            "weather_description": doc.get("weather_description"),
-            "location": doc.get("location"),
-            "temperature_unit": doc.get("temperature_unit"),
-            "imported_at": serialize_datetime(doc.get("imported_at")),
-        }
+        results[doc["date"].strftime("%Y-%m-%d")] = format_weather_row(doc)
 
-    return results
+    return compact(results, "get_weather_info_for_the_next_n_days", page)
 
 @mcp_weather_agent.tool()
+@tool_timeout()
 async def get_weather_info_for_a_day(day: int, month:int, year: int) -> dict:
     """
         Tool description:
@@ -153,32 +214,22 @@ async def get_weather_info_for_a_day(day: int, month:int, year: int) -> dict:
             type: (dict), meaning: a mapping for the weather (temperature and possible description) for the date this tool was called with.
     """
 
-    # Convert input date to string format "YYYY-MM-DD"
-    requested_date = datetime(year, month, day).strftime("%Y-%m-%d")
+    requested = datetime(year, month, day)
 
-    # Build query: find a document where date == requested_date
-    query = {"date": requested_date}
-
-    doc = collection_weather.find_one(query)
+    documents = await get_weather_rows("get_weather_info_for_a_day", requested, requested + timedelta(days=1))
+    doc = documents[0] if documents else None
 
     # If nothing found → return empty dict
     if not doc:
         return {}
 
     # Build response
-    result = {
-        "date": doc.get("date"),
-        "max_temp_celsius": doc.get("max_temp_celsius"),
-        "min_temp_celsius": doc.get("min_temp_celsius"),
-        "weather_description": doc.get("weather_description"),
-        "location": doc.get("location"),
-        "temperature_unit": doc.get("temperature_unit"),
-        "imported_at": serialize_datetime(doc.get("imported_at")),
-    }
+    result = {"date": doc["date"].strftime("%Y-%m-%d"), **format_weather_row(doc)}
 
     return result
 
 @mcp_vehicles_agent.tool()
+@tool_timeout()
 async def get_oil_price_for_a_specific_day(day: int, month: int, year: int) -> dict:
     """
         Tool description:
@@ -192,9 +243,9 @@ async def get_oil_price_for_a_specific_day(day: int, month: int, year: int) -> d
             type: (dict), meaning: a mapping for the price of 1 liter of oil to currency, based on the date this tool was called with.
     """
     target_date = datetime(year, month, day)
-    query = {"date": target_date}
 
-    doc = collection_harvest_logs.find_one(query)
+    rows = await get_harvest_rows("get_oil_price_for_a_specific_day", target_date, target_date + timedelta(days=1))
+    doc = rows[0] if rows else None
 
     if not doc:
         return {
@@ -209,6 +260,7 @@ async def get_oil_price_for_a_specific_day(day: int, month: int, year: int) -> d
     }
 
 @mcp_vehicles_agent.tool()
+@tool_timeout()
 async def get_total_oil_price_for_a_period_of_time(start_day: int, start_month: int, start_year: int, end_day: int, end_month: int, end_year: int) -> dict:
     """
         Tool description:
@@ -227,19 +279,12 @@ async def get_total_oil_price_for_a_period_of_time(start_day: int, start_month:
     # Include entire last day
     end_date_exclusive = end_date + timedelta(days=1)
 
-    query = {
-        "date": {
-            "$gte": start_date,
-            "$lt": end_date_exclusive
-        }
-    }
-
-    cursor = collection_harvest_logs.find(query)
+    rows = await get_harvest_rows("get_total_oil_price_for_a_period_of_time", start_date, end_date_exclusive)
 
     total_fuel_consumed_liters = 0.0
     total_fuel_cost = 0.0
 
-    for doc in cursor:
+    for doc in rows:
         oil_price_per_liter = doc.get("oil_price_per_liter")
         equipment_list = doc.get("equipment", [])
 
@@ -275,7 +320,38 @@ async def get_total_oil_price_for_a_period_of_time(start_day: int, start_month:
         "currency": "RON"
     }
 
+def _payday_segments(start_date: datetime, end_date: datetime) -> list:
+    """
+    Split [start_date, end_date] into (month_start, low_day, high_day) per calendar month.
+    When the last day of a short month is in range, paydays after it (e.g. 31 in
+    November) are paid on that last day, so the segment extends to 31.
+    """
+    if (end_date - start_date).days >= 31:
+        return [(start_date.replace(day=1), 1, 31)]
+
+    segments = []
+    cursor = start_date
+    while cursor <= end_date:
+        last_day = calendar.monthrange(cursor.year, cursor.month)[1]
+        segment_end = min(end_date, cursor.replace(day=last_day))
+        high = 31 if segment_end.day == last_day else segment_end.day
+        segments.append((cursor.replace(day=1), cursor.day, high))
+        cursor = segment_end + timedelta(days=1)
+
+    return segments
+
+def _payment_date(payday, segments: list):
+    """Actual date (YYYY-MM-DD) on which a payday falls inside the segments"""
+    if not isinstance(payday, int):
+        return None
+    for month_start, low, high in segments:
+        if low <= payday <= high:
+            last_day = calendar.monthrange(month_start.year, month_start.month)[1]
+            return month_start.replace(day=min(payday, last_day)).strftime("%Y-%m-%d")
+    return None
+
 @mcp_employees_agent.tool()
+@tool_timeout()
 async def get_employees_paid_in_n_days_from_date(n_days: int,start_day: int,start_month: int,start_year: int) -> dict:
     """
         Tool description:
@@ -293,30 +369,30 @@ async def get_employees_paid_in_n_days_from_date(n_days: int,start_day: int,star
     # 2. Interval upper bound
     end_date = start_date + timedelta(days=n_days)
 
-    # 3. Construim lista de "day-of-month" din interval
-    #    ex: 26, 27, 28, 29, 30, 31
-    days_in_range = set()
+    # 3. Intervalele de "day-of-month" din interval, câte unul pe lună
+    #    ex: 26.11 → 03.12 dă [(26, 31), (1, 3)]
+    segments = _payday_segments(start_date, end_date)
 
-    curr = start_date
-    while curr <= end_date:
-        days_in_range.add(curr.day)
-        curr += timedelta(days=1)
+    # 4. Căutăm toți cu payday în aceste intervale (index pe payday)
+    query = {"$or": [{"payday": {"$gte": low, "$lte": high}} for _, low, high in segments]}
+    projection = {"_id": 0, "first_name": 1, "last_name": 1, "cnp": 1, "payday": 1}
 
-    # 4. Căutăm toți cu payday în acest range
-    query = {"payday": {"$in": list(days_in_range)}}
-
-    # PyMongo e sync → nu await
-    cursor = collection_farmers.find(query)
+    cursor = collection_farmers().find(query, projection).sort("payday", 1).max_time_ms(QUERY_MAX_TIME_MS)
 
     employees = []
-    for doc in cursor:
+    async for doc in cursor:
+        payday = doc.get("payday")
         employees.append({
             "first_name": doc.get("first_name"),
             "last_name": doc.get("last_name"),
             "cnp": doc.get("cnp"),
-            "payday": doc.get("payday")
+            "payday": payday,
+            "payment_date": _payment_date(payday, segments)
         })
 
+    employees.sort(key=lambda employee: employee["payment_date"] or "")
+    days_in_range = {day for _, low, high in segments for day in range(low, high + 1)}
+
     return {
         "start_date": start_date.strftime("%Y-%m-%d"),
         "end_date": end_date.strftime("%Y-%m-%d"),
@@ -326,6 +402,7 @@ async def get_employees_paid_in_n_days_from_date(n_days: int,start_day: int,star
     }
 
 @mcp_employees_agent.tool()
+@tool_timeout()
 async def get_employee_working_hours_for_a_period(first_name: str,last_name: str,start_day: int,start_month: int,
                                                                    start_year: int,end_day: int,end_month: int,end_year: int) -> dict:
     """
@@ -351,12 +428,8 @@ async def get_employee_working_hours_for_a_period(first_name: str,last_name: str
         "last_name": last_name
     }
 
-    farmer_cursor = collection_farmers.find(farmer_query)
-
-    employee_doc = None
-    for doc in farmer_cursor:
-        employee_doc = doc
-        break  # luăm doar primul care se potrivește
+    # luăm doar primul care se potrivește
+    employee_doc = await collection_farmers().find_one(farmer_query, max_time_ms=QUERY_MAX_TIME_MS)
 
     if not employee_doc:
         return {
@@ -368,19 +441,12 @@ async def get_employee_working_hours_for_a_period(first_name: str,last_name: str
     employee_id_str = str(employee_doc.get("_id"))
 
     # 3. Luăm toate harvest logs din perioada cerută
-    logs_query = {
-        "date": {
-            "$gte": start_date,
-            "$lt": end_date_exclusive
-        }
-    }
-
-    logs_cursor = collection_harvest_logs.find(logs_query)
+    logs = await get_harvest_rows("get_employee_working_hours_for_a_period", start_date, end_date_exclusive)
 
     total_work_hours = 0.0
 
     # 4. Parcurgem fiecare log și fiecare equipment din el
-    for log in logs_cursor:
+    for log in logs:
         equipment_list = log.get("equipment", [])
         for eq in equipment_list:
             # verificăm dacă acest record de equipment e pentru angajatul nostru
@@ -402,6 +468,7 @@ async def get_employee_working_hours_for_a_period(first_name: str,last_name: str
     }
 
 @mcp_employees_agent.tool()
+@tool_timeout()
 async def get_employee_with_a_specific_role(role: str) -> dict:
     """
         Tool description:
@@ -414,11 +481,10 @@ async def get_employee_with_a_specific_role(role: str) -> dict:
     """
     query = {"role": role}
 
-    # PyMongo / PyBase sync -> nu folosim await
-    cursor = collection_farmers.find(query)
+    cursor = collection_farmers().find(query).max_time_ms(QUERY_MAX_TIME_MS)
 
     employees = []
-    for doc in cursor:
+    async for doc in cursor:
         employees.append({
             "first_name": doc.get("first_name"),
             "last_name": doc.get("last_name"),
@@ -432,6 +498,7 @@ async def get_employee_with_a_specific_role(role: str) -> dict:
     }
 
 @mcp_employees_agent.tool()
+@tool_timeout()
 async def get_employees_bday_in_next_n_days_from_day_x(n:int, start_day: int,start_month: int,
                                                                    start_year: int) -> dict:
     """
@@ -447,47 +514,39 @@ async def get_employees_bday_in_next_n_days_from_day_x(n:int, start_day: int,sta
     start_date = datetime(start_year, start_month, start_day).date()
     end_date = start_date + timedelta(days=n)
 
-    # 2. Construim set-ul de (month, day) pentru toate zilele din interval
-    days_in_range = set()
-    curr = start_date
-    while curr <= end_date:
-        days_in_range.add((curr.month, curr.day))
-        curr += timedelta(days=1)
+    # 2. Interval pe birth_month_day (MMDD), cu trecere peste sfârșitul anului
+    start_md = start_date.month * 100 + start_date.day
+    end_md = end_date.month * 100 + end_date.day
 
-    # 3. Luăm toți angajații din baza de date
-    cursor = collection_farmers.find({})  # PyMongo / PyBase sync → fără await
-
-    employees = []
-
-    for doc in cursor:
-        cnp = str(doc.get("cnp", "")).strip()
-
-        # CNP trebuie să aibă cel puțin 6 cifre pentru a extrage MM și DD
-        if len(cnp) < 6:
-            continue
-
-        mm_str = cnp[3:5]  # cifrele 3-4
-        dd_str = cnp[5:7]  # cifrele 5-6
+    if n >= 365:
+        query = {"birth_month_day": {"$gte": 101, "$lte": 1231}}
+    elif end_date.year == start_date.year:
+        query = {"birth_month_day": {"$gte": start_md, "$lte": end_md}}
+    else:
+        query = {"$or": [
+            {"birth_month_day": {"$gte": start_md}},
+            {"birth_month_day": {"$lte": end_md}},
+        ]}
 
-        if not (mm_str.isdigit() and dd_str.isdigit()):
-            continue
+    # 3. Doar angajații care se potrivesc (index pe birth_month_day)
+    projection = {"_id": 0, "first_name": 1, "last_name": 1, "cnp": 1, "birth_month_day": 1}
+    cursor = collection_farmers().find(query, projection).sort("birth_month_day", 1).max_time_ms(QUERY_MAX_TIME_MS)
 
-        month = int(mm_str)
-        day = int(dd_str)
+    employees = []
 
-        # validare simplă
-        if not (1 <= month <= 12 and 1 <= day <= 31):
-            continue
+    async for doc in cursor:
+        month_day = doc["birth_month_day"]
+        employees.append({
+            "first_name": doc.get("first_name"),
+            "last_name": doc.get("last_name"),
+            "cnp": doc.get("cnp"),
+            "birthday_month": month_day // 100,
+            "birthday_day": month_day % 100,
+        })
 
-        # verificăm dacă (month, day) este în intervalul nostru
-        if (month, day) in days_in_range:
-            employees.append({
-                "first_name": doc.get("first_name"),
-                "last_name": doc.get("last_name"),
-                "cnp": cnp,
-                "birthday_month": month,
-                "birthday_day": day,
-            })
+    # În ordinea în care vin zilele de naștere (după 31.12 urmează 01.01)
+    employees.sort(key=lambda e: (e["birthday_month"] * 100 + e["birthday_day"] < start_md,
+                                  e["birthday_month"], e["birthday_day"]))
 
     return {
         "start_date": start_date.strftime("%Y-%m-%d"),
@@ -496,433 +555,389 @@ async def get_employees_bday_in_next_n_days_from_day_x(n:int, start_day: int,sta
         "employees": employees,
     }
 
+def _employee_daily_stats_stages() -> list:
+    """(day, employee) rows → daily_stats entries with the employee details from farmers"""
+    return [
+        {"$lookup": {
+            "from": FARMERS,
+            "let": {"farmer_oid": {"$convert": {
+                "input": "$_id.farmer_id", "to": "objectId", "onError": None, "onNull": None
+            }}},
+            "pipeline": [
+                {"$match": {"$expr": {"$eq": ["$_id", "$$farmer_oid"]}}},
+                {"$project": {"_id": 0, "first_name": 1, "last_name": 1, "role": 1, "cnp": 1}},
+            ],
+            "as": "farmer",
+        }},
+        {"$sort": {"_id.day": 1, "_id.farmer_id": 1}},
+        {"$group": {
+            "_id": "$_id.day",
+            "employees": {"$push": {
+                "id": "$_id.farmer_id",
+                "first_name": {"$arrayElemAt": ["$farmer.first_name", 0]},
+                "last_name": {"$arrayElemAt": ["$farmer.last_name", 0]},
+                "role": {"$arrayElemAt": ["$farmer.role", 0]},
+                "cnp": {"$arrayElemAt": ["$farmer.cnp", 0]},
+                "tasks": "$tasks",
+                "total_work_hours_for_day": "$total_work_hours_for_day",
+            }},
+        }},
+        {"$sort": {"_id": 1}},
+        {"$project": {
+            "_id": 0,
+            "date": "$_id",
+            "total_employees_worked": {"$size": "$employees"},
+            "employees": 1,
+        }},
+    ]
+
 @mcp_employees_agent.tool()
+@tool_timeout(30)
 async def get_stats_about_employees_tasks_from_last_n_days(n:int, start_day: int,start_month: int,
-                                                                   start_year: int) -> dict:
+                                                                   start_year: int, page: int = 0) -> dict:
     """
         Tool description:
             Tool used to get stats about employees tasks from last n days starting from a specific day. This tool queries the farmers database, where the employees data is stored.
         Input: 
             type: (int), n, represents the number of days from the specific date to check which employees have birthday.
             type: (int), name: start_day, start_month, start_year represents the starting date (day - month - year) that we are currently in.
+            type: (int), name: page, 0 (default) returns the full result when it fits the token budget, otherwise a summary plus the first
+        page of the detail rows; 1, 2, ... returns that page of the detail rows (see "pagination" in the output).
         Output:
             type: (dict), meaning: a mapping for the employees and their tasks stats from the last n days starting from the specific date: how many
-        employees worked per each day and which were their tasks.
+        employees worked per each day and which were their tasks. Long windows start with a summary (hours per employee and per day).
 
     """
     end_date = datetime(start_year, start_month, start_day)
     start_date = end_date - timedelta(days=n-1)  # ex: n=7 → ultimele 7 zile
     end_date_exclusive = end_date + timedelta(days=1)
 
-    # 2. Luăm toate harvest_logs din interval
-    logs_query = {
-        "date": {
-            "$gte": start_date,
-            "$lt": end_date_exclusive
-        }
+    # Rândurile (zi, angajat) sunt precalculate de Backend (HarvestService.employee_daily_hours_pipeline,
+    # singura definiție); aici doar $lookup în farmers și grupare pe zi
+    pipeline = [{"$match": {"date": {"$gte": start_date, "$lt": end_date_exclusive}}}]
+    pipeline += _employee_daily_stats_stages()
+    daily_stats = await get_collection(EMPLOYEE_DAILY_HOURS).aggregate(
+        pipeline, maxTimeMS=QUERY_MAX_TIME_MS
+    ).to_list(None)
+
+    all_employee_ids = {
+        employee["id"]
+        for day in daily_stats
+        for employee in day["employees"]
     }
-    logs_cursor = collection_harvest_logs.find(logs_query)
-
-    # Structură intermediară:
-    # days[date_str] = {
-    #   "employee_tasks": { farmer_id_str: { equipment_type: total_hours } }
-    # }
-    days = {}
-    all_employee_ids = set()
 
-    for log in logs_cursor:
-        date_value = log.get("date")
-        if not date_value:
-            continue
-
-        date_str = date_value.strftime("%Y-%m-%d")
-        if date_str not in days:
-            days[date_str] = {"employee_tasks": {}}
-
-        equipment_list = log.get("equipment", [])
-        for eq in equipment_list:
-            farmer_id_str = eq.get("farmer_id")
-            equipment_type = eq.get("equipment_type", "Unknown")
-            work_hours = eq.get("work_hours", 0)
-
-            if not farmer_id_str:
-                continue
-
-            all_employee_ids.add(farmer_id_str)
+    return compact({
+        "start_date": start_date.strftime("%Y-%m-%d"),
+        "end_date": end_date.strftime("%Y-%m-%d"),
+        "n_days": n,
+        "total_unique_employees": len(all_employee_ids),
+        "daily_stats": daily_stats
+    }, "get_stats_about_employees_tasks_from_last_n_days", page)
+
+CROPS = ("wheat", "tomatoes", "sunflower", "beans")
+
+# Bucket size for the crop-yield engine -> $dateTrunc unit
+YIELD_GRANULARITIES = ("day", "week", "month")
+
+def _period_label(period_start: datetime, granularity: str) -> str:
+    if granularity == "week":
+        iso_year, iso_week, _ = period_start.isocalendar()
+        return f"{iso_year}-W{iso_week:02d}"
+    if granularity == "month":
+        return period_start.strftime("%Y-%m")
+    return period_start.strftime("%Y-%m-%d")
+
+async def _load_crop_buckets(start: datetime, end: datetime, granularity: str) -> list:
+    """One $group pass over harvest_logs producing kg/hectare sums for every crop per bucket"""
+    group = {
+        "_id": {"$dateTrunc": {"date": "$date", "unit": granularity, "startOfWeek": "monday"}},
+        "days": {"$sum": 1},
+    }
+    for crop in CROPS:
+        group[f"{crop}_kg"] = {"$sum": {"$ifNull": [f"${crop}_harvested_kg", 0]}}
+        group[f"{crop}_hectares"] = {"$sum": {"$ifNull": [f"${crop}_harvested_hectares", 0]}}
+
+    pipeline = [
+        {"$match": {"date": {"$gte": start, "$lt": end}}},
+        {"$group": group},
+        {"$sort": {"_id": 1}},
+        {"$set": {"date": "$_id"}},
+        {"$unset": "_id"},
+    ]
+    return await collection_harvest_logs().aggregate(pipeline, maxTimeMS=QUERY_MAX_TIME_MS).to_list(None)
 
-            if farmer_id_str not in days[date_str]["employee_tasks"]:
-                days[date_str]["employee_tasks"][farmer_id_str] = {}
+async def compute_crop_yields(crops: list, start_date: datetime, end_date: datetime,
+                              granularity: str = "day", tool: str = "compute_crop_yields") -> dict:
+    """
+    Generic crop-yield engine: totals and per-period yields for any subset of
+    crops, from a single aggregation over the (inclusive) period.
+    All crops are always grouped together, so every per-crop view of the same
+    period shares one cached query.
+    """
+    unknown = [crop for crop in crops if crop not in CROPS]
+    if unknown:
+        raise ValueError(f"Unknown crops: {', '.join(unknown)}. Available crops: {', '.join(CROPS)}")
+    if granularity not in YIELD_GRANULARITIES:
+        raise ValueError(f"Unknown granularity: {granularity}. Use one of: {', '.join(YIELD_GRANULARITIES)}")
 
-            if equipment_type not in days[date_str]["employee_tasks"][farmer_id_str]:
-                days[date_str]["employee_tasks"][farmer_id_str][equipment_type] = 0.0
+    end_date_exclusive = end_date + timedelta(days=1)
 
-            days[date_str]["employee_tasks"][farmer_id_str][equipment_type] += float(work_hours or 0)
+    async def loader(start, end):
+        return await _load_crop_buckets(start, end, granularity)
+
+    # Daily buckets can be sliced out of a cached superset; week/month buckets cannot
+    buckets = await range_cache.get_rows(
+        tool, f"harvest_logs:crop_yields:{granularity}", HARVEST_LOGS,
+        start_date, end_date_exclusive, loader,
+        allow_superset=(granularity == "day")
+    )
+
+    result = {}
+    for crop in crops:
+        total_kg = 0.0
+        total_hectares = 0.0
+        periods = []
+
+        for bucket in buckets:
+            kg = float(bucket.get(f"{crop}_kg", 0) or 0)
+            hectares = float(bucket.get(f"{crop}_hectares", 0) or 0)
+            total_kg += kg
+            total_hectares += hectares
+            periods.append({
+                "period": _period_label(bucket["date"], granularity),
+                "days_logged": bucket.get("days", 0),
+                "harvested_kg": kg,
+                "harvested_hectares": hectares,
+                "yield_kg_per_hectare": kg / hectares if hectares > 0 else 0.0
+            })
 
-    # Dacă nu a lucrat nimeni în interval
-    if not days:
-        return {
-            "start_date": start_date.strftime("%Y-%m-%d"),
-            "end_date": end_date.strftime("%Y-%m-%d"),
-            "n_days": n,
-            "total_unique_employees": 0,
-            "daily_stats": []
+        result[crop] = {
+            "total_harvested_kg": total_kg,
+            "total_harvested_hectares": total_hectares,
+            "overall_yield_kg_per_hectare": total_kg / total_hectares if total_hectares > 0 else 0.0,
+            "periods": periods
         }
 
-    # 3. Luăm info despre angajați din collection_farmers
-    #    presupunem că în equipment.farmer_id este str(ObjectId(...))
-    farmer_ids_as_objectid = []
-    for fid in all_employee_ids:
-        try:
-            farmer_ids_as_objectid.append(ObjectId(fid))
-        except Exception:
-            # dacă nu e ObjectId valid, ignorăm (sau îl tratăm separat)
-            continue
+    return {
+        "start_date": start_date.strftime("%Y-%m-%d"),
+        "end_date": end_date.strftime("%Y-%m-%d"),
+        "granularity": granularity,
+        "crops": result
+    }
 
-    farmers_map = {}
-    if farmer_ids_as_objectid:
-        farmers_cursor = collection_farmers.find({"_id": {"$in": farmer_ids_as_objectid}})
-        for farmer in farmers_cursor:
-            fid_str = str(farmer.get("_id"))
-            farmers_map[fid_str] = {
-                "first_name": farmer.get("first_name"),
-                "last_name": farmer.get("last_name"),
-                "role": farmer.get("role"),
-                "cnp": farmer.get("cnp"),
+async def _single_crop_yield_view(crop: str, start_date: datetime, end_date: datetime, tool: str) -> dict:
+    """Per-crop tool output (historical format) built on top of compute_crop_yields"""
+    yields = await compute_crop_yields([crop], start_date, end_date, granularity="day", tool=tool)
+    crop_yields = yields["crops"][crop]
+
+    return {
+        "start_date": yields["start_date"],
+        "end_date": yields["end_date"],
+        f"total_{crop}_harvested_kg": crop_yields["total_harvested_kg"],
+        f"total_{crop}_harvested_hectares": crop_yields["total_harvested_hectares"],
+        f"overall_{crop}_yield_kg_per_hectare": crop_yields["overall_yield_kg_per_hectare"],
+        "daily_stats": [
+            {
+                "date": period["period"],
+                f"{crop}_harvested_kg": period["harvested_kg"],
+                f"{crop}_harvested_hectares": period["harvested_hectares"],
+                f"{crop}_yield_kg_per_hectare": period["yield_kg_per_hectare"]
             }
+            for period in crop_yields["periods"]
+        ]
+    }
 
-    # 4. Construim output-ul pe zile
-    daily_stats = []
-    for date_str in sorted(days.keys()):
-        employee_tasks = days[date_str]["employee_tasks"]
-        employees_out = []
-
-        for fid_str, tasks_hours in employee_tasks.items():
-            info = farmers_map.get(fid_str, {})
-            
-            # Calculăm totalul orelor pentru angajatul respectiv în ziua respectivă
-            total_hours_for_day = sum(tasks_hours.values())
-            
-            # Construim lista de task-uri cu orele aferente
-            tasks_list = []
-            for task_type, hours in tasks_hours.items():
-                tasks_list.append({
-                    "equipment_type": task_type,
-                    "work_hours": hours
-                })
-            
-            employees_out.append({
-                "id": fid_str,
-                "first_name": info.get("first_name"),
-                "last_name": info.get("last_name"),
-                "role": info.get("role"),
-                "cnp": info.get("cnp"),
-                "tasks": tasks_list,
-                "total_work_hours_for_day": total_hours_for_day
-            })
+@mcp_harvest_agent.tool()
+@tool_timeout()
+async def get_crops_yield_for_a_specific_period(crops: list[str], start_day: int, start_month: int, start_year: int,
+                                                end_day: int, end_month: int, end_year: int,
+                                                granularity: str = "day", page: int = 0) -> dict:
+    """
+        Tool description:
+            Tool used to get the yield of several crops for a specific period in a single call. This tool queries the harvest_logs
+        database, where the harvest data is stored. Prefer it over the per-crop tools whenever more than one crop is requested.
+        Input:
+            type: (list[str]), name: crops, any subset of: "wheat", "tomatoes", "sunflower", "beans".
+            type: (int), name: start_day, start_month, start_year, end_day, end_month, end_year represent the period of time (inclusive).
+            type: (str), name: granularity, one of "day", "week" or "month" - the size of the periods in the breakdown (default "day").
+            type: (int), name: page, 0 (default) returns the full result when it fits the token budget, otherwise a summary plus the first
+        page of the detail rows; 1, 2, ... returns that page of the detail rows (see "pagination" in the output).
+        Output:
+            type: (dict), meaning: for each requested crop the total kg, total hectares, overall yield (kg/hectare)
+        and a per-period breakdown within the specified period.
 
-        daily_stats.append({
-            "date": date_str,
-            "total_employees_worked": len(employees_out),
-            "employees": employees_out
-        })
+    """
+    start_date = datetime(start_year, start_month, start_day)
+    end_date = datetime(end_year, end_month, end_day)
 
-    return {
-        "start_date": start_date.strftime("%Y-%m-%d"),
-        "end_date": end_date.strftime("%Y-%m-%d"),
-        "n_days": n,
-        "total_unique_employees": len(all_employee_ids),
-        "daily_stats": daily_stats
-    }
+    try:
+        yields = await compute_crop_yields(
+            [crop.strip().lower() for crop in crops], start_date, end_date,
+            granularity=granularity.strip().lower(), tool="get_crops_yield_for_a_specific_period"
+        )
+    except ValueError as e:
+        return {"error": str(e)}
+
+    return compact(yields, "get_crops_yield_for_a_specific_period", page)
 
 @mcp_harvest_agent.tool()
+@tool_timeout()
 async def get_wheat_yield_for_a_specific_period(start_day: int,start_month: int,
-                                                start_year: int, end_day: int, end_month: int, end_year: int) -> dict:
+                                                start_year: int, end_day: int, end_month: int, end_year: int,
+                                                page: int = 0) -> dict:
     """
         Tool description:
             Tool used to get wheat yield for a specific period. This tool queries the harvest_logs database, where the harvest data is stored.
         Input: 
             type: (int), name: start_day, start_month, start_year, end_day, end_month, end_year represent the period of time.
+            type: (int), name: page, 0 (default) returns the full result when it fits the token budget, otherwise a summary plus the first
+        page of the detail rows; 1, 2, ... returns that page of the detail rows (see "pagination" in the output).
         Output:
             type: (dict), meaning: a mapping for the wheat yield within the specified period.
 
     """
     start_date = datetime(start_year, start_month, start_day)
     end_date = datetime(end_year, end_month, end_day)
-    end_date_exclusive = end_date + timedelta(days=1)
-
-    # 2. Query în harvest_logs pentru interval
-    logs_query = {
-        "date": {
-            "$gte": start_date,
-            "$lt": end_date_exclusive
-        }
-    }
-
-    # collection_harvest_logs este sync (PyMongo / PyBase style) → nu folosim await
-    logs_cursor = collection_harvest_logs.find(logs_query)
 
-    total_wheat_kg = 0.0
-    total_wheat_hectares = 0.0
-    daily_stats = []
-
-    for log in logs_cursor:
-        date_value = log.get("date")
-
-        wheat_kg = float(log.get("wheat_harvested_kg", 0) or 0)
-        wheat_hectares = float(log.get("wheat_harvested_hectares", 0) or 0)
-
-        # actualizăm totalurile pe toată perioada
-        total_wheat_kg += wheat_kg
-        total_wheat_hectares += wheat_hectares
-
-        # calculăm yield-ul pe zi, dacă avem hectare > 0
-        if wheat_hectares > 0:
-            daily_yield = wheat_kg / wheat_hectares
-        else:
-            daily_yield = 0.0  # sau None, daca vrei să marchezi lipsa datelor
-
-        daily_stats.append({
-            "date": date_value.strftime("%Y-%m-%d") if date_value else None,
-            "wheat_harvested_kg": wheat_kg,
-            "wheat_harvested_hectares": wheat_hectares,
-            "wheat_yield_kg_per_hectare": daily_yield
-        })
-
-    # yield general pe toată perioada
-    if total_wheat_hectares > 0:
-        overall_yield = total_wheat_kg / total_wheat_hectares
-    else:
-        overall_yield = 0.0
-
-    return {
-        "start_date": start_date.strftime("%Y-%m-%d"),
-        "end_date": end_date.strftime("%Y-%m-%d"),
-        "total_wheat_harvested_kg": total_wheat_kg,
-        "total_wheat_harvested_hectares": total_wheat_hectares,
-        "overall_wheat_yield_kg_per_hectare": overall_yield,
-        "daily_stats": daily_stats
-    }
+    view = await _single_crop_yield_view("wheat", start_date, end_date, "get_wheat_yield_for_a_specific_period")
+    return compact(view, "get_wheat_yield_for_a_specific_period", page)
 
 @mcp_harvest_agent.tool()
+@tool_timeout()
 async def get_tomatoes_yield_for_a_specific_period(start_day: int,start_month: int,
-                                                start_year: int, end_day: int, end_month: int, end_year: int) -> dict:
+                                                start_year: int, end_day: int, end_month: int, end_year: int,
+                                                page: int = 0) -> dict:
     """
         Tool description:
             Tool used to get tomatoes yield for a specific period. This tool queries the harvest_logs database, where the harvest data is stored.
         Input: 
             type: (int), name: start_day, start_month, start_year, end_day, end_month, end_year represent the period of time.
+            type: (int), name: page, 0 (default) returns the full result when it fits the token budget, otherwise a summary plus the first
+        page of the detail rows; 1, 2, ... returns that page of the detail rows (see "pagination" in the output).
         Output:
             type: (dict), meaning: a mapping for the tomatoes yield within the specified period.
 
     """
     start_date = datetime(start_year, start_month, start_day)
     end_date = datetime(end_year, end_month, end_day)
-    end_date_exclusive = end_date + timedelta(days=1)
-
-    # 2. Query în harvest_logs pentru interval
-    logs_query = {
-        "date": {
-            "$gte": start_date,
-            "$lt": end_date_exclusive
-        }
-    }
-
-    # collection_harvest_logs este sync (PyMongo / PyBase style) → nu folosim await
-    logs_cursor = collection_harvest_logs.find(logs_query)
-
-    total_tomatoes_kg = 0.0
-    total_tomatoes_hectares = 0.0
-    daily_stats = []
-
-    for log in logs_cursor:
-        date_value = log.get("date")
-
-        tomatoes_kg = float(log.get("tomatoes_harvested_kg", 0) or 0)
-        tomatoes_hectares = float(log.get("tomatoes_harvested_hectares", 0) or 0)
-
-        # actualizăm totalurile pe toată perioada
-        total_tomatoes_kg += tomatoes_kg
-        total_tomatoes_hectares += tomatoes_hectares
 
-        # calculăm yield-ul pe zi, dacă avem hectare > 0
-        if tomatoes_hectares > 0:
-            daily_yield = tomatoes_kg / tomatoes_hectares
-        else:
-            daily_yield = 0.0  # sau None, daca vrei să marchezi lipsa datelor
-
-        daily_stats.append({
-            "date": date_value.strftime("%Y-%m-%d") if date_value else None,
-            "tomatoes_harvested_kg": tomatoes_kg,
-            "tomatoes_harvested_hectares": tomatoes_hectares,
-            "tomatoes_yield_kg_per_hectare": daily_yield
-        })
-
-    # yield general pe toată perioada
-    if total_tomatoes_hectares > 0:
-        overall_yield = total_tomatoes_kg / total_tomatoes_hectares
-    else:
-        overall_yield = 0.0
-
-    return {
-        "start_date": start_date.strftime("%Y-%m-%d"),
-        "end_date": end_date.strftime("%Y-%m-%d"),
-        "total_tomatoes_harvested_kg": total_tomatoes_kg,
-        "total_tomatoes_harvested_hectares": total_tomatoes_hectares,
-        "overall_tomatoes_yield_kg_per_hectare": overall_yield,
-        "daily_stats": daily_stats
-    }
+    view = await _single_crop_yield_view("tomatoes", start_date, end_date, "get_tomatoes_yield_for_a_specific_period")
+    return compact(view, "get_tomatoes_yield_for_a_specific_period", page)
 
 @mcp_harvest_agent.tool()
+@tool_timeout()
 async def get_sunflower_yield_for_a_specific_period(start_day: int,start_month: int,
-                                                start_year: int, end_day: int, end_month: int, end_year: int) -> dict:
+                                                start_year: int, end_day: int, end_month: int, end_year: int,
+                                                page: int = 0) -> dict:
     """
         Tool description:
             Tool used to get sunflower yield for a specific period. This tool queries the harvest_logs database, where the harvest data is stored.
         Input: 
             type: (int), name: start_day, start_month, start_year, end_day, end_month, end_year represent the period of time.
+            type: (int), name: page, 0 (default) returns the full result when it fits the token budget, otherwise a summary plus the first
+        page of the detail rows; 1, 2, ... returns that page of the detail rows (see "pagination" in the output).
         Output:
             type: (dict), meaning: a mapping for the sunflower yield within the specified period.
 
     """
     start_date = datetime(start_year, start_month, start_day)
     end_date = datetime(end_year, end_month, end_day)
-    end_date_exclusive = end_date + timedelta(days=1)
-
-    # 2. Query în harvest_logs pentru interval
-    logs_query = {
-        "date": {
-            "$gte": start_date,
-            "$lt": end_date_exclusive
-        }
-    }
-
-    # collection_harvest_logs este sync (PyMongo / PyBase style) → nu folosim await
-    logs_cursor = collection_harvest_logs.find(logs_query)
-
-    total_sunflower_kg = 0.0
-    total_sunflower_hectares = 0.0
-    daily_stats = []
-
-    for log in logs_cursor:
-        date_value = log.get("date")
-
-        sunflower_kg = float(log.get("sunflower_harvested_kg", 0) or 0)
-        sunflower_hectares = float(log.get("sunflower_harvested_hectares", 0) or 0)
-
-        # actualizăm totalurile pe toată perioada
-        total_sunflower_kg += sunflower_kg
-        total_sunflower_hectares += sunflower_hectares
 
-        # calculăm yield-ul pe zi, dacă avem hectare > 0
-        if sunflower_hectares > 0:
-            daily_yield = sunflower_kg / sunflower_hectares
-        else:
-            daily_yield = 0.0  # sau None, daca vrei să marchezi lipsa datelor
-
-        daily_stats.append({
-            "date": date_value.strftime("%Y-%m-%d") if date_value else None,
-            "sunflower_harvested_kg": sunflower_kg,
-            "sunflower_harvested_hectares": sunflower_hectares,
-            "sunflower_yield_kg_per_hectare": daily_yield
-        })
-
-    # yield general pe toată perioada
-    if total_sunflower_hectares > 0:
-        overall_yield = total_sunflower_kg / total_sunflower_hectares
-    else:
-        overall_yield = 0.0
-
-    return {
-        "start_date": start_date.strftime("%Y-%m-%d"),
-        "end_date": end_date.strftime("%Y-%m-%d"),
-        "total_sunflower_harvested_kg": total_sunflower_kg,
-        "total_sunflower_harvested_hectares": total_sunflower_hectares,
-        "overall_sunflower_yield_kg_per_hectare": overall_yield,
-        "daily_stats": daily_stats
-    }
+    view = await _single_crop_yield_view("sunflower", start_date, end_date, "get_sunflower_yield_for_a_specific_period")
+    return compact(view, "get_sunflower_yield_for_a_specific_period", page)
 
 @mcp_harvest_agent.tool()
+@tool_timeout()
 async def get_beans_yield_for_a_specific_period(start_day: int,start_month: int,
-                                                start_year: int, end_day: int, end_month: int, end_year: int) -> dict:
+                                                start_year: int, end_day: int, end_month: int, end_year: int,
+                                                page: int = 0) -> dict:
     """
         Tool description:
             Tool used to get beans yield for a specific period. This tool queries the harvest_logs database, where the harvest data is stored.
         Input: 
             type: (int), name: start_day, start_month, start_year, end_day, end_month, end_year represent the period of time.
+            type: (int), name: page, 0 (default) returns the full result when it fits the token budget, otherwise a summary plus the first
+        page of the detail rows; 1, 2, ... returns that page of the detail rows (see "pagination" in the output).
         Output:
             type: (dict), meaning: a mapping for the beans yield within the specified period.
 
     """
     start_date = datetime(start_year, start_month, start_day)
     end_date = datetime(end_year, end_month, end_day)
-    end_date_exclusive = end_date + timedelta(days=1)
 
-    # 2. Query în harvest_logs pentru interval
-    logs_query = {
-        "date": {
-            "$gte": start_date,
-            "$lt": end_date_exclusive
-        }
-    }
+    view = await _single_crop_yield_view("beans", start_date, end_date, "get_beans_yield_for_a_specific_period")
+    return compact(view, "get_beans_yield_for_a_specific_period", page)
 
-    # collection_harvest_logs este sync (PyMongo / PyBase style) → nu folosim await
-    logs_cursor = collection_harvest_logs.find(logs_query)
+async def _load_weather_harvest_rows(start: datetime, end: datetime) -> list:
+    cursor = collection_weather().aggregate(
+        weather_harvest_pipeline(start, end, WEATHER_LOCATION or None),
+        maxTimeMS=QUERY_MAX_TIME_MS
+    )
+    return await cursor.to_list(None)
 
-    total_beans_kg = 0.0
-    total_beans_hectares = 0.0
-    daily_stats = []
-
-    for log in logs_cursor:
-        date_value = log.get("date")
-
-        beans_kg = float(log.get("beans_harvested_kg", 0) or 0)
-        beans_hectares = float(log.get("beans_harvested_hectares", 0) or 0)
-
-        # actualizăm totalurile pe toată perioada
-        total_beans_kg += beans_kg
-        total_beans_hectares += beans_hectares
+@mcp_harvest_agent.tool()
+@tool_timeout()
+async def get_weather_harvest_correlation(start_day: int, start_month: int, start_year: int,
+                                          end_day: int, end_month: int, end_year: int,
+                                          max_lag_days: int = 3, rolling_window_days: int = 7,
+                                          include_rolling_means: bool = False, page: int = 0) -> dict:
+    """
+        Tool description:
+            Tool used to find out how the temperature affects the daily yield of every crop and the fuel consumption over a period.
+        This tool joins the weather_logs and harvest_logs databases on the date and computes the statistics server-side.
+        Input:
+            type: (int), name: start_day, start_month, start_year, end_day, end_month, end_year represent the period of time (inclusive).
+            type: (int), name: max_lag_days, correlations are computed for weather leading the harvest by 0..max_lag_days days (default 3).
+            type: (int), name: rolling_window_days, size of the rolling means window in days (default 7).
+            type: (bool), name: include_rolling_means, whether to return the per-day rolling means (default False, they can be long).
+            type: (int), name: page, 0 (default) returns the full result when it fits the token budget, otherwise a summary plus the first
+        page of the detail rows; 1, 2, ... returns that page of the detail rows (see "pagination" in the output).
+        Output:
+            type: (dict), meaning: for each crop (yield in kg/hectare) and for fuel (liters/day): the correlation with the mean/max/min
+        temperature for each lag, and a linear regression on the mean temperature (slope per degree Celsius, intercept, r_squared).
+    """
+    if not 0 <= max_lag_days <= 30:
+        return {"error": "max_lag_days must be between 0 and 30"}
+    if not 1 <= rolling_window_days <= 90:
+        return {"error": "rolling_window_days must be between 1 and 90"}
 
-        # calculăm yield-ul pe zi, dacă avem hectare > 0
-        if beans_hectares > 0:
-            daily_yield = beans_kg / beans_hectares
-        else:
-            daily_yield = 0.0  # sau None, daca vrei să marchezi lipsa datelor
+    start_date = datetime(start_year, start_month, start_day)
+    end_date = datetime(end_year, end_month, end_day)
 
-        daily_stats.append({
-            "date": date_value.strftime("%Y-%m-%d") if date_value else None,
-            "beans_harvested_kg": beans_kg,
-            "beans_harvested_hectares": beans_hectares,
-            "beans_yield_kg_per_hectare": daily_yield
-        })
+    # Lagged correlations need the weather of the max_lag_days before the period
+    rows = await range_cache.get_rows(
+        "get_weather_harvest_correlation", "weather_harvest:daily", (WEATHER_LOGS, HARVEST_LOGS),
+        start_date - timedelta(days=max_lag_days), end_date + timedelta(days=1),
+        _load_weather_harvest_rows, params={"location": WEATHER_LOCATION}
+    )
 
-    # yield general pe toată perioada
-    if total_beans_hectares > 0:
-        overall_yield = total_beans_kg / total_beans_hectares
-    else:
-        overall_yield = 0.0
+    report = correlation_report(rows, max_lag_days=max_lag_days, rolling_window_days=rolling_window_days,
+                                window_start=start_date)
+    if not include_rolling_means:
+        report.pop("rolling_means", None)
 
-    return {
+    return compact({
         "start_date": start_date.strftime("%Y-%m-%d"),
         "end_date": end_date.strftime("%Y-%m-%d"),
-        "total_beans_harvested_kg": total_beans_kg,
-        "total_beans_harvested_hectares": total_beans_hectares,
-        "overall_beans_yield_kg_per_hectare": overall_yield,
-        "daily_stats": daily_stats
-    }
+        **report
+    }, "get_weather_harvest_correlation", page)
 
 @mcp_harvest_agent.tool()
-async def get_harvest_stats_with_a_specific_note(note: str) -> dict:
+@tool_timeout(30)
+async def get_harvest_stats_with_a_specific_note(note: str, page: int = 0) -> dict:
     """
         Tool description:
             Tool used to get harvest stats with a specific note(each day with a certain note). This tool queries the harvest_logs database, where the harvest data is stored.
         Input: 
             type: (str), name: note, representing the specific note to filter harvest stats.
+            type: (int), name: page, 0 (default) returns the full result when it fits the token budget, otherwise a summary plus the first
+        page of the detail rows; 1, 2, ... returns that page of the detail rows (see "pagination" in the output).
         Output:
             type: (dict), meaning: a mapping for the harvest stats that contain the specific note.
 
     """
     query = {"notes": note}  # câmpul tău în exemple e 'notes': "Normal", "Weekend", etc.
-    cursor = collection_harvest_logs.find(query)
+    cursor = collection_harvest_logs().find(query).max_time_ms(QUERY_MAX_TIME_MS)
 
     daily_stats = []
 
@@ -938,7 +953,7 @@ async def get_harvest_stats_with_a_specific_note(note: str) -> dict:
 
     total_days = 0
 
-    for log in cursor:
+    async for log in cursor:
         date_value = log.get("date")
 
         beans_kg = float(log.get("beans_harvested_kg", 0) or 0)
@@ -978,7 +993,7 @@ async def get_harvest_stats_with_a_specific_note(note: str) -> dict:
 
     total_all_crops_kg = total_beans_kg + total_sunflower_kg + total_tomatoes_kg + total_wheat_kg
 
-    return {
+    return compact({
         "note": note,
         "total_days_with_note": total_days,
         "total_harvested_kg": {
@@ -995,16 +1010,156 @@ async def get_harvest_stats_with_a_specific_note(note: str) -> dict:
             "wheat": total_wheat_hectares,
         },
         "daily_stats": daily_stats
-    }
+    }, "get_harvest_stats_with_a_specific_note", page)
+
+# Sections of get_farm_briefing, in the order they are returned
+BRIEFING_SECTIONS = ("weather_next_days", "weather_last_days", "payroll", "birthdays", "fuel_cost", "crop_yields")
+
+@mcp_briefing_agent.tool()
+@tool_timeout(30)
+async def get_farm_briefing(day: int, month: int, year: int, sections: list[str],
+                            horizon_days: int = 7, lookback_days: int = 7, crops: list[str] | None = None,
+                            yield_start_day: int | None = None, yield_start_month: int | None = None, yield_start_year: int | None = None,
+                            yield_end_day: int | None = None, yield_end_month: int | None = None, yield_end_year: int | None = None,
+                            page: int = 0) -> dict:
+    """
+        Tool description:
+            Tool used to answer a question that touches several farm domains at once (weather, payroll, fuel cost, crop yields)
+        in a SINGLE call. All requested sections are queried concurrently and returned together, so prefer it over calling
+        the specialist agents one by one for compound questions.
+
+        Input:
+            type: (int), name: day, month, year represents the reference date (usually today).
+            type: (list[str]), name: sections, any subset of:
+                "weather_next_days" - weather for the horizon_days after the reference date
+                "weather_last_days" - weather for the lookback_days ending on the reference date
+                "payroll"           - employees paid in the horizon_days starting on the reference date
+                "birthdays"         - employees with a birthday in the horizon_days starting on the reference date
+                "fuel_cost"         - fuel liters and cost for the lookback_days ending the day before the reference date
+                "crop_yields"       - yields for `crops` (default all) over the yield period
+            type: (int), name: horizon_days, number of days ahead (default 7).
+            type: (int), name: lookback_days, number of days back (default 7).
+            type: (list[str]), name: crops, crops for "crop_yields" ("wheat", "tomatoes", "sunflower", "beans"), default all.
+            type: (int), name: yield_start_day ... yield_end_year, the (inclusive) yield period; defaults to the fuel_cost period.
+            type: (int), name: page, 0 (default) returns the full result when it fits the token budget, otherwise a summary plus the first
+        page of the detail rows; 1, 2, ... returns that page of the detail rows (see "pagination" in the output).
 
-# npx @modelcontextprotocol/inspector
-# uvicorn mcp_server.mcp_tools:app --host 0.0.0.0 --port 8000
+        Output:
+            type: (dict), meaning: one entry per requested section, each with the same content as the dedicated tool
+        (or an "error" entry for that section only).
+    """
+    unknown = [section for section in sections if section not in BRIEFING_SECTIONS]
+    if unknown:
+        return {"error": f"Unknown sections: {', '.join(unknown)}. Available sections: {', '.join(BRIEFING_SECTIONS)}"}
+
+    reference = datetime(year, month, day)
+    yesterday = reference - timedelta(days=1)
+    lookback_start = reference - timedelta(days=lookback_days)
+
+    if yield_start_day and yield_start_month and yield_start_year:
+        yield_start = datetime(yield_start_year, yield_start_month, yield_start_day)
+    else:
+        yield_start = lookback_start
+    if yield_end_day and yield_end_month and yield_end_year:
+        yield_end = datetime(yield_end_year, yield_end_month, yield_end_day)
+    else:
+        yield_end = yesterday
+
+    # Sections are compacted together, on the briefing budget (page=None skips the per-tool compaction)
+    def run_section(section: str):
+        if section == "weather_next_days":
+            return get_weather_info_for_the_next_n_days(horizon_days, day, month, year, page=None)
+        if section == "weather_last_days":
+            return get_weather_info_for_last_n_days(lookback_days, day, month, year, page=None)
+        if section == "payroll":
+            return get_employees_paid_in_n_days_from_date(horizon_days, day, month, year)
+        if section == "birthdays":
+            return get_employees_bday_in_next_n_days_from_day_x(horizon_days, day, month, year)
+        if section == "fuel_cost":
+            return get_total_oil_price_for_a_period_of_time(lookback_start.day, lookback_start.month, lookback_start.year,
+                                                            yesterday.day, yesterday.month, yesterday.year)
+        return compute_crop_yields([crop.strip().lower() for crop in (crops or CROPS)], yield_start, yield_end,
+                                   tool="get_farm_briefing")
+
+    # Keep the requested order, run each section once, all of them concurrently
+    requested = [section for section in BRIEFING_SECTIONS if section in sections]
+    results = await asyncio.gather(*(run_section(section) for section in requested), return_exceptions=True)
+
+    briefing = {"reference_date": reference.strftime("%Y-%m-%d")}
+    for section, result in zip(requested, results):
+        if isinstance(result, Exception):
+            result = {"error": str(result)}
+        briefing[section] = result
+
+    return compact(briefing, "get_farm_briefing", page)
+
+# Tool groups by mount name; each one is served at /mcp/<name>/mcp (the URLs in agents/tools.py)
+MCP_SERVERS = {
+    "mcp_weather_agent": mcp_weather_agent,
+    "mcp_vehicles_agent": mcp_vehicles_agent,
+    "mcp_employees_agent": mcp_employees_agent,
+    "mcp_harvest_agent": mcp_harvest_agent,
+    "mcp_briefing_agent": mcp_briefing_agent,
+}
+
+def create_app(groups: list[str] | None = None) -> FastAPI:
+    """
+    Single MCP host: every tool group is mounted on one FastAPI app and shares
+    the process-wide Motor pool and range cache. The lifespan runs the session
+    managers of the mounted groups, warms the DB pool and closes it on shutdown.
+    """
+    selected = {name: MCP_SERVERS[name] for name in (groups or MCP_SERVERS)}
+
+    @contextlib.asynccontextmanager
+    async def lifespan(app: FastAPI):
+        async with contextlib.AsyncExitStack() as stack:
+            for server in selected.values():
+                await stack.enter_async_context(server.session_manager.run())
+
+            try:
+                await ping()
+            except Exception as e:
+                logger.warning(f"MongoDB not reachable at startup, tools will retry on first use: {e}")
+
+            yield
+        close_client()
+
+    app = FastAPI(lifespan=lifespan)
+
+    # Add CORS middleware to the main FastAPI app
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],  # Allow all origins for development
+        allow_credentials=True,
+        allow_methods=["*"],  # Allow all methods including OPTIONS
+        allow_headers=["*"],
+    )
+
+    @app.get("/health")
+    async def health() -> dict:
+        """Mounted tool groups and database reachability"""
+        try:
+            database = await asyncio.wait_for(ping(), timeout=2)
+        except Exception:
+            database = False
+        return {"status": "ok", "groups": list(selected), "database": database}
+
+    @app.get("/cache/stats")
+    async def get_cache_stats() -> dict:
+        """Hit ratios of the shared range-query cache, per tool"""
+        return range_cache.stats()
 
-# ====== Mount the 3 servers ======
-asyncio.gather(mcp_weather_agent.run_streamable_http_async(), mcp_vehicles_agent.run_streamable_http_async(), 
-mcp_employees_agent.run_streamable_http_async(),mcp_harvest_agent.run_streamable_http_async())
+    @app.get("/compaction/stats")
+    async def get_compaction_stats() -> dict:
+        """Estimated tokens returned to the agents before and after compaction, per tool"""
+        return compaction_stats()
 
-app.mount("/mcp/mcp_weather_agent", mcp_weather_agent.streamable_http_app())
-app.mount("/mcp/mcp_vehicles_agent", mcp_vehicles_agent.streamable_http_app())
-app.mount("/mcp/mcp_employees_agent", mcp_employees_agent.streamable_http_app())
-app.mount("/mcp/mcp_harvest_agent", mcp_harvest_agent.streamable_http_app())
\ No newline at end of file
+    for name, server in selected.items():
+        app.mount(f"/mcp/{name}", server.streamable_http_app())
+
+    return app
+
+# npx @modelcontextprotocol/inspector
+# uvicorn mcp_server.mcp_tools:app --host 0.0.0.0 --port 8000
+# MCP_GROUPS=mcp_weather_agent,mcp_harvest_agent serves only those groups
+app = create_app([name.strip() for name in os.getenv("MCP_GROUPS", "").split(",") if name.strip()])
@@ -0,0 +1,184 @@
+"""Process-pool batch OCR engine"""
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional
+
+
+# One processor per worker process, created by _init_worker and reused for every document
+_worker_processor = None
+
+
+def _init_worker(processor_factory: Callable[[Optional[str]], Any], tesseract_path: Optional[str], warm_up: bool):
+    """Build the worker's processor once (extractors, compiled patterns) and let it load Tesseract"""
+    global _worker_processor
+    _worker_processor = processor_factory(tesseract_path)
+
+    if warm_up and hasattr(_worker_processor, 'warm_up'):
+        try:
+            _worker_processor.warm_up()
+        except Exception:
+            # A broken OCR setup surfaces again, with a proper error, on the first document
+            pass
+
+
+def _process_in_worker(file_path: str, document_type: str) -> Dict[str, Any]:
+    start = time.perf_counter()
+    result = _worker_processor.process_document(file_path, document_type)
+    result['seconds'] = round(time.perf_counter() - start, 4)
+    result['worker_pid'] = os.getpid()
+    return result
+
+
+@dataclass
+class BatchStats:
+    """Throughput of one batch"""
+    documents: int = 0
+    failed: int = 0
+    pages: int = 0
+    seconds: float = 0.0
+    worker_seconds: float = 0.0
+    workers: int = 0
+    # Largest peak_page_bytes of a single document
+    peak_page_bytes: int = 0
+    per_worker: Dict[int, int] = field(default_factory=dict)
+
+    @property
+    def pages_per_second(self) -> float:
+        return self.pages / self.seconds if self.seconds else 0.0
+
+    @property
+    def documents_per_second(self) -> float:
+        return self.documents / self.seconds if self.seconds else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            'documents': self.documents,
+            'failed': self.failed,
+            'pages': self.pages,
+            'seconds': round(self.seconds, 3),
+            'worker_seconds': round(self.worker_seconds, 3),
+            'workers': self.workers,
+            'peak_page_bytes': self.peak_page_bytes,
+            'per_worker': dict(self.per_worker),
+            'pages_per_second': round(self.pages_per_second, 3),
+            'documents_per_second': round(self.documents_per_second, 3),
+        }
+
+
+class BatchOCREngine:
+    """Fan documents out over a process pool, one warmed processor per worker"""
+
+    def __init__(
+        self,
+        processor_factory: Callable[[Optional[str]], Any],
+        tesseract_path: Optional[str] = None,
+        max_workers: Optional[int] = None,
+        max_pending: Optional[int] = None,
+        warm_up: bool = True
+    ):
+        """
+        Initialize batch engine
+
+        Args:
+            processor_factory: Picklable callable building a processor from a Tesseract path
+                (e.g. the AIProcessor class); it must provide process_document(file_path, document_type)
+            tesseract_path: Optional path to Tesseract executable
+            max_workers: Worker processes (default: CPU count)
+            max_pending: Documents submitted but not yet collected (default: 2 per worker);
+                the input is only read as fast as results are consumed
+            warm_up: Load Tesseract in every worker before the first document
+        """
+        self.processor_factory = processor_factory
+        self.tesseract_path = tesseract_path
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_pending = max(1, max_pending or 2 * self.max_workers)
+        self.warm_up = warm_up
+        self.stats = BatchStats(workers=self.max_workers)
+
+    def iter_process(self, documents: Iterable[Dict[str, str]]) -> Iterator[Dict[str, Any]]:
+        """
+        Process documents and yield each result as soon as it is ready
+
+        Args:
+            documents: Iterable of dicts with 'file_path' and 'document_type';
+                consumed lazily, so it can be a generator over a large upload folder
+
+        Yields:
+            Processing result with 'file_path' and 'index' (position in the input),
+            in completion order
+        """
+        self.stats = BatchStats(workers=self.max_workers)
+        start = time.perf_counter()
+        pending: Dict[Future, tuple] = {}
+        source = enumerate(documents)
+
+        with ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            initializer=_init_worker,
+            initargs=(self.processor_factory, self.tesseract_path, self.warm_up)
+        ) as pool:
+            exhausted = False
+            while pending or not exhausted:
+                # Top the queue up to max_pending
+                while not exhausted and len(pending) < self.max_pending:
+                    try:
+                        index, doc = next(source)
+                    except StopIteration:
+                        exhausted = True
+                        break
+
+                    file_path = doc.get('file_path')
+                    doc_type = doc.get('document_type')
+                    if not file_path or not doc_type:
+                        yield self._record({
+                            'success': False,
+                            'error': 'Missing file_path or document_type',
+                        }, index, file_path, start)
+                        continue
+                    pending[pool.submit(_process_in_worker, file_path, doc_type)] = (index, file_path)
+
+                if not pending:
+                    continue
+
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index, file_path = pending.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        # Worker crash (e.g. killed by the OOM killer); the document is reported, not lost
+                        result = {'success': False, 'error': f'OCR worker failed: {e}', 'data': None}
+                    yield self._record(result, index, file_path, start)
+
+    def process(self, documents: Iterable[Dict[str, str]]) -> list[Dict[str, Any]]:
+        """
+        Process documents and return the results in input order
+
+        Args:
+            documents: Iterable of dicts with 'file_path' and 'document_type'
+
+        Returns:
+            List of processing results
+        """
+        results = sorted(self.iter_process(documents), key=lambda result: result['index'])
+        for result in results:
+            del result['index']
+        return results
+
+    def _record(self, result: Dict[str, Any], index: int, file_path: Optional[str], start: float) -> Dict[str, Any]:
+        result['file_path'] = file_path
+        result['index'] = index
+
+        self.stats.documents += 1
+        if not result.get('success'):
+            self.stats.failed += 1
+        data = result.get('data') or {}
+        self.stats.pages += data.get('page_count', 0) or 0
+        self.stats.peak_page_bytes = max(self.stats.peak_page_bytes, data.get('peak_page_bytes', 0) or 0)
+        self.stats.worker_seconds += result.get('seconds', 0.0)
+        if 'worker_pid' in result:
+            self.stats.per_worker[result['worker_pid']] = self.stats.per_worker.get(result['worker_pid'], 0) + 1
+        self.stats.seconds = time.perf_counter() - start
+        return result
@@ -0,0 +1,173 @@
+"""Content-addressed OCR result cache"""
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+
+# Bump when the stored result layout changes: every older entry stops matching
+CACHE_FORMAT_VERSION = 1
+
+DEFAULT_CACHE_PATH = Path.home() / '.cache' / 'farmer_assessment' / 'ocr_cache.sqlite3'
+
+
+def file_sha256(file_path: str, chunk_size: int = 1 << 20) -> str:
+    """SHA-256 of the file bytes, read in chunks"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class OCRCache:
+    """
+    OCR results on disk (SQLite), keyed by the SHA-256 of the document bytes
+    plus every parameter that changes the result: document type, OCR language,
+    DPI, preprocessing and extractor versions. Re-uploading the same scan is a
+    hash and one lookup instead of a full OCR; changing an extractor (its
+    version) makes its old entries unreachable, and they age out.
+
+    The file is bounded by max_bytes: least recently used entries are evicted
+    first. Safe to share between processes (one connection per process, WAL).
+    """
+
+    def __init__(self, path: Optional[str] = None, max_bytes: int = 256 * 1024 * 1024):
+        """
+        Initialize OCR cache
+
+        Args:
+            path: SQLite file (default: ~/.cache/farmer_assessment/ocr_cache.sqlite3)
+            max_bytes: Upper bound for the stored results
+        """
+        self.path = Path(path) if path else DEFAULT_CACHE_PATH
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+        self._connection: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+
+    @classmethod
+    def from_env(cls) -> Optional['OCRCache']:
+        """Cache configured by OCR_CACHE_ENABLED, OCR_CACHE_PATH and OCR_CACHE_MAX_MB (None when disabled)"""
+        if os.getenv('OCR_CACHE_ENABLED', 'true').lower() not in ('1', 'true', 'yes'):
+            return None
+        return cls(
+            path=os.getenv('OCR_CACHE_PATH') or None,
+            max_bytes=int(float(os.getenv('OCR_CACHE_MAX_MB', '256')) * 1024 * 1024)
+        )
+
+    @staticmethod
+    def make_key(file_hash: str, params: Dict[str, Any]) -> str:
+        """
+        Cache key of a document
+
+        Args:
+            file_hash: SHA-256 of the file bytes
+            params: OCR parameters and versions the result depends on
+
+        Returns:
+            Hex digest identifying (content, parameters)
+        """
+        material = json.dumps(
+            {'file': file_hash, 'format': CACHE_FORMAT_VERSION, **params},
+            sort_keys=True,
+            default=str
+        )
+        return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Cached result, or None"""
+        connection = self._connect()
+        row = connection.execute('SELECT result FROM ocr_results WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+
+        connection.execute(
+            'UPDATE ocr_results SET last_access = ?, hits = hits + 1 WHERE key = ?',
+            (time.time(), key)
+        )
+        connection.commit()
+        self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, key: str, result: Dict[str, Any]) -> None:
+        """Store a result and evict the least recently used entries beyond max_bytes"""
+        payload = json.dumps(result, ensure_ascii=False, default=str)
+        size = len(payload.encode('utf-8'))
+        if size > self.max_bytes:
+            return
+
+        now = time.time()
+        connection = self._connect()
+        connection.execute(
+            'INSERT OR REPLACE INTO ocr_results (key, result, size, created_at, last_access, hits) '
+            'VALUES (?, ?, ?, ?, ?, 0)',
+            (key, payload, size, now, now)
+        )
+        self._evict(connection)
+        connection.commit()
+
+    def clear(self) -> None:
+        """Drop every entry"""
+        connection = self._connect()
+        connection.execute('DELETE FROM ocr_results')
+        connection.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """Entries, stored bytes and the hit rate of this process"""
+        entries, stored = self._connect().execute(
+            'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM ocr_results'
+        ).fetchone()
+        lookups = self.hits + self.misses
+        return {
+            'path': str(self.path),
+            'entries': entries,
+            'bytes': stored,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0
+        }
+
+    def _evict(self, connection: sqlite3.Connection) -> None:
+        total = connection.execute('SELECT COALESCE(SUM(size), 0) FROM ocr_results').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        # Evict down to 90% so a full cache does not evict on every insert
+        target = int(self.max_bytes * 0.9)
+        freed = 0
+        victims = []
+        for key, size in connection.execute('SELECT key, size FROM ocr_results ORDER BY last_access'):
+            if total - freed <= target:
+                break
+            victims.append((key,))
+            freed += size
+        connection.executemany('DELETE FROM ocr_results WHERE key = ?', victims)
+
+    def _connect(self) -> sqlite3.Connection:
+        # A connection must not cross a fork (batch workers open their own)
+        if self._connection is not None and self._pid == os.getpid():
+            return self._connection
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(str(self.path), timeout=30)
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute('PRAGMA synchronous=NORMAL')
+        connection.execute(
+            'CREATE TABLE IF NOT EXISTS ocr_results ('
+            'key TEXT PRIMARY KEY, result TEXT NOT NULL, size INTEGER NOT NULL, '
+            'created_at REAL NOT NULL, last_access REAL NOT NULL, hits INTEGER NOT NULL DEFAULT 0)'
+        )
+        connection.execute('CREATE INDEX IF NOT EXISTS ocr_results_last_access ON ocr_results (last_access)')
+        connection.commit()
+
+        self._connection = connection
+        self._pid = os.getpid()
+        return connection
@@ -7,6 +7,11 @@ from .document_processor import DocumentProcessor
 class CertificateExtractor(DocumentProcessor):
     """Extract data from agricultural certificates"""
     
+    extractor_version = 2
+    
+    # Multi-page documents: OCR stops at the page where these are all read
+    required_fields = ('certificate_number', 'holder_name', 'holder_cnp', 'valid_until')
+    
     def __init__(self, tesseract_path: Optional[str] = None):
         super().__init__(tesseract_path)
         
@@ -34,7 +39,7 @@ class CertificateExtractor(DocumentProcessor):
             Dictionary with extracted certificate data
         """
         # Process document with OCR
-        ocr_result = self.process_document(file_path, lang='ron+eng')
+        ocr_result = self.process_document(file_path, lang='ron+eng', stop_when=self.early_exit_check())
         text = ocr_result['text']
         
         # Clean text
@@ -63,7 +68,10 @@ class CertificateExtractor(DocumentProcessor):
             'document_type': 'CERTIFICATE',
             'confidence': ocr_result['confidence'],
             'extracted_data': extracted_data,
-            'raw_text': cleaned_text
+            'raw_text': cleaned_text,
+            'page_count': ocr_result['page_count'],
+            'peak_page_bytes': ocr_result['peak_page_bytes'],
+            'early_exit': ocr_result['early_exit']
         }
     
     @staticmethod
@@ -1,12 +1,28 @@
 """CNI (Identity Card) document extractor"""
 import re
+from datetime import datetime
 from typing import Dict, Any, Optional
 from .document_processor import DocumentProcessor
+from .layouts import CNI_LAYOUT
+from .mrz import MRZ_CHARS, find_mrz, mrz_form, parse_mrz
 
 
 class CNIExtractor(DocumentProcessor):
     """Extract data from Romanian Identity Cards (CNI)"""
     
+    extractor_version = 3
+    
+    # ROI mode reads these from the MRZ and the layout regions, then stops
+    layout = CNI_LAYOUT
+    required_fields = CNI_LAYOUT.required
+    
+    # Read from their regions once the required fields are in (one crop each)
+    roi_optional_fields = ('address', 'issued_by')
+    
+    # The MRZ spells these without diacritics: their regions are read as well
+    # and win when they spell the same name
+    mrz_ascii_fields = ('last_name', 'first_name')
+    
     def __init__(self, tesseract_path: Optional[str] = None):
         super().__init__(tesseract_path)
         
@@ -35,8 +51,13 @@ class CNIExtractor(DocumentProcessor):
         Returns:
             Dictionary with extracted CNI data
         """
-        # Process document with OCR
-        ocr_result = self.process_document(file_path, lang='ron+eng')
+        if self.ocr_mode == 'roi':
+            result = self._extract_cni_roi(file_path)
+            if result is not None:
+                return result
+        
+        # Full-page OCR: ROI mode is off, or the regions did not yield every required field
+        ocr_result = self.process_document(file_path, lang='ron+eng', stop_when=self.early_exit_check())
         text = ocr_result['text']
         
         # Clean text
@@ -57,6 +78,7 @@ class CNIExtractor(DocumentProcessor):
         if extracted_data.get('cnp'):
             cnp_info = self._parse_cnp(extracted_data['cnp'])
             extracted_data.update(cnp_info)
+            extracted_data['cnp_valid'] = self.is_valid_cnp(extracted_data['cnp'])
         
         # Standardize date formats
         if extracted_data.get('birth_date'):
@@ -69,9 +91,145 @@ class CNIExtractor(DocumentProcessor):
             'document_type': 'CNI',
             'confidence': ocr_result['confidence'],
             'extracted_data': extracted_data,
-            'raw_text': cleaned_text
+            'raw_text': cleaned_text,
+            'page_count': ocr_result['page_count'],
+            'peak_page_bytes': ocr_result['peak_page_bytes'],
+            'early_exit': ocr_result['early_exit'],
+            'ocr_mode': 'full'
         }
     
+    def _extract_cni_roi(self, file_path: str) -> Optional[Dict[str, Any]]:
+        """
+        Read the card from its MRZ and field regions only
+        
+        The MRZ is OCR'd first: its check digits validate the series and
+        number, the birth and expiry dates and, with the CNP digits it
+        carries, the whole CNP. Layout regions are then OCR'd one at a time,
+        only for required fields still missing, until all of them are valid;
+        the name regions are always read, since the MRZ names have no
+        diacritics. A second pass reads the optional fields.
+        
+        Args:
+            file_path: Path to CNI document
+            
+        Returns:
+            Result in the layout of extract_cni_data, or None when a required
+            field could not be read (the caller falls back to full-page OCR)
+        """
+        stats: Dict[str, Any] = {}
+        pages = self.iter_pages(file_path, stats)
+        # The card front is the first page; the others are never rasterized
+        image = next(pages, None)
+        pages.close()
+        if image is None:
+            return None
+        
+        data: Dict[str, Any] = {}
+        texts = []
+        confidences = []
+        regions_read = 0
+        
+        mrz_box = find_mrz(image)
+        if mrz_box is not None:
+            text, confidence = self.extract_text_from_region(image, mrz_box, lang='eng', psm=6, whitelist=MRZ_CHARS)
+            regions_read += 1
+            mrz = parse_mrz(text)
+            if mrz is not None:
+                texts.append(mrz['mrz'])
+                confidences.append(confidence)
+                for field, value in mrz.items():
+                    if self._field_is_valid(field, value):
+                        data[field] = value
+        
+        mrz_fields = set(data)
+        mrz_names = {field: data.pop(field) for field in self.mrz_ascii_fields if field in data}
+        card_box = self.layout.card_box(image.shape, mrz_box)
+        if card_box is not None:
+            for wanted in (self.layout.required, self.roi_optional_fields):
+                for region in self.layout.regions:
+                    if not any(field in wanted and field not in data for field in region.fields):
+                        continue
+                    
+                    text, confidence = self.extract_text_from_region(
+                        image,
+                        self.layout.region_box(card_box, region),
+                        psm=region.psm,
+                        whitelist=region.whitelist
+                    )
+                    regions_read += 1
+                    texts.append(text)
+                    confidences.append(confidence)
+                    
+                    match = re.search(region.pattern, text)
+                    for field, value in (match.groupdict() if match else {}).items():
+                        value = self._normalize_field(field, value)
+                        if field in mrz_names and mrz_form(value or '') != mrz_form(mrz_names[field]):
+                            # Misread, or not the name the check digits vouch for
+                            continue
+                        if field not in data and self._field_is_valid(field, value):
+                            data[field] = value
+                    
+                    # Early exit: nothing left to read in this pass
+                    if all(field in data for field in wanted):
+                        break
+                
+                for field, value in mrz_names.items():
+                    data.setdefault(field, value)
+                if any(field not in data for field in self.layout.required):
+                    return None
+        else:
+            data.update(mrz_names)
+            if any(field not in data for field in self.layout.required):
+                return None
+        
+        extracted_data: Dict[str, Any] = {field: None for field in self.patterns}
+        extracted_data.update({field: value for field, value in data.items() if field in self.patterns})
+        extracted_data.update(self._parse_cnp(data['cnp']))
+        extracted_data['cnp_valid'] = True
+        
+        return {
+            'document_type': 'CNI',
+            'confidence': sum(confidences) / len(confidences) if confidences else 0.0,
+            'extracted_data': extracted_data,
+            'raw_text': self.clean_text(' '.join(texts)),
+            'page_count': stats['pages'],
+            'peak_page_bytes': stats['peak_page_bytes'],
+            'early_exit': True,
+            'ocr_mode': 'mrz' if set(self.layout.required) <= mrz_fields else 'roi',
+            'regions_read': regions_read
+        }
+    
+    def _normalize_field(self, field: str, value: Optional[str]) -> Optional[str]:
+        """Region text to the format of the MRZ fields"""
+        if value is None:
+            return None
+        value = re.sub(r'\s+', ' ', value).strip()
+        if field == 'cnp':
+            return re.sub(r'\D', '', value)
+        if field in ('birth_date', 'valid_until'):
+            return self._standardize_date(value)
+        return value
+    
+    def _field_is_valid(self, field: str, value: Any) -> bool:
+        """Whether a field read from the MRZ or a region can be trusted"""
+        if not value or not isinstance(value, str):
+            return False
+        if field == 'cnp':
+            return self.is_valid_cnp(value)
+        if field == 'series':
+            return bool(re.fullmatch(r'[A-Z]{2}', value))
+        if field == 'number':
+            return bool(re.fullmatch(r'\d{6}', value))
+        if field in ('birth_date', 'valid_until'):
+            try:
+                datetime.strptime(value, '%Y-%m-%d')
+                return True
+            except ValueError:
+                return False
+        if field in ('last_name', 'first_name'):
+            return len(value.replace(' ', '').replace('-', '')) >= 2
+        return field in self.patterns
+    
     @staticmethod
     def _parse_cnp(cnp: str) -> Dict[str, Any]:
         """
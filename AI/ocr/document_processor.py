@@ -1,17 +1,57 @@
 """Base document processor with OCR capabilities"""
+import os
 import cv2
 import numpy as np
 from PIL import Image
 import pytesseract
-from pdf2image import convert_from_path
+from pdf2image import convert_from_path, pdfinfo_from_path
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Iterator, Callable, Tuple
 import re
 
+from .engine import OCREngine, OCRResult, get_engine
+from .preprocessing import PREPROCESSING_PROFILE, get_preprocessing_profile, preprocess
+
+
+_PAGE_SIZE = re.compile(r'([\d.]+)\s*x\s*([\d.]+)\s*pts')
+
+_CNP_WEIGHTS = (2, 7, 9, 1, 4, 6, 3, 5, 8, 2, 7, 9)
+
 
 class DocumentProcessor:
     """Base class for OCR document processing"""
     
+    # Part of the OCR cache key (ocr.cache): bump preprocessing_version when
+    # preprocess_image changes, extractor_version in an extractor when its
+    # patterns or post-processing change - cached results then stop matching
+    preprocessing_version = 2
+    extractor_version = 1
+    
+    # Preprocessing profile (ocr.preprocessing): 'quality', 'balanced' or 'fast'
+    preprocessing_profile = PREPROCESSING_PROFILE
+    
+    # Rasterization resolution of PDF pages
+    pdf_dpi = 300
+    
+    # PDFs are rasterized lazily, this many pages per pdf2image call
+    pdf_page_batch = 1
+    
+    # Adaptive DPI: pages larger than A4 (A3 plans, land registry extracts) are
+    # rasterized at a lower DPI so their longest side stays within
+    # max_page_side_px, but never below pdf_min_dpi
+    adaptive_dpi = True
+    max_page_side_px = 3508
+    pdf_min_dpi = 150
+    
+    # Early exit: 'roi' stops OCR as soon as every field in required_fields
+    # has been read (and, for CNPs, passes the checksum); 'full' always OCRs
+    # every page (OCR_MODE sets the default)
+    ocr_mode = os.getenv('OCR_MODE', 'roi').lower()
+    required_fields: Tuple[str, ...] = ()
+    
+    # Region crops smaller than this (text line height, px) are upscaled for Tesseract
+    min_region_height = 48
+    
     def __init__(self, tesseract_path: Optional[str] = None):
         """
         Initialize document processor
@@ -23,40 +63,32 @@ class DocumentProcessor:
             pytesseract.pytesseract.tesseract_cmd = tesseract_path
         
         self.supported_extensions = {'.pdf', '.jpg', '.jpeg', '.png', '.tiff', '.bmp'}
+        
+        # Stages of the last preprocess_image call (scale, noise estimate, denoiser)
+        self.last_preprocessing: Dict[str, Any] = {}
+    
+    @property
+    def engine(self) -> OCREngine:
+        """OCR engine shared by every processor of this process (ocr.engine)"""
+        return get_engine()
     
     def preprocess_image(self, image: np.ndarray) -> np.ndarray:
         """
         Preprocess image for better OCR results
         
+        Stages are chosen by the preprocessing profile: pages are downscaled
+        to an OCR-friendly resolution, and only noisy pages are denoised.
+        
         Args:
             image: Input image as numpy array
             
         Returns:
             Preprocessed image
         """
-        # Convert to grayscale
-        if len(image.shape) == 3:
-            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-        else:
-            gray = image
-        
-        # Apply denoising
-        denoised = cv2.fastNlMeansDenoising(gray)
-        
-        # Apply adaptive thresholding
-        binary = cv2.adaptiveThreshold(
-            denoised,
-            255,
-            cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
-            cv2.THRESH_BINARY,
-            11,
-            2
+        processed, self.last_preprocessing = preprocess(
+            image,
+            get_preprocessing_profile(self.preprocessing_profile)
         )
-        
-        # Apply dilation and erosion to remove noise
-        kernel = np.ones((1, 1), np.uint8)
-        processed = cv2.morphologyEx(binary, cv2.MORPH_CLOSE, kernel)
-        
         return processed
     
     def extract_text_from_image(
@@ -74,31 +106,67 @@ class DocumentProcessor:
         Returns:
             Tuple of (extracted_text, confidence_score)
         """
-        # Preprocess image
-        processed = self.preprocess_image(image)
+        result = self.ocr_page(image, lang)
+        return ' '.join(word.text for word in result.words), result.confidence
+    
+    def ocr_page(self, image: np.ndarray, lang: str = 'ron+eng') -> OCRResult:
+        """
+        Preprocess and OCR a page in one engine pass
         
-        # Perform OCR with confidence data
-        data = pytesseract.image_to_data(
-            processed,
-            lang=lang,
-            output_type=pytesseract.Output.DICT
-        )
+        Args:
+            image: Input image
+            lang: Language for OCR (default: Romanian + English)
+            
+        Returns:
+            Words with boxes and confidences, grouped into lines
+        """
+        return self.engine.recognize(self.preprocess_image(image), lang=lang)
+    
+    def extract_text_from_region(
+        self,
+        image: np.ndarray,
+        box: Tuple[int, int, int, int],
+        lang: str = 'ron+eng',
+        psm: int = 7,
+        whitelist: Optional[str] = None
+    ) -> tuple[str, float]:
+        """
+        Extract text from one region of an image
         
-        # Extract text and calculate average confidence
-        text_parts = []
-        confidences = []
+        The crop is only binarized (Otsu), not denoised: it is small and the
+        fields are printed text. Lines are kept, words are joined by spaces.
         
-        for i, word in enumerate(data['text']):
-            if word.strip():
-                text_parts.append(word)
-                conf = float(data['conf'][i])
-                if conf > 0:  # Only include valid confidence scores
-                    confidences.append(conf)
+        Args:
+            image: Page image
+            box: Region (x0, y0, x1, y1) in pixels
+            lang: Language for OCR
+            psm: Tesseract page segmentation mode (7 = one line, 6 = block)
+            whitelist: Optional characters Tesseract may output
+            
+        Returns:
+            Tuple of (extracted_text, confidence_score)
+        """
+        x0, y0, x1, y1 = box
+        crop = image[max(0, y0):max(0, y1), max(0, x0):max(0, x1)]
+        if crop.size == 0:
+            return '', 0.0
         
-        text = ' '.join(text_parts)
-        avg_confidence = sum(confidences) / len(confidences) if confidences else 0.0
+        if len(crop.shape) == 3:
+            crop = cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY)
         
-        return text, avg_confidence / 100  # Normalize to 0-1
+        if crop.shape[0] < self.min_region_height:
+            factor = self.min_region_height / crop.shape[0]
+            crop = cv2.resize(crop, None, fx=factor, fy=factor, interpolation=cv2.INTER_CUBIC)
+        
+        _, binary = cv2.threshold(crop, 0, 255, cv2.THRESH_BINARY | cv2.THRESH_OTSU)
+        
+        result = self.engine.recognize(
+            binary,
+            lang=lang,
+            psm=psm,
+            whitelist=whitelist.replace(' ', '') if whitelist else None
+        )
+        return result.text, result.confidence
     
     def load_document(self, file_path: str) -> List[np.ndarray]:
         """
@@ -110,6 +178,23 @@ class DocumentProcessor:
         Returns:
             List of images (one per page)
         """
+        return list(self.iter_pages(file_path))
+    
+    def iter_pages(self, file_path: str, stats: Optional[Dict[str, Any]] = None) -> Iterator[np.ndarray]:
+        """
+        Load document page by page
+        
+        PDF pages are rasterized pdf_page_batch at a time (first_page/last_page),
+        so only the pages being OCR'd are in memory, never the whole document.
+        
+        Args:
+            file_path: Path to document file
+            stats: Optional dictionary filled with 'pages', 'dpi' (per page) and
+                'peak_page_bytes' (most decoded pixel bytes held at once)
+            
+        Yields:
+            One image per page
+        """
         path = Path(file_path)
         
         if not path.exists():
@@ -118,26 +203,94 @@ class DocumentProcessor:
         if path.suffix.lower() not in self.supported_extensions:
             raise ValueError(f"Unsupported file type: {path.suffix}")
         
-        images = []
+        if stats is None:
+            stats = {}
+        stats.update({'pages': 0, 'dpi': [], 'peak_page_bytes': 0})
         
-        if path.suffix.lower() == '.pdf':
-            # Convert PDF to images
-            pil_images = convert_from_path(str(path), dpi=300)
-            for pil_img in pil_images:
-                images.append(np.array(pil_img))
-        else:
+        if path.suffix.lower() != '.pdf':
             # Load image directly
             img = cv2.imread(str(path))
             if img is None:
                 raise ValueError(f"Failed to load image: {file_path}")
-            images.append(img)
+            stats.update({'pages': 1, 'peak_page_bytes': img.nbytes})
+            yield img
+            return
+        
+        page_dpis = self._page_dpis(str(path))
+        batch = max(1, self.pdf_page_batch)
+        
+        for first in range(1, len(page_dpis) + 1, batch):
+            last = min(first + batch - 1, len(page_dpis))
+            # A batch is rendered at one DPI, the lowest of its pages
+            dpi = min(page_dpis[first - 1:last])
+            pil_images = convert_from_path(str(path), dpi=dpi, first_page=first, last_page=last)
+            
+            while pil_images:
+                pil_img = pil_images.pop(0)
+                image = np.array(pil_img)
+                pil_img.close()
+                
+                held = image.nbytes + sum(img.width * img.height * len(img.getbands()) for img in pil_images)
+                stats['peak_page_bytes'] = max(stats['peak_page_bytes'], held)
+                stats['pages'] += 1
+                stats['dpi'].append(dpi)
+                
+                yield image
+                # The caller is done with the page: nothing here keeps it alive
+                del image
+    
+    def _page_dpis(self, pdf_path: str) -> List[int]:
+        """Rasterization DPI of every page of a PDF"""
+        info = pdfinfo_from_path(pdf_path)
+        page_count = int(info.get('Pages', 0))
+        if not self.adaptive_dpi or page_count == 0:
+            return [self.pdf_dpi] * page_count
         
-        return images
+        # Without a page range pdfinfo only reports the size of the first page
+        sizes = pdfinfo_from_path(pdf_path, first_page=1, last_page=page_count)
+        dpis = []
+        for number in range(1, page_count + 1):
+            size = next((value for key, value in sizes.items()
+                         if re.fullmatch(rf'Page\s+{number} size', key)), None) or info.get('Page size', '')
+            match = _PAGE_SIZE.search(str(size))
+            dpis.append(self._adaptive_dpi(float(match.group(1)), float(match.group(2))) if match else self.pdf_dpi)
+        return dpis
+    
+    def _adaptive_dpi(self, width_pts: float, height_pts: float) -> int:
+        """DPI keeping the longest side of a page within max_page_side_px"""
+        longest_inches = max(width_pts, height_pts) / 72
+        if longest_inches <= 0:
+            return self.pdf_dpi
+        dpi = int(self.max_page_side_px / longest_inches)
+        return max(self.pdf_min_dpi, min(self.pdf_dpi, dpi))
+    
+    def ocr_params(self, lang: str = 'ron+eng') -> Dict[str, Any]:
+        """
+        Parameters an OCR result depends on (besides the document bytes)
+        
+        Args:
+            lang: Language for OCR
+            
+        Returns:
+            Dictionary used in the OCR cache key
+        """
+        return {
+            'extractor': type(self).__name__,
+            'extractor_version': self.extractor_version,
+            'preprocessing_version': self.preprocessing_version,
+            'preprocessing_profile': self.preprocessing_profile,
+            'ocr_engine': self.engine.name,
+            'lang': lang,
+            'dpi': self.pdf_dpi,
+            'adaptive_dpi': self.adaptive_dpi and (self.max_page_side_px, self.pdf_min_dpi),
+            'ocr_mode': self.ocr_mode
+        }
     
     def process_document(
         self,
         file_path: str,
-        lang: str = 'ron+eng'
+        lang: str = 'ron+eng',
+        stop_when: Optional[Callable[[str], bool]] = None
     ) -> Dict[str, Any]:
         """
         Process document and extract text
@@ -145,19 +298,29 @@ class DocumentProcessor:
         Args:
             file_path: Path to document
             lang: Language for OCR
+            stop_when: Optional check of the text read so far; when it returns
+                True the remaining pages are neither rasterized nor OCR'd
             
         Returns:
             Dictionary with extracted data
         """
-        images = self.load_document(file_path)
-        
         all_text = []
         all_confidences = []
+        stats: Dict[str, Any] = {}
+        early_exit = False
         
-        for image in images:
+        # Pages are streamed: each one is released once it has been OCR'd
+        pages = self.iter_pages(file_path, stats)
+        for image in pages:
             text, confidence = self.extract_text_from_image(image, lang)
             all_text.append(text)
             all_confidences.append(confidence)
+            del image
+            
+            if stop_when is not None and stop_when('\n'.join(all_text)):
+                early_exit = True
+                pages.close()
+                break
         
         combined_text = '\n'.join(all_text)
         avg_confidence = sum(all_confidences) / len(all_confidences) if all_confidences else 0.0
@@ -165,10 +328,61 @@ class DocumentProcessor:
         return {
             'text': combined_text,
             'confidence': avg_confidence,
-            'page_count': len(images),
+            'page_count': stats['pages'],
+            'dpi': stats['dpi'],
+            'peak_page_bytes': stats['peak_page_bytes'],
+            'early_exit': early_exit,
             'file_path': file_path
         }
     
+    def has_required_fields(self, text: str) -> bool:
+        """
+        Whether every field in required_fields can be read from the text
+        
+        Args:
+            text: OCR text read so far
+            
+        Returns:
+            True when all required fields match their pattern (CNPs must
+            also pass the checksum)
+        """
+        patterns = getattr(self, 'patterns', {})
+        if not self.required_fields or any(field not in patterns for field in self.required_fields):
+            return False
+        
+        found = self.extract_patterns(
+            self.clean_text(text),
+            {field: patterns[field] for field in self.required_fields}
+        )
+        for field, value in found.items():
+            if not value:
+                return False
+            if field.endswith('cnp') and not self.is_valid_cnp(value):
+                return False
+        return True
+    
+    def early_exit_check(self) -> Optional[Callable[[str], bool]]:
+        """stop_when for process_document in this extractor's OCR mode"""
+        if self.ocr_mode == 'roi' and self.required_fields:
+            return self.has_required_fields
+        return None
+    
+    @staticmethod
+    def is_valid_cnp(cnp: Optional[str]) -> bool:
+        """
+        Validate a Romanian CNP
+        
+        The 13th digit is the sum of the first twelve weighted by
+        279146358279, modulo 11 (a remainder of 10 gives 1).
+        """
+        if not cnp or not re.fullmatch(r'\d{13}', cnp):
+            return False
+        
+        control = sum(int(digit) * weight for digit, weight in zip(cnp, _CNP_WEIGHTS)) % 11
+        if control == 10:
+            control = 1
+        return control == int(cnp[12])
+    
     @staticmethod
     def clean_text(text: str) -> str:
         """Clean extracted text"""
@@ -0,0 +1,239 @@
+"""OCR engines: one Tesseract pass per image returning words, boxes, lines and confidences"""
+import logging
+import os
+import threading
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+import pytesseract
+from PIL import Image
+
+try:
+    # Optional extra: in-process Tesseract API (uv sync --extra tesserocr, builds against libtesseract)
+    import tesserocr
+except ImportError:
+    tesserocr = None
+
+logger = logging.getLogger(__name__)
+
+
+# 'auto' (tesserocr when installed), 'tesserocr' or 'pytesseract'
+OCR_ENGINE = os.getenv('OCR_ENGINE', 'auto')
+
+
+@dataclass
+class OCRWord:
+    """One recognized word"""
+    text: str
+    # Tesseract confidence, 0-100 (negative when Tesseract has none)
+    confidence: float
+    # (x0, y0, x1, y1) in pixels of the recognized image
+    box: Tuple[int, int, int, int]
+    # Index into OCRResult.lines
+    line: int
+
+
+@dataclass
+class OCRResult:
+    """Everything one Tesseract pass returns"""
+    words: List[OCRWord] = field(default_factory=list)
+    lines: List[str] = field(default_factory=list)
+
+    @property
+    def text(self) -> str:
+        """Recognized lines, newline separated"""
+        return '\n'.join(self.lines)
+
+    @property
+    def confidence(self) -> float:
+        """Average word confidence, normalized to 0-1"""
+        confidences = [word.confidence for word in self.words if word.confidence > 0]
+        return sum(confidences) / len(confidences) / 100 if confidences else 0.0
+
+    def add_word(self, text: str, confidence: float, box: Tuple[int, int, int, int], new_line: bool) -> None:
+        if new_line or not self.lines:
+            self.lines.append(text)
+        else:
+            self.lines[-1] += ' ' + text
+        self.words.append(OCRWord(text, confidence, box, len(self.lines) - 1))
+
+
+class OCREngine(ABC):
+    """Interface of the OCR engines"""
+
+    name = 'base'
+
+    @abstractmethod
+    def recognize(
+        self,
+        image: np.ndarray,
+        lang: str = 'ron+eng',
+        psm: Optional[int] = None,
+        whitelist: Optional[str] = None
+    ) -> OCRResult:
+        """
+        Recognize the text of an image
+
+        Args:
+            image: Image (preprocessed: grayscale or binary)
+            lang: Tesseract languages
+            psm: Page segmentation mode (None: Tesseract's default, automatic)
+            whitelist: Optional characters Tesseract may output
+
+        Returns:
+            Words with boxes and confidences, grouped into lines
+        """
+
+    def close(self) -> None:
+        """Release loaded models"""
+
+
+class PytesseractEngine(OCREngine):
+    """
+    Tesseract command line through pytesseract
+
+    Every call starts a tesseract process that loads the language models
+    again; kept as the fallback when tesserocr is not installed.
+    """
+
+    name = 'pytesseract'
+
+    def recognize(
+        self,
+        image: np.ndarray,
+        lang: str = 'ron+eng',
+        psm: Optional[int] = None,
+        whitelist: Optional[str] = None
+    ) -> OCRResult:
+        config = f'--psm {psm}' if psm is not None else ''
+        if whitelist:
+            config += f' -c tessedit_char_whitelist={whitelist}'
+
+        data = pytesseract.image_to_data(
+            image,
+            lang=lang,
+            config=config.strip(),
+            output_type=pytesseract.Output.DICT
+        )
+
+        result = OCRResult()
+        current_line = None
+        for i, word in enumerate(data['text']):
+            if not word.strip():
+                continue
+            line = (data['block_num'][i], data['par_num'][i], data['line_num'][i])
+            left, top = data['left'][i], data['top'][i]
+            result.add_word(
+                word,
+                float(data['conf'][i]),
+                (left, top, left + data['width'][i], top + data['height'][i]),
+                new_line=line != current_line
+            )
+            current_line = line
+        return result
+
+
+class TesserocrEngine(OCREngine):
+    """
+    In-process Tesseract API (tesserocr)
+
+    One PyTessBaseAPI per language set, created on first use and kept for the
+    life of the process, so 'ron+eng' is loaded once instead of once per page.
+    The API is not thread safe: calls on the same language set are serialized.
+    """
+
+    name = 'tesserocr'
+
+    def __init__(self, tessdata_path: Optional[str] = None):
+        """
+        Initialize engine
+
+        Args:
+            tessdata_path: Optional tessdata directory (default: TESSDATA_PREFIX / the build default)
+        """
+        if tesserocr is None:
+            raise ImportError('tesserocr is not installed')
+        self.tessdata_path = tessdata_path
+        self._apis: Dict[str, Any] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def _api(self, lang: str) -> Tuple[Any, threading.Lock]:
+        with self._lock:
+            if lang not in self._apis:
+                kwargs = {'lang': lang}
+                if self.tessdata_path:
+                    kwargs['path'] = self.tessdata_path
+                self._apis[lang] = tesserocr.PyTessBaseAPI(**kwargs)
+                self._locks[lang] = threading.Lock()
+            return self._apis[lang], self._locks[lang]
+
+    def recognize(
+        self,
+        image: np.ndarray,
+        lang: str = 'ron+eng',
+        psm: Optional[int] = None,
+        whitelist: Optional[str] = None
+    ) -> OCRResult:
+        api, lock = self._api(lang)
+        word_level = tesserocr.RIL.WORD
+
+        with lock:
+            api.SetPageSegMode(psm if psm is not None else tesserocr.PSM.AUTO)
+            # An empty whitelist lifts the restriction of a previous call
+            api.SetVariable('tessedit_char_whitelist', whitelist or '')
+            api.SetImage(Image.fromarray(image))
+            api.Recognize()
+
+            result = OCRResult()
+            new_line = True
+            for word in tesserocr.iterate_level(api.GetIterator(), word_level):
+                new_line = new_line or word.IsAtBeginningOf(tesserocr.RIL.TEXTLINE)
+                text = word.GetUTF8Text(word_level)
+                if not text or not text.strip():
+                    continue
+                result.add_word(text, word.Confidence(word_level), word.BoundingBox(word_level), new_line)
+                new_line = False
+
+            api.Clear()
+        return result
+
+    def close(self) -> None:
+        with self._lock:
+            for api in self._apis.values():
+                api.End()
+            self._apis.clear()
+            self._locks.clear()
+
+
+# One engine per process and kind: forked workers must not reuse the parent's API handles
+_engines: Dict[Tuple[int, str], OCREngine] = {}
+
+
+def get_engine(name: Optional[str] = None) -> OCREngine:
+    """
+    Shared OCR engine of this process
+
+    Args:
+        name: 'auto', 'tesserocr' or 'pytesseract' (default: OCR_ENGINE)
+
+    Returns:
+        The engine, created on first use
+    """
+    requested = (name or OCR_ENGINE).strip().lower()
+    name = requested
+    if name == 'auto':
+        name = 'tesserocr' if tesserocr is not None else 'pytesseract'
+    if name not in ('tesserocr', 'pytesseract'):
+        raise ValueError(f"Unknown OCR engine {name!r}, expected 'auto', 'tesserocr' or 'pytesseract'")
+
+    key = (os.getpid(), name)
+    if key not in _engines:
+        _engines[key] = TesserocrEngine() if name == 'tesserocr' else PytesseractEngine()
+        if requested == 'auto' and tesserocr is None:
+            logger.info("OCR engine: pytesseract (tesserocr is not installed, one tesseract process per page)")
+        else:
+            logger.info(f"OCR engine: {name} (requested {requested!r})")
+    return _engines[key]
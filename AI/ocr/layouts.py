@@ -0,0 +1,124 @@
+"""Layout templates for region-of-interest (ROI) OCR"""
+import re
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+
+# (x0, y0, x1, y1) as fractions of the card width and height
+Box = Tuple[float, float, float, float]
+
+
+@dataclass(frozen=True)
+class FieldRegion:
+    """One crop of a document and the fields read from it"""
+    name: str
+    box: Box
+    # Regex with named groups, one per field, applied to the OCR text of the crop
+    pattern: str
+    # Tesseract page segmentation mode: 7 = single line, 6 = block of lines
+    psm: int = 7
+    whitelist: Optional[str] = None
+
+    @property
+    def fields(self) -> Tuple[str, ...]:
+        return tuple(re.compile(self.pattern).groupindex)
+
+
+@dataclass(frozen=True)
+class LayoutTemplate:
+    """Where the fields of a fixed-layout document are"""
+    document_type: str
+    # Width / height of the physical document
+    aspect_ratio: float
+    regions: Tuple[FieldRegion, ...]
+    # Fields that must be read and validated before OCR stops
+    required: Tuple[str, ...]
+    # MRZ position on the card (fractions), used to find the card on a larger scan
+    mrz_box: Optional[Box] = None
+
+    def card_box(
+        self,
+        image_shape: Tuple[int, ...],
+        mrz_box: Optional[Tuple[int, int, int, int]] = None
+    ) -> Optional[Tuple[int, int, int, int]]:
+        """
+        Card bounds in image pixels
+
+        Args:
+            image_shape: Shape of the page image
+            mrz_box: Detected MRZ (pixels); anchors the card on scans larger than the card
+
+        Returns:
+            (x0, y0, x1, y1), or None when the card cannot be placed
+        """
+        height, width = image_shape[:2]
+
+        if mrz_box is not None and self.mrz_box is not None:
+            # Scale the template so its MRZ lands on the detected one
+            mx0, my0, mx1, my1 = mrz_box
+            card_width = (mx1 - mx0) / (self.mrz_box[2] - self.mrz_box[0])
+            card_height = card_width / self.aspect_ratio
+            x0 = mx0 - self.mrz_box[0] * card_width
+            y0 = my1 - self.mrz_box[3] * card_height
+            return (
+                max(0, int(x0)), max(0, int(y0)),
+                min(width, int(x0 + card_width)), min(height, int(y0 + card_height))
+            )
+
+        # No anchor: only an image cropped to the card itself can be used
+        if abs(width / max(height, 1) - self.aspect_ratio) <= 0.12 * self.aspect_ratio:
+            return 0, 0, width, height
+        return None
+
+    @staticmethod
+    def region_box(card_box: Tuple[int, int, int, int], region: FieldRegion) -> Tuple[int, int, int, int]:
+        """Pixel box of a region inside the card"""
+        x0, y0, x1, y1 = card_box
+        width, height = x1 - x0, y1 - y0
+        rx0, ry0, rx1, ry1 = region.box
+        return (
+            x0 + int(rx0 * width), y0 + int(ry0 * height),
+            x0 + int(rx1 * width), y0 + int(ry1 * height)
+        )
+
+
+_UPPER = 'A-ZĂÂÎȘȚ'
+
+# Romanian identity card (CI, 2009 model, ID-1 format 85.6 x 54 mm).
+# Each crop holds the bilingual label and the value under it; the patterns
+# take the value line. Calibrated on 300 DPI scans of the card front.
+CNI_LAYOUT = LayoutTemplate(
+    document_type='CNI',
+    aspect_ratio=85.6 / 54,
+    regions=(
+        FieldRegion(
+            'series_number', (0.55, 0.07, 1.0, 0.18),
+            r'SERIA\s*(?P<series>[A-Z]{2})\s*N[RT]\.?\s*(?P<number>\d{6})'
+        ),
+        FieldRegion('cnp', (0.28, 0.16, 0.78, 0.27), r'(?P<cnp>\d{13})', whitelist='CNP0123456789 '),
+        FieldRegion(
+            'last_name', (0.28, 0.26, 0.98, 0.38),
+            rf'(?P<last_name>[{_UPPER}][{_UPPER}\- ]+)\s*$', psm=6
+        ),
+        FieldRegion(
+            'first_name', (0.28, 0.37, 0.98, 0.48),
+            rf'(?P<first_name>[{_UPPER}][{_UPPER}\- ]+)\s*$', psm=6
+        ),
+        FieldRegion(
+            'address', (0.28, 0.55, 0.98, 0.67),
+            r'(?:Domiciliu|Adresse|Address)[^\n]*\n(?P<address>[\s\S]+)$', psm=6
+        ),
+        FieldRegion(
+            'issued_validity', (0.28, 0.64, 0.98, 0.74),
+            rf'(?P<issued_by>SPCLEP\s+[{_UPPER}a-zăâîșț\s\-]+?)\s+\d{{2}}\.\d{{2}}\.\d{{2,4}}\s*-\s*'
+            rf'(?P<valid_until>\d{{2}}\.\d{{2}}\.\d{{4}})',
+            psm=6
+        ),
+    ),
+    required=('cnp', 'last_name', 'first_name', 'series', 'number', 'valid_until'),
+    mrz_box=(0.03, 0.74, 0.97, 0.97),
+)
+
+LAYOUTS = {
+    'cni': CNI_LAYOUT,
+}
@@ -0,0 +1,197 @@
+"""Machine Readable Zone (MRZ) detection and parsing for Romanian identity cards"""
+import re
+import unicodedata
+from datetime import date
+from typing import Dict, Any, Optional, Tuple
+
+import cv2
+import numpy as np
+
+
+MRZ_CHARS = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789<'
+
+# Romanian CI: two lines of 36 characters (ICAO TD2 layout)
+TD2_LINE_LENGTH = 36
+
+_CHECK_WEIGHTS = (7, 3, 1)
+
+# OCR confusions in fields that can only hold digits
+_DIGIT_FIXES = str.maketrans({'O': '0', 'Q': '0', 'D': '0', 'I': '1', 'L': '1', 'Z': '2', 'S': '5', 'B': '8', 'G': '6'})
+
+
+def check_digit(value: str) -> int:
+    """ICAO 9303 check digit (weights 7, 3, 1; A=10 ... Z=35; '<' = 0)"""
+    total = 0
+    for i, char in enumerate(value):
+        if char.isdigit():
+            number = int(char)
+        elif 'A' <= char <= 'Z':
+            number = ord(char) - 55
+        else:
+            number = 0
+        total += number * _CHECK_WEIGHTS[i % 3]
+    return total % 10
+
+
+def mrz_form(text: str) -> str:
+    """
+    Text as the MRZ spells it: uppercase, no diacritics, any other separator
+    a single space ('Ștefănescu-Dragoș' -> 'STEFANESCU DRAGOS')
+    """
+    decomposed = unicodedata.normalize('NFKD', text)
+    letters = ''.join(char for char in decomposed if not unicodedata.combining(char)).upper()
+    return ' '.join(re.sub(r'[^A-Z0-9]+', ' ', letters).split())
+
+
+def find_mrz(image: np.ndarray) -> Optional[Tuple[int, int, int, int]]:
+    """
+    Locate the MRZ: a wide block of dark, evenly spaced characters
+
+    Args:
+        image: Page or card image
+
+    Returns:
+        Bounding box (x0, y0, x1, y1) in image pixels, or None
+    """
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if len(image.shape) == 3 else image
+
+    # Work on a small copy: the MRZ is the largest text structure on the card
+    scale = 800 / max(gray.shape)
+    small = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA) if scale < 1 else gray
+    scale = min(scale, 1.0)
+    height, width = small.shape
+
+    rect_kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (13, 5))
+    square_kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (21, 21))
+
+    # Dark characters on a light background, then their horizontal edges merged into lines
+    blurred = cv2.GaussianBlur(small, (3, 3), 0)
+    blackhat = cv2.morphologyEx(blurred, cv2.MORPH_BLACKHAT, rect_kernel)
+    gradient = np.absolute(cv2.Sobel(blackhat, cv2.CV_32F, 1, 0, ksize=-1))
+    gradient = cv2.normalize(gradient, None, 0, 255, cv2.NORM_MINMAX).astype(np.uint8)
+    gradient = cv2.morphologyEx(gradient, cv2.MORPH_CLOSE, rect_kernel)
+    _, mask = cv2.threshold(gradient, 0, 255, cv2.THRESH_BINARY | cv2.THRESH_OTSU)
+    mask = cv2.morphologyEx(mask, cv2.MORPH_CLOSE, square_kernel)
+    mask = cv2.erode(mask, None, iterations=2)
+
+    contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    best = None
+    for contour in contours:
+        x, y, w, h = cv2.boundingRect(contour)
+        # Two text lines, much wider than high, spanning a good part of the card
+        if w / max(h, 1) < 5 or w < 0.25 * width:
+            continue
+        # Prefer the lowest block (the MRZ closes the card), then the widest
+        key = (y + h, w)
+        if best is None or key > best[0]:
+            best = (key, (x, y, w, h))
+
+    if best is None:
+        return None
+
+    x, y, w, h = best[1]
+    pad_x, pad_y = int(0.03 * w), int(0.15 * h)
+    x0, y0 = max(0, x - pad_x), max(0, y - pad_y)
+    x1, y1 = min(width, x + w + pad_x), min(height, y + h + pad_y)
+    return int(x0 / scale), int(y0 / scale), int(x1 / scale), int(y1 / scale)
+
+
+def _mrz_lines(text: str) -> Optional[Tuple[str, str]]:
+    """The two TD2 lines from OCR output (spaces dropped, lines padded or cut to 36)"""
+    lines = []
+    for line in text.upper().splitlines():
+        line = re.sub(r'[^A-Z0-9<]', '', line.replace(' ', ''))
+        if len(line) >= TD2_LINE_LENGTH - 6 and '<' in line:
+            lines.append(line[:TD2_LINE_LENGTH].ljust(TD2_LINE_LENGTH, '<'))
+
+    # Line 1 starts with the document code, line 2 is the last one
+    first = next((line for line in lines if line.startswith('I')), None)
+    if first is None or lines[-1] == first:
+        return None
+    return first, lines[-1]
+
+
+def _mrz_date(value: str, future: bool) -> Optional[str]:
+    """YYMMDD -> YYYY-MM-DD; birth dates are in the past, expiry dates may be in the future"""
+    if not value.isdigit():
+        return None
+    year, month, day = int(value[:2]), int(value[2:4]), int(value[4:])
+    current = date.today().year % 100
+    century = 2000 if (year <= current + (20 if future else 0)) else 1900
+    try:
+        return date(century + year, month, day).isoformat()
+    except ValueError:
+        return None
+
+
+def parse_mrz(text: str) -> Optional[Dict[str, Any]]:
+    """
+    Parse the MRZ of a Romanian identity card
+
+    Line 1: ID ROU SURNAME<<GIVEN<NAMES
+    Line 2: document number (series + 6 digits) + check, nationality,
+    birth date + check, sex, expiry date + check, first digit and last six
+    digits of the CNP, composite check
+
+    Args:
+        text: OCR text of the MRZ crop
+
+    Returns:
+        Dictionary with the fields whose check digits match (plus 'checks'
+        with the result of every check), or None when no MRZ is found
+    """
+    lines = _mrz_lines(text)
+    if lines is None:
+        return None
+    first, second = lines
+
+    names = first[5:].strip('<')
+    surname, _, given = names.partition('<<')
+
+    document_number = second[0:9]
+    document_check = second[9].translate(_DIGIT_FIXES)
+    nationality = second[10:13]
+    birth = second[13:19].translate(_DIGIT_FIXES)
+    birth_check = second[19].translate(_DIGIT_FIXES)
+    sex = second[20]
+    expiry = second[21:27].translate(_DIGIT_FIXES)
+    expiry_check = second[27].translate(_DIGIT_FIXES)
+    optional = second[28:35].translate(_DIGIT_FIXES)
+    composite_check = second[35].translate(_DIGIT_FIXES)
+
+    # Series letters, then the digits of the card number
+    series = document_number[:2]
+    number = document_number[2:].translate(_DIGIT_FIXES).strip('<')
+    document_number = series + document_number[2:].translate(_DIGIT_FIXES)
+
+    checks = {
+        'document_number': str(check_digit(document_number)) == document_check,
+        'birth_date': str(check_digit(birth)) == birth_check,
+        'valid_until': str(check_digit(expiry)) == expiry_check,
+        'composite': str(check_digit(
+            document_number + document_check + birth + birth_check + expiry + expiry_check + optional
+        )) == composite_check,
+    }
+
+    fields: Dict[str, Any] = {'checks': checks, 'mrz': f'{first}\n{second}'}
+    if surname:
+        fields['last_name'] = surname.replace('<', ' ').strip()
+    if given:
+        fields['first_name'] = given.replace('<', ' ').strip()
+    if nationality.isalpha():
+        fields['nationality'] = nationality
+    if sex in ('M', 'F'):
+        fields['sex'] = sex
+    if checks['document_number'] and series.isalpha() and number.isdigit():
+        fields['series'] = series
+        fields['number'] = number
+    if checks['birth_date']:
+        fields['birth_date'] = _mrz_date(birth, future=False)
+    if checks['valid_until']:
+        fields['valid_until'] = _mrz_date(expiry, future=True)
+
+    # CNP = sex/century digit + YYMMDD + county, sequence and control digits
+    if checks['birth_date'] and optional.isdigit():
+        fields['cnp'] = optional[0] + birth + optional[1:]
+
+    return fields
@@ -7,6 +7,11 @@ from .document_processor import DocumentProcessor
 class ParcelExtractor(DocumentProcessor):
     """Extract data from parcel and cadastral documents"""
     
+    extractor_version = 2
+    
+    # Multi-page documents: OCR stops at the page where these are all read
+    required_fields = ('cadastral_number', 'area_hectares', 'owner_name', 'owner_cnp')
+    
     def __init__(self, tesseract_path: Optional[str] = None):
         super().__init__(tesseract_path)
         
@@ -36,7 +41,7 @@ class ParcelExtractor(DocumentProcessor):
             Dictionary with extracted parcel data
         """
         # Process document with OCR
-        ocr_result = self.process_document(file_path, lang='ron+eng')
+        ocr_result = self.process_document(file_path, lang='ron+eng', stop_when=self.early_exit_check())
         text = ocr_result['text']
         
         # Clean text
@@ -74,7 +79,10 @@ class ParcelExtractor(DocumentProcessor):
             'document_type': 'PARCEL',
             'confidence': ocr_result['confidence'],
             'extracted_data': extracted_data,
-            'raw_text': cleaned_text
+            'raw_text': cleaned_text,
+            'page_count': ocr_result['page_count'],
+            'peak_page_bytes': ocr_result['peak_page_bytes'],
+            'early_exit': ocr_result['early_exit']
         }
     
     @staticmethod
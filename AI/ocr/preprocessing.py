@@ -0,0 +1,126 @@
+"""Image preprocessing profiles for OCR"""
+import math
+import os
+from dataclasses import dataclass
+from typing import Dict, Any, Optional, Tuple
+
+import cv2
+import numpy as np
+
+
+@dataclass(frozen=True)
+class PreprocessingProfile:
+    """How much work preprocess() spends on a page before it goes to Tesseract"""
+    name: str
+    # Downscale so the longest side is at most this (None: keep the resolution).
+    # 3508 px is the long side of A4 at 300 DPI, where Tesseract is most accurate
+    max_side: Optional[int] = None
+    # 'nlmeans', 'median', 'auto' (by estimated noise) or 'none'
+    denoiser: str = 'nlmeans'
+    # Estimated noise sigma (grey levels) under which denoising is skipped
+    noise_threshold: float = 0.0
+    # 'auto': above this sigma the (expensive) non-local means is used, below it a median
+    heavy_noise_threshold: float = 6.0
+
+
+PREPROCESSING_PROFILES = {
+    # Previous behaviour: non-local means on every page, full resolution
+    'quality': PreprocessingProfile('quality', denoiser='nlmeans'),
+    # Clean scans skip denoising; noisy ones get a median, very noisy ones a reduced NL-means
+    'balanced': PreprocessingProfile('balanced', max_side=3508, denoiser='auto', noise_threshold=2.0),
+    # Only a median, and only on clearly noisy pages
+    'fast': PreprocessingProfile('fast', max_side=2480, denoiser='median', noise_threshold=4.0),
+}
+
+PREPROCESSING_PROFILE = os.getenv('OCR_PREPROCESSING_PROFILE', 'balanced')
+
+
+def get_preprocessing_profile(name: Optional[str] = None) -> PreprocessingProfile:
+    name = (name or PREPROCESSING_PROFILE).strip().lower()
+    if name not in PREPROCESSING_PROFILES:
+        raise ValueError(f"Unknown preprocessing profile {name!r}, expected one of {sorted(PREPROCESSING_PROFILES)}")
+    return PREPROCESSING_PROFILES[name]
+
+
+# Difference of two Laplacians: zero on flat areas and straight gradients
+_NOISE_KERNEL = np.array([[1, -2, 1], [-2, 4, -2], [1, -2, 1]], dtype=np.float32)
+
+
+def estimate_noise(gray: np.ndarray) -> float:
+    """
+    Standard deviation of the Gaussian noise of a grayscale image
+
+    Immerkaer's fast estimator: one 3x3 convolution, so it costs a few
+    milliseconds where denoising costs seconds.
+
+    Args:
+        gray: Grayscale image
+
+    Returns:
+        Estimated sigma in grey levels (clean scans are below 2)
+    """
+    height, width = gray.shape[:2]
+    if height < 3 or width < 3:
+        return 0.0
+    response = cv2.filter2D(gray.astype(np.float32), -1, _NOISE_KERNEL)[1:-1, 1:-1]
+    return float(np.abs(response).sum() * math.sqrt(math.pi / 2) / (6 * (width - 2) * (height - 2)))
+
+
+def preprocess(image: np.ndarray, profile: PreprocessingProfile) -> Tuple[np.ndarray, Dict[str, Any]]:
+    """
+    Grayscale, downscale, denoise (if needed) and binarize a page
+
+    Args:
+        image: Input image as numpy array
+        profile: Preprocessing profile
+
+    Returns:
+        Tuple of (binary image, stages) where stages records the scale,
+        the estimated noise and the denoiser that ran
+    """
+    # Convert to grayscale
+    if len(image.shape) == 3:
+        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    else:
+        gray = image
+
+    # Downscale first: every later stage is cheaper, and INTER_AREA already averages out some noise
+    scale = 1.0
+    if profile.max_side and max(gray.shape[:2]) > profile.max_side:
+        scale = profile.max_side / max(gray.shape[:2])
+        gray = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+
+    noise = estimate_noise(gray) if profile.noise_threshold > 0 else None
+
+    denoiser = profile.denoiser
+    if noise is not None and noise < profile.noise_threshold:
+        denoiser = 'none'
+    elif denoiser == 'auto':
+        denoiser = 'nlmeans_fast' if noise is not None and noise >= profile.heavy_noise_threshold else 'median'
+
+    if denoiser == 'nlmeans':
+        denoised = cv2.fastNlMeansDenoising(gray)
+    elif denoiser == 'nlmeans_fast':
+        # Search window 11 instead of 21: about a quarter of the work
+        denoised = cv2.fastNlMeansDenoising(gray, None, h=3, templateWindowSize=7, searchWindowSize=11)
+    elif denoiser == 'median':
+        denoised = cv2.medianBlur(gray, 3)
+    else:
+        denoised = gray
+
+    # Apply adaptive thresholding
+    binary = cv2.adaptiveThreshold(
+        denoised,
+        255,
+        cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
+        cv2.THRESH_BINARY,
+        11,
+        2
+    )
+
+    return binary, {
+        'profile': profile.name,
+        'scale': round(scale, 4),
+        'noise': round(noise, 3) if noise is not None else None,
+        'denoiser': denoiser
+    }
@@ -1,10 +1,16 @@
 """Main AI processor - integrates OCR and document generation"""
-from typing import Dict, Any, Optional
+import sqlite3
+from typing import Dict, Any, Iterable, Iterator, Optional
 from pathlib import Path
 
+import numpy as np
+
 from ocr.cni_extractor import CNIExtractor
 from ocr.certificate_extractor import CertificateExtractor
 from ocr.parcel_extractor import ParcelExtractor
+from ocr.batch_engine import BatchOCREngine, BatchStats
+from ocr.cache import OCRCache, file_sha256
+from ocr.document_processor import DocumentProcessor
 from document_generation.chm_generator import CHMGenerator
 from document_generation.report_generator import ReportGenerator
 
@@ -12,19 +18,37 @@ from document_generation.report_generator import ReportGenerator
 class AIProcessor:
     """Main AI processor for document processing and generation"""
     
-    def __init__(self, tesseract_path: Optional[str] = None):
+    def __init__(
+        self,
+        tesseract_path: Optional[str] = None,
+        cache: Optional[OCRCache] = None,
+        use_cache: bool = True
+    ):
         """
         Initialize AI processor
         
         Args:
             tesseract_path: Optional path to Tesseract executable
+            cache: OCR result cache (default: OCRCache.from_env())
+            use_cache: Set to False to always run the OCR
         """
+        self.tesseract_path = tesseract_path
+        self.cache = (cache or OCRCache.from_env()) if use_cache else None
+        self.last_batch_stats: Optional[BatchStats] = None
         self.cni_extractor = CNIExtractor(tesseract_path)
         self.certificate_extractor = CertificateExtractor(tesseract_path)
         self.parcel_extractor = ParcelExtractor(tesseract_path)
+        self.generic_processor = DocumentProcessor(tesseract_path)
         self.chm_generator = CHMGenerator()
         self.report_generator = ReportGenerator()
     
+    def warm_up(self) -> None:
+        """Run one OCR on a blank image so Tesseract and the language data are loaded"""
+        blank = np.full((64, 256), 255, dtype=np.uint8)
+        self.cni_extractor.extract_text_from_image(blank)
+        # The MRZ is read with 'eng' alone; with tesserocr that is a second loaded model
+        self.cni_extractor.engine.recognize(blank, lang='eng')
+    
     def process_document(
         self,
         file_path: str,
@@ -46,6 +70,15 @@ class AIProcessor:
         document_type = document_type.lower()
         
         try:
+            cache_key = self._cache_key(file_path, document_type)
+            cached = self._cache_get(cache_key)
+            if cached is not None:
+                return {
+                    'success': True,
+                    'data': cached,
+                    'cached': True
+                }
+            
             if document_type == 'cni':
                 result = self.cni_extractor.extract_cni_data(file_path)
             elif document_type == 'certificate':
@@ -54,19 +87,22 @@ class AIProcessor:
                 result = self.parcel_extractor.extract_parcel_data(file_path)
             else:
                 # Generic document processing
-                from ocr.document_processor import DocumentProcessor
-                processor = DocumentProcessor(self.cni_extractor.tesseract_path)
-                ocr_result = processor.process_document(file_path)
+                ocr_result = self.generic_processor.process_document(file_path)
                 result = {
                     'document_type': 'OTHER',
                     'confidence': ocr_result['confidence'],
                     'extracted_data': {'text': ocr_result['text']},
-                    'raw_text': ocr_result['text']
+                    'raw_text': ocr_result['text'],
+                    'page_count': ocr_result['page_count'],
+                    'peak_page_bytes': ocr_result['peak_page_bytes']
                 }
             
+            self._cache_put(cache_key, result)
+            
             return {
                 'success': True,
-                'data': result
+                'data': result,
+                'cached': False
             }
         
         except Exception as e:
@@ -76,6 +112,38 @@ class AIProcessor:
                 'data': None
             }
     
+    def _cache_key(self, file_path: str, document_type: str) -> Optional[str]:
+        """Key of the document in the OCR cache: file bytes + document type + OCR parameters"""
+        if self.cache is None:
+            return None
+        
+        extractors = {
+            'cni': self.cni_extractor,
+            'certificate': self.certificate_extractor,
+            'parcel': self.parcel_extractor,
+            'cadastral': self.parcel_extractor,
+        }
+        extractor = extractors.get(document_type) or self.generic_processor
+        params = {'document_type': document_type, **extractor.ocr_params('ron+eng')}
+        return OCRCache.make_key(file_sha256(file_path), params)
+    
+    def _cache_get(self, key: Optional[str]) -> Optional[Dict[str, Any]]:
+        if key is None:
+            return None
+        try:
+            return self.cache.get(key)
+        except sqlite3.Error:
+            # A broken cache file only costs the OCR run
+            return None
+    
+    def _cache_put(self, key: Optional[str], result: Dict[str, Any]) -> None:
+        if key is None:
+            return
+        try:
+            self.cache.put(key, result)
+        except sqlite3.Error:
+            pass
+    
     def generate_chm(
         self,
         output_path: str,
@@ -155,17 +223,65 @@ class AIProcessor:
     
     def batch_process_documents(
         self,
-        documents: list[Dict[str, str]]
+        documents: list[Dict[str, str]],
+        max_workers: Optional[int] = None
     ) -> list[Dict[str, Any]]:
         """
         Process multiple documents in batch
         
+        Documents are spread over a pool of worker processes (see
+        ocr.batch_engine.BatchOCREngine); a single document, or max_workers=1,
+        is processed in this process.
+        
         Args:
             documents: List of dicts with 'file_path' and 'document_type'
+            max_workers: Worker processes (default: CPU count)
             
         Returns:
-            List of processing results
+            List of processing results, in input order
+        """
+        if len(documents) < 2 or max_workers == 1:
+            return self._process_sequentially(documents)
+        
+        engine = self._batch_engine(max_workers)
+        results = engine.process(documents)
+        self.last_batch_stats = engine.stats
+        return results
+    
+    def iter_process_documents(
+        self,
+        documents: Iterable[Dict[str, str]],
+        max_workers: Optional[int] = None,
+        max_pending: Optional[int] = None
+    ) -> Iterator[Dict[str, Any]]:
         """
+        Process documents over the worker pool and yield results as they complete
+        
+        Args:
+            documents: Iterable of dicts with 'file_path' and 'document_type' (read lazily)
+            max_workers: Worker processes (default: CPU count)
+            max_pending: Documents in flight at once (default: 2 per worker)
+            
+        Yields:
+            Processing results with 'file_path' and 'index' (position in the input);
+            last_batch_stats is updated after every result
+        """
+        engine = self._batch_engine(max_workers, max_pending)
+        self.last_batch_stats = engine.stats
+        for result in engine.iter_process(documents):
+            self.last_batch_stats = engine.stats
+            yield result
+    
+    def _batch_engine(self, max_workers: Optional[int], max_pending: Optional[int] = None) -> BatchOCREngine:
+        # Workers build their own processor of the same class, once per process
+        return BatchOCREngine(
+            processor_factory=type(self),
+            tesseract_path=self.tesseract_path,
+            max_workers=max_workers,
+            max_pending=max_pending
+        )
+    
+    def _process_sequentially(self, documents: list[Dict[str, str]]) -> list[Dict[str, Any]]:
         results = []
         
         for doc in documents:
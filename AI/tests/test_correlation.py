@@ -0,0 +1,84 @@
+"""Weather - harvest correlation report (mcp_server.correlation and its generated Backend copy)"""
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from mcp_server.correlation import CROPS, correlation_report, weather_harvest_pipeline
+
+AI_COPY = Path(__file__).resolve().parents[1] / "mcp_server" / "correlation.py"
+BACKEND_COPY = Path(__file__).resolve().parents[2] / "Backend" / "app" / "services" / "correlation.py"
+
+WINDOW_START = datetime(2025, 7, 1)
+
+
+def _rows(days: int, lead_in: int, lead_in_harvest: bool) -> list:
+    """Daily joined rows; the first `lead_in` days precede WINDOW_START"""
+    rows = []
+    for offset in range(-lead_in, days):
+        day = WINDOW_START + timedelta(days=offset)
+        high = 25 + (offset % 7)
+        row = {"date": day, "max_temp_celsius": high, "min_temp_celsius": high - 10}
+        if offset >= 0 or lead_in_harvest:
+            # Lead-in harvest values far off the trend: they must not reach the report
+            factor = 1000 if offset < 0 else 1
+            row["fuel_consumed_liters"] = (40 + 2 * high) * factor
+            for crop in CROPS:
+                row[f"{crop}_harvested_hectares"] = 2.0
+                row[f"{crop}_harvested_kg"] = (3000 + 50 * high) * factor
+        rows.append(row)
+    return rows
+
+
+def test_backend_copy_is_generated_from_this_module():
+    if not BACKEND_COPY.exists():
+        pytest.skip("Backend is not checked out next to AI")
+    header, source = BACKEND_COPY.read_bytes().split(b"\n", 1)
+    assert header.startswith(b"# Generated from AI/mcp_server/correlation.py")
+    # Out of date: run Backend/scripts/sync_correlation.py
+    assert source == AI_COPY.read_bytes()
+
+
+def test_pipeline_joins_a_single_location():
+    start, end = datetime(2025, 7, 1), datetime(2025, 8, 1)
+
+    pinned = weather_harvest_pipeline(start, end, "Timisoara, Romania")
+    assert pinned[0]["$match"]["location"] == "Timisoara, Romania"
+    assert not any("$group" in stage for stage in pinned)
+
+    # Without a location, the weather of the location with the most days is kept
+    stages = weather_harvest_pipeline(start, end)
+    group = next(i for i, stage in enumerate(stages) if "$group" in stage)
+    assert stages[group]["$group"]["_id"] == "$location"
+    assert stages[group + 2] == {"$limit": 1}
+    assert group < next(i for i, stage in enumerate(stages) if "$lookup" in stage)
+
+
+def test_lead_in_harvest_is_ignored():
+    with_lead_in = correlation_report(_rows(20, 3, lead_in_harvest=True), max_lag_days=3, window_start=WINDOW_START)
+    without = correlation_report(_rows(20, 3, lead_in_harvest=False), max_lag_days=3, window_start=WINDOW_START)
+    assert with_lead_in == without
+
+
+def test_counts_and_rolling_means_cover_the_window():
+    report = correlation_report(_rows(20, 3, lead_in_harvest=True), max_lag_days=3, window_start=WINDOW_START)
+
+    assert report["days_with_weather"] == 20
+    assert report["days_with_harvest"] == 20
+    assert report["fuel"]["days_with_data"] == 20
+    assert report["fuel"]["regression_on_mean_temp"]["paired_days"] == 20
+    assert [row["date"] for row in report["rolling_means"]][0] == "2025-07-01"
+    assert len(report["rolling_means"]) == 20
+
+
+def test_lags_use_the_lead_in_weather():
+    report = correlation_report(_rows(20, 3, lead_in_harvest=False), max_lag_days=3, window_start=WINDOW_START)
+    # Fuel follows the same day's temperature exactly; a 7-day cycle keeps lag 3 defined
+    assert report["fuel"]["lagged_correlations"]["max_temp_celsius"]["0"] == pytest.approx(1.0)
+    assert report["fuel"]["lagged_correlations"]["max_temp_celsius"]["3"] is not None
+
+
+def test_without_window_start_every_row_counts():
+    report = correlation_report(_rows(20, 3, lead_in_harvest=True), max_lag_days=3)
+    assert report["days_with_harvest"] == 23
+    assert len(report["rolling_means"]) == 23
@@ -0,0 +1,86 @@
+"""MRZ parsing and CNP validation (ocr.mrz, ocr.document_processor)"""
+import pytest
+
+pytest.importorskip("cv2")
+pytest.importorskip("pytesseract")
+
+from ocr.document_processor import DocumentProcessor
+from ocr.mrz import check_digit, mrz_form, parse_mrz
+
+# Synthetic TD2 MRZ of a Romanian card: series XV, number 123456, born 1985-03-15,
+# valid until 2030-03-15, CNP 1850315123455 (its first digit and last six digits close line 2)
+LINE_1 = "IDROUPOPESCU<<ION<MARIA<<<<<<<<<<<<<"
+LINE_2 = "XV123456<5ROU8503150M300315011234557"
+CNP = "1850315123455"
+
+
+@pytest.mark.parametrize("value, digit", [
+    # ICAO 9303 specimen values
+    ("L898902C3", 6),
+    ("740812", 2),
+    ("120415", 9),
+    ("XV123456<", 5),
+    ("<<<<<<", 0),
+])
+def test_check_digit(value, digit):
+    assert check_digit(value) == digit
+
+
+def test_parse_mrz():
+    fields = parse_mrz(f"{LINE_1}\n{LINE_2}")
+
+    assert all(fields["checks"].values())
+    assert fields["last_name"] == "POPESCU"
+    assert fields["first_name"] == "ION MARIA"
+    assert fields["series"] == "XV"
+    assert fields["number"] == "123456"
+    assert fields["nationality"] == "ROU"
+    assert fields["sex"] == "M"
+    assert fields["birth_date"] == "1985-03-15"
+    assert fields["valid_until"] == "2030-03-15"
+    assert fields["cnp"] == CNP
+
+
+def test_parse_mrz_fixes_ocr_confusions_in_digit_fields():
+    # OCR noise around the lines, 'O' for '0' and 'S' for '5' in the birth date
+    noisy = LINE_2.replace("850315", "8SO315")
+    fields = parse_mrz(f"ROMANIA\n{LINE_1}\n{noisy} \n")
+
+    assert fields["birth_date"] == "1985-03-15"
+    assert fields["cnp"] == CNP
+
+
+def test_parse_mrz_drops_fields_whose_check_fails():
+    # Birth date check digit 0 -> 1: no birth date, and no CNP built from it
+    fields = parse_mrz(f"{LINE_1}\n{LINE_2[:19]}1{LINE_2[20:]}")
+
+    assert fields["checks"]["birth_date"] is False
+    assert fields["checks"]["composite"] is False
+    assert "birth_date" not in fields
+    assert "cnp" not in fields
+    assert fields["series"] == "XV" and fields["valid_until"] == "2030-03-15"
+
+
+@pytest.mark.parametrize("text", ["", "CARTE DE IDENTITATE", LINE_2])
+def test_parse_mrz_without_an_mrz(text):
+    assert parse_mrz(text) is None
+
+
+@pytest.mark.parametrize("cnp, valid", [
+    (CNP, True),
+    ("1850315123454", False),
+    ("185031512345", False),
+    ("18503151234a5", False),
+    (None, False),
+])
+def test_is_valid_cnp(cnp, valid):
+    assert DocumentProcessor.is_valid_cnp(cnp) is valid
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Ștefănescu-Dragoș", "STEFANESCU DRAGOS"),
+    ("ŢĂRANU  Ion", "TARANU ION"),
+    ("ION MARIA", "ION MARIA"),
+])
+def test_mrz_form(text, expected):
+    assert mrz_form(text) == expected
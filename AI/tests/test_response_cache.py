@@ -0,0 +1,82 @@
+"""Semantic response cache (agents.response_cache)"""
+import asyncio
+from datetime import date
+
+import pytest
+
+from agents.response_cache import ResponseCache, embed, extract_entities, normalize_question
+
+TODAY = date(2025, 11, 16)
+
+# Same wording, another crop / person / role / note: near duplicates for the embedding, different answers
+NEAR_MISSES = [
+    ("Give me a detailed report about the wheat yield for the whole last week",
+     "Give me a detailed report about the beans yield for the whole last week"),
+    ("How many hours did the employee Ion Popescu work in the last 7 days?",
+     "How many hours did the employee Ana Popescu work in the last 7 days?"),
+    ("how many hours did the employee ion popescu work in the last 7 days?",
+     "how many hours did the employee ana popescu work in the last 7 days?"),
+    ("Ion Popescu worked how many hours in the last 7 days?",
+     "Ana Popescu worked how many hours in the last 7 days?"),
+    ("Which employees with the role Tractor Driver worked in the last 7 days?",
+     "Which employees with the role Combine Operator worked in the last 7 days?"),
+    ('On which harvest days of the last 30 days were the notes "Rain delay"?',
+     'On which harvest days of the last 30 days were the notes "Equipment maintenance"?'),
+]
+
+PARAPHRASES = [
+    ("Give me a detailed report about the wheat yield for the whole last week",
+     "Give me a detailed report about the wheat yield for the last week"),
+    ("How many hours did the employee Ion Popescu work in the last 7 days?",
+     "How many hours did the employee Ion Popescu work during the last 7 days?"),
+]
+
+
+class StaticVersionsCache(ResponseCache):
+    """No MongoDB: every collection stays at version 0"""
+
+    async def _current_versions(self, collections: tuple) -> tuple:
+        return tuple(0 for _ in collections)
+
+
+@pytest.mark.parametrize("first, second", NEAR_MISSES)
+def test_near_misses_land_in_different_buckets(first, second):
+    assert normalize_question(first, TODAY).bucket != normalize_question(second, TODAY).bucket
+
+
+@pytest.mark.parametrize("first, second", NEAR_MISSES)
+def test_near_misses_are_not_served_from_the_cache(first, second):
+    cache = StaticVersionsCache()
+
+    async def scenario():
+        await cache.store(first, "first answer", today=TODAY)
+        return await cache.lookup(second, today=TODAY)
+
+    assert asyncio.run(scenario()) is None
+
+
+def test_near_misses_are_above_the_similarity_threshold():
+    # Without the entities in the bucket these pairs would be served from each other's answers
+    first, second = NEAR_MISSES[0]
+    text_first = normalize_question(first, TODAY).text
+    text_second = normalize_question(second, TODAY).text
+    assert float(embed(text_first) @ embed(text_second)) > ResponseCache().similarity_threshold
+
+
+@pytest.mark.parametrize("first, second", PARAPHRASES)
+def test_paraphrases_still_hit(first, second):
+    cache = StaticVersionsCache()
+
+    async def scenario():
+        await cache.store(first, "answer", today=TODAY)
+        return await cache.lookup(second, today=TODAY)
+
+    assert asyncio.run(scenario()) == "answer"
+
+
+def test_entities():
+    assert extract_entities("Show the wheat and sunflower yield") == ("crop:sunflower", "crop:wheat")
+    assert extract_entities("List the tractor drivers") == ("role:tractor driver",)
+    assert extract_entities("Today is 16 November 2025. What is the weather?") == ()
+    assert "name:popescu" in extract_entities("What did Ion Popescu do yesterday?")
+    assert extract_entities("Which employee with the most hours?") == ()
@@ -0,0 +1,54 @@
+"""Deterministic fast path (agents.router)"""
+from datetime import date
+
+import pytest
+
+from agents.router import ROUTER_MIN_CONFIDENCE, classify
+
+REFERENCE_DATE = date(2025, 11, 16)
+
+ROLE_TOOL = "get_employee_with_a_specific_role"
+
+
+def _routed_tool(question: str):
+    route = classify(question, REFERENCE_DATE)
+    return route.tool if route is not None and route.confidence >= ROUTER_MIN_CONFIDENCE else None
+
+
+@pytest.mark.parametrize("question, role", [
+    ("Show me the employees with role Tractor Driver", "Tractor Driver"),
+    ("Which employees have the role Harvest Worker?", "Harvest Worker"),
+    ("Who has the role of combine operator?", "Combine Operator"),
+    ('Employees with role: "farm manager"', "Farm Manager"),
+    ("Angajatii cu rolul Tractor Driver", "Tractor Driver"),
+])
+def test_role_lookups(question, role):
+    route = classify(question, REFERENCE_DATE)
+    assert route is not None and route.tool == ROLE_TOOL
+    assert route.arguments == {"role": role}
+    assert route.confidence >= ROUTER_MIN_CONFIDENCE
+
+
+@pytest.mark.parametrize("question", [
+    "What is the role of Ion Popescu?",
+    "Which role does Ion Popescu have?",
+    "What is the job title of Maria?",
+    "How many employees have the role Tractor Driver and what are their birthdays?",
+    "What is the role of the farm manager in the harvest planning?",
+])
+def test_questions_about_roles_go_to_the_team(question):
+    assert _routed_tool(question) is None
+
+
+@pytest.mark.parametrize("question", [
+    "What was the total oil cost in the last 30 days for the tractor driver Ion?",
+    "What was the weather on 3 March 2025 in Cluj?",
+])
+def test_qualifiers_the_tool_cannot_express_go_to_the_team(question):
+    route = classify(question, REFERENCE_DATE)
+    assert route is not None and route.confidence < ROUTER_MIN_CONFIDENCE
+
+
+def test_stated_location_is_context_not_a_qualifier():
+    question = "Today is 16 november 2025. I am in Timisoara, Romania. How will the weather be next week?"
+    assert _routed_tool(question) == "get_weather_info_for_the_next_n_days"
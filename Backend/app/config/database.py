@@ -50,6 +50,8 @@ class DatabaseManager:
         await self.db.farmers.create_index("cnp", unique=True)
         await self.db.farmers.create_index("email")
         await self.db.farmers.create_index("created_at")
+        await self.db.farmers.create_index("birth_month_day")
+        await self.db.farmers.create_index("payday")
         
         # Documents collection indexes
         await self.db.documents.create_index("farmer_id")
@@ -70,6 +72,13 @@ class DatabaseManager:
         await self.db.harvest_logs.create_index([("date", -1)])
         await self.db.harvest_logs.create_index("equipment.farmer_id")
         
+        # Weather logs: native dates, one document per (location, date)
+        # (the plain date index is rebuilt by scripts/import_weather_data.py --migrate)
+        await self.db.weather_logs.create_index([("location", 1), ("date", 1)], unique=True)
+        
+        # Precomputed per-employee daily hours (maintained on harvest log writes)
+        await self.db.employee_daily_hours.create_index("date")
+        
         logger.info("Database indexes created successfully")
     
     def get_database(self) -> AsyncIOMotorDatabase:
@@ -5,6 +5,9 @@ import logging
 
 from .config.settings import settings
 from .config.database import db_manager
+from .services.harvest_service import HarvestService, statistics_cache
+from .services.harvest_feed_service import harvest_feed
+from .services.data_versions import bump_data_version
 from .routes import (
     farmer_routes, 
     document_routes, 
@@ -32,11 +35,39 @@ async def lifespan(app: FastAPI):
     """Handle startup and shutdown events"""
     # Startup
     await init_db()
+    await ensure_employee_daily_hours()
+    await start_harvest_feed()
     yield
     # Shutdown
+    await harvest_feed.stop()
     await close_db()
 
 
+async def ensure_employee_daily_hours():
+    """Build the precomputed employee_daily_hours collection on a fresh database"""
+    try:
+        db = db_manager.get_database()
+    except RuntimeError:
+        return
+    
+    rows = await HarvestService(db).ensure_employee_daily_hours()
+    if rows is not None:
+        logger.info(f"Built employee_daily_hours from harvest_logs: {rows} rows")
+
+
+async def start_harvest_feed():
+    """Start the harvest_logs change stream and wire downstream invalidation"""
+    try:
+        db = db_manager.get_database()
+    except RuntimeError:
+        logger.warning("MongoDB not initialized - live harvest feed disabled")
+        return
+    
+    harvest_feed.add_listener(statistics_cache.invalidate)
+    harvest_feed.add_listener(lambda event: bump_data_version(db, "harvest_logs"), leader_only=True)
+    await harvest_feed.start(db)
+
+
 # Create FastAPI app
 app = FastAPI(
     title=settings.PROJECT_NAME,
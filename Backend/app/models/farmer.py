@@ -1,10 +1,43 @@
 """Farmer data models"""
-from pydantic import BaseModel, Field, EmailStr, field_validator
+from pydantic import BaseModel, Field, EmailStr, field_validator, model_validator
 from typing import Optional
 from datetime import datetime
 from enum import Enum
 
 
+def birth_month_day_from_cnp(cnp) -> Optional[int]:
+    """
+    Birthday as MMDD (e.g. 0315 -> 315) from CNP digits 3-6.
+    Stored on farmer documents so birthday lookups can use an index.
+    """
+    cnp = str(cnp or "").strip()
+    if len(cnp) < 7 or not cnp[3:7].isdigit():
+        return None
+
+    month, day = int(cnp[3:5]), int(cnp[5:7])
+    if not (1 <= month <= 12 and 1 <= day <= 31):
+        return None
+    return month * 100 + day
+
+
+def payday_from_value(payday) -> Optional[int]:
+    """
+    Day of month (1-31) from an int or a numeric string.
+    Blank, non-numeric or out of range values are stored as None.
+    """
+    if isinstance(payday, str):
+        payday = payday.strip()
+        if not payday.isdigit():
+            return None
+    if payday is None or isinstance(payday, bool):
+        return None
+    try:
+        payday = int(payday)
+    except (TypeError, ValueError):
+        return None
+    return payday if 1 <= payday <= 31 else None
+
+
 class ExperienceLevel(str, Enum):
     """Farmer experience level"""
     BEGINNER = "beginner"
@@ -114,10 +147,27 @@ class FarmerResponse(FarmerBase):
 
 
 class Farmer(FarmerBase):
-    """Internal farmer model with metadata"""
+    """
+    Internal farmer model with metadata
+    
+    birth_month_day is derived from the CNP here. Code that writes farmer
+    documents without this model (import and backfill scripts) must set it
+    with birth_month_day_from_cnp whenever it writes a CNP, and store payday
+    through payday_from_value: the indexed birthday/payday lookups of the
+    MCP employees tools read only these two fields. It must also call
+    data_versions.bump_data_version(db, "farmers"), which invalidates the
+    cached answers of the AI employees domain.
+    """
     id: Optional[str] = Field(None, alias="_id")
+    birth_month_day: Optional[int] = None  # MMDD derived from CNP (indexed)
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
     
     class Config:
         populate_by_name = True
+    
+    @model_validator(mode='after')
+    def set_birth_month_day(self):
+        """Keep birth_month_day in sync with the CNP"""
+        self.birth_month_day = birth_month_day_from_cnp(self.cnp)
+        return self
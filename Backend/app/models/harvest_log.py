@@ -140,6 +140,12 @@ class HarvestLogResponse(HarvestLogBase):
         }
 
 
+# Response fields (by alias) that can be selected through `fields=`
+HARVEST_LOG_FIELDS = tuple(
+    field.alias or name for name, field in HarvestLogResponse.model_fields.items()
+)
+
+
 class HarvestLog(HarvestLogBase):
     """Internal harvest log model with metadata"""
     id: Optional[str] = Field(None, alias="_id")
@@ -1,16 +1,24 @@
 """Harvest log API routes"""
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import JSONResponse, StreamingResponse
 from typing import List, Optional
 from datetime import date
+import asyncio
+import json
 
 from ..models.harvest_log import HarvestLogCreate, HarvestLogUpdate, HarvestLogResponse
 from ..services.harvest_service import HarvestService
+from ..services.harvest_feed_service import harvest_feed
+from ..services.correlation_service import CorrelationService
 from ..config.database import get_db
 from motor.motor_asyncio import AsyncIOMotorDatabase
 
 
 router = APIRouter(prefix="/harvest-logs", tags=["harvest-logs"])
 
+# Seconds between SSE keep-alive comments when no event arrives
+FEED_KEEPALIVE_SECONDS = 15
+
 
 @router.post("/", response_model=HarvestLogResponse, status_code=status.HTTP_201_CREATED)
 async def create_harvest_log(
@@ -54,22 +62,55 @@ async def get_harvest_log_by_date(
     return log
 
 
-@router.get("/", response_model=List[HarvestLogResponse])
+@router.get(
+    "/",
+    response_model=None,
+    response_class=JSONResponse,
+    responses={
+        200: {
+            "model": List[HarvestLogResponse],
+            "description": "Harvest logs, newest first. With `fields`, each object only has "
+                           "`_id` and the requested fields."
+        }
+    }
+)
 async def list_harvest_logs(
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=500),
+    fields: Optional[str] = Query(
+        None,
+        description="Comma-separated list of fields to return (e.g. date,total_kg_harvested,fuel_cost)"
+    ),
     db: AsyncIOMotorDatabase = Depends(get_db)
 ):
-    """List harvest logs with optional date range filtering"""
+    """
+    List harvest logs with optional date range filtering and field selection.
+    
+    Without `fields` every object has the HarvestLogResponse shape; with
+    `fields` the objects are partial: `_id` plus the requested fields only.
+    """
     service = HarvestService(db)
-    return await service.list_harvest_logs(
-        start_date=start_date,
-        end_date=end_date,
-        skip=skip,
-        limit=limit
-    )
+    selected_fields = [f.strip() for f in fields.split(",") if f.strip()] if fields else None
+    
+    try:
+        logs = await service.list_harvest_logs_raw(
+            start_date=start_date,
+            end_date=end_date,
+            skip=skip,
+            limit=limit,
+            fields=selected_fields
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    # Documents are already in response shape - return them directly so
+    # FastAPI does not validate every row against response_model again
+    return JSONResponse(content=logs)
 
 
 @router.put("/{log_id}", response_model=HarvestLogResponse)
@@ -131,3 +172,83 @@ async def get_equipment_usage_stats(
         end_date=end_date
     )
 
+
+@router.get("/statistics/weather-correlation")
+async def get_weather_correlation(
+    start_date: date,
+    end_date: date,
+    max_lag_days: int = Query(3, ge=0, le=30),
+    rolling_window_days: int = Query(7, ge=1, le=90),
+    location: Optional[str] = None,
+    db: AsyncIOMotorDatabase = Depends(get_db)
+):
+    """Correlations between temperature and daily yield per crop / fuel consumption"""
+    service = CorrelationService(db)
+    try:
+        return await service.get_weather_correlation(
+            start_date=start_date,
+            end_date=end_date,
+            max_lag_days=max_lag_days,
+            rolling_window_days=rolling_window_days,
+            location=location
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+
+@router.get("/feed/stream")
+async def stream_harvest_feed(request: Request):
+    """Server-Sent Events stream of harvest log inserts, updates and deletes"""
+    async def event_stream():
+        # Subscribed inside the generator: if the client leaves before the body
+        # starts, the generator never runs and there is no queue to leak
+        queue = harvest_feed.subscribe()
+        try:
+            yield "retry: 3000\n\n"
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=FEED_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"event: {event['operation']}\ndata: {json.dumps(event)}\n\n"
+        finally:
+            harvest_feed.unsubscribe(queue)
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.websocket("/feed/ws")
+async def harvest_feed_websocket(websocket: WebSocket):
+    """WebSocket stream of harvest log inserts, updates and deletes"""
+    await websocket.accept()
+    queue = harvest_feed.subscribe()
+    
+    async def forward_events():
+        while True:
+            await websocket.send_json(await queue.get())
+    
+    async def wait_for_disconnect():
+        # Clients only listen; incoming frames are read so a disconnect is seen
+        # right away, not only when the next event is sent
+        while (await websocket.receive())["type"] != "websocket.disconnect":
+            pass
+    
+    tasks = {asyncio.create_task(forward_events()), asyncio.create_task(wait_for_disconnect())}
+    try:
+        done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            error = task.exception()
+            if error is not None and not isinstance(error, WebSocketDisconnect):
+                raise error
+    finally:
+        for task in tasks:
+            task.cancel()
+        harvest_feed.unsubscribe(queue)
@@ -0,0 +1,75 @@
+"""Weather - harvest correlation service (temperature vs. daily yield and fuel)"""
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from typing import Optional, List
+from datetime import datetime, date, timedelta
+
+from .harvest_service import statistics_cache
+from .data_versions import get_data_version
+from .correlation import weather_harvest_pipeline, correlation_report
+
+MAX_LAG_DAYS = 30
+MAX_ROLLING_WINDOW_DAYS = 90
+
+
+class CorrelationService:
+    """
+    Joins the weather_logs of one location and harvest_logs on the native date
+    and computes, with NumPy on a continuous daily axis (missing days are NaN):
+    lagged correlations, rolling means and linear regressions per crop and for fuel.
+    The aggregation and the statistics live in `correlation`, generated from the
+    MCP server's module by scripts/sync_correlation.py.
+    """
+
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self.db = db
+
+    async def get_weather_correlation(
+        self,
+        start_date: date,
+        end_date: date,
+        max_lag_days: int = 3,
+        rolling_window_days: int = 7,
+        location: Optional[str] = None
+    ) -> dict:
+        """Correlation report for a window, cached until the harvest feed or a weather import changes it"""
+        if end_date < start_date:
+            raise ValueError("end_date must not be before start_date")
+        if not 0 <= max_lag_days <= MAX_LAG_DAYS:
+            raise ValueError(f"max_lag_days must be between 0 and {MAX_LAG_DAYS}")
+        if not 1 <= rolling_window_days <= MAX_ROLLING_WINDOW_DAYS:
+            raise ValueError(f"rolling_window_days must be between 1 and {MAX_ROLLING_WINDOW_DAYS}")
+
+        # Lagged correlations need the weather of the max_lag_days before the window
+        load_start = start_date - timedelta(days=max_lag_days)
+
+        # Same (statistic, start, end, harvest version) keys as HarvestService, so
+        # statistics_cache.invalidate drops them by date; weather imports bump
+        # data_versions.weather_logs, which is part of the statistic name
+        harvest_version = await get_data_version(self.db, "harvest_logs")
+        weather_version = await get_data_version(self.db, "weather_logs")
+        cache_key = (
+            f"weather_correlation:{max_lag_days}:{rolling_window_days}:{location}:{weather_version}",
+            load_start,
+            end_date,
+            harvest_version
+        )
+        cached = statistics_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        rows = await self._joined_rows(load_start, end_date, location)
+        report = {
+            "start_date": start_date.isoformat(),
+            "end_date": end_date.isoformat(),
+            **correlation_report(rows, max_lag_days, rolling_window_days, window_start=start_date)
+        }
+        statistics_cache.set(cache_key, report)
+        return report
+
+    async def _joined_rows(self, start_date: date, end_date: date, location: Optional[str]) -> List[dict]:
+        pipeline = weather_harvest_pipeline(
+            datetime.combine(start_date, datetime.min.time()),
+            datetime.combine(end_date + timedelta(days=1), datetime.min.time()),
+            location
+        )
+        return await self.db.weather_logs.aggregate(pipeline).to_list(None)
@@ -0,0 +1,18 @@
+"""Data-version stamps (`data_versions` collection) compared by downstream caches"""
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from datetime import datetime
+
+
+async def bump_data_version(db: AsyncIOMotorDatabase, collection_name: str):
+    """Increment the data-version stamp that downstream caches compare against"""
+    await db.data_versions.update_one(
+        {"_id": collection_name},
+        {"$inc": {"version": 1}, "$set": {"updated_at": datetime.utcnow()}},
+        upsert=True
+    )
+
+
+async def get_data_version(db: AsyncIOMotorDatabase, collection_name: str) -> int:
+    """Current data-version stamp of a collection (0 when it was never bumped)"""
+    doc = await db.data_versions.find_one({"_id": collection_name}, {"version": 1})
+    return doc.get("version", 0) if doc else 0
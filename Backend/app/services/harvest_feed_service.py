@@ -0,0 +1,269 @@
+"""Live harvest feed - MongoDB change streams on harvest_logs"""
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError, OperationFailure, PyMongoError
+from fastapi.encoders import jsonable_encoder
+from bson import ObjectId
+from typing import Optional, Callable, Awaitable, Union, List, Set, Tuple
+from datetime import datetime, timedelta
+import asyncio
+import inspect
+import logging
+import os
+import socket
+
+from .harvest_service import HarvestService
+
+logger = logging.getLogger(__name__)
+
+# Change stream error codes meaning the stored resume token can no longer be used
+RESUME_TOKEN_INVALID_CODES = {260, 280, 286}
+
+# Change streams need a replica set or sharded cluster (standalone mongod)
+CHANGE_STREAMS_UNSUPPORTED_CODES = {40573}
+
+FeedListener = Callable[[dict], Union[None, Awaitable[None]]]
+
+
+class HarvestFeedService:
+    """
+    Watches the harvest_logs collection and fans change events out to
+    subscribers (SSE / WebSocket clients) and invalidation listeners.
+
+    Every uvicorn worker watches the stream for its own subscribers and
+    caches. One of them - the holder of a lease in
+    `change_stream_checkpoints` - is the leader: only it runs the
+    leader-only listeners (data-version bumps) and checkpoints the resume
+    token, so a write is counted once and a restarted leader picks up
+    exactly where the previous one stopped. Other workers watch from "now".
+    """
+
+    CHECKPOINT_ID = "harvest_logs"
+    LEASE_ID = "harvest_logs_leader"
+
+    def __init__(
+        self,
+        subscriber_queue_size: int = 100,
+        checkpoint_interval_seconds: float = 1.0,
+        max_await_time_ms: int = 500,
+        lease_seconds: float = 30.0
+    ):
+        self.subscriber_queue_size = subscriber_queue_size
+        self.checkpoint_interval_seconds = checkpoint_interval_seconds
+        self.max_await_time_ms = max_await_time_ms
+        self.lease_seconds = lease_seconds
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+
+        self.db: Optional[AsyncIOMotorDatabase] = None
+        self._task: Optional[asyncio.Task] = None
+        self._subscribers: Set[asyncio.Queue] = set()
+        self._listeners: List[Tuple[FeedListener, bool]] = []
+        self._resume_token: Optional[dict] = None
+        self._last_checkpoint: float = 0.0
+        self._is_leader = False
+        self._lease_renewed_at: float = 0.0
+
+    @property
+    def is_leader(self) -> bool:
+        return self._is_leader
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self, db: AsyncIOMotorDatabase):
+        """Start watching harvest_logs in the background"""
+        if self.running:
+            return
+
+        self.db = db
+        self._task = asyncio.create_task(self._run())
+        logger.info(f"Harvest feed started (worker {self.worker_id})")
+
+    async def stop(self):
+        """Stop watching and persist the last resume token"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        if self._is_leader:
+            await self._save_resume_token(force=True)
+            await self._release_lease()
+        logger.info("Harvest feed stopped")
+
+    def subscribe(self) -> asyncio.Queue:
+        """Register a subscriber queue that receives every feed event"""
+        queue = asyncio.Queue(maxsize=self.subscriber_queue_size)
+        self._subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        """Remove a subscriber queue"""
+        self._subscribers.discard(queue)
+
+    def add_listener(self, listener: FeedListener, leader_only: bool = False):
+        """
+        Register a callback (sync or async) invoked for every event.
+
+        Per-process work (e.g. local cache invalidation) runs in every worker;
+        leader_only=True is for shared side effects such as data-version bumps.
+        """
+        self._listeners.append((listener, leader_only))
+
+    async def _run(self):
+        """Watch loop with reconnect and backoff"""
+        backoff = 1.0
+        while True:
+            try:
+                await self._watch()
+                backoff = 1.0
+                continue
+            except asyncio.CancelledError:
+                raise
+            except OperationFailure as e:
+                if e.code in CHANGE_STREAMS_UNSUPPORTED_CODES:
+                    # Writes through the API still invalidate caches and bump data versions
+                    logger.warning(f"Harvest feed disabled - change streams need a replica set: {e}")
+                    await self._release_lease()
+                    return
+                if e.code in RESUME_TOKEN_INVALID_CODES:
+                    logger.warning(f"Harvest feed resume token is no longer valid, restarting from now: {e}")
+                    self._resume_token = None
+                    if self._is_leader:
+                        await self._save_resume_token(force=True)
+                    continue
+                logger.error(f"Harvest feed change stream failed: {e}")
+            except PyMongoError as e:
+                logger.error(f"Harvest feed change stream failed: {e}")
+
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, 30.0)
+
+    async def _watch(self):
+        """
+        Consume the change stream until it errors, the task is cancelled or
+        this worker gains or loses the leader lease (the stream is then
+        reopened: the leader resumes from the checkpoint, others from now)
+        """
+        was_leader = await self._renew_lease()
+        self._resume_token = await self._load_resume_token() if was_leader else None
+
+        async with self.db.harvest_logs.watch(
+            full_document="updateLookup",
+            resume_after=self._resume_token,
+            max_await_time_ms=self.max_await_time_ms
+        ) as stream:
+            while stream.alive:
+                change = await stream.try_next()
+                if change is not None:
+                    await self._dispatch(self._to_event(change))
+                    self._resume_token = stream.resume_token
+                    if self._is_leader:
+                        await self._save_resume_token()
+
+                if await self._renew_lease() != was_leader:
+                    return
+
+    async def _renew_lease(self) -> bool:
+        """Take or extend the leader lease (at most every lease_seconds / 3); returns is_leader"""
+        loop_time = asyncio.get_running_loop().time()
+        if loop_time - self._lease_renewed_at < self.lease_seconds / 3:
+            return self._is_leader
+
+        now = datetime.utcnow()
+        try:
+            lease = await self.db.change_stream_checkpoints.find_one_and_update(
+                {"_id": self.LEASE_ID, "$or": [{"owner": self.worker_id}, {"expires_at": {"$lt": now}}]},
+                {"$set": {"owner": self.worker_id, "expires_at": now + timedelta(seconds=self.lease_seconds)}},
+                upsert=True,
+                return_document=ReturnDocument.AFTER
+            )
+            leader = lease is not None and lease.get("owner") == self.worker_id
+        except DuplicateKeyError:
+            # Held by another worker: the filter did not match, and the upsert collided with its document
+            leader = False
+
+        if leader != self._is_leader:
+            logger.info(f"Harvest feed worker {self.worker_id} is {'now' if leader else 'no longer'} the leader")
+        self._is_leader = leader
+        self._lease_renewed_at = loop_time
+        return leader
+
+    async def _release_lease(self):
+        if self.db is None or not self._is_leader:
+            return
+        await self.db.change_stream_checkpoints.delete_one({"_id": self.LEASE_ID, "owner": self.worker_id})
+        self._is_leader = False
+
+    async def _dispatch(self, event: dict):
+        """Notify listeners first (so caches are fresh), then push to subscribers"""
+        for listener, leader_only in self._listeners:
+            if leader_only and not self._is_leader:
+                continue
+            try:
+                result = listener(event)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:
+                logger.error(f"Harvest feed listener failed: {e}")
+
+        for queue in list(self._subscribers):
+            if queue.full():
+                # Slow consumer - drop its oldest event instead of blocking the feed
+                try:
+                    queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    pass
+            queue.put_nowait(event)
+
+    @staticmethod
+    def _to_event(change: dict) -> dict:
+        """Convert a raw change stream document into a JSON-ready feed event"""
+        document = change.get("fullDocument")
+        log_date = None
+
+        if document:
+            document = HarvestService._add_computed_fields(dict(document))
+            document["_id"] = str(document["_id"])
+            if isinstance(document.get("date"), datetime):
+                log_date = document["date"].date().isoformat()
+                document["date"] = log_date
+            document = jsonable_encoder(document, custom_encoder={ObjectId: str})
+
+        cluster_time = change.get("clusterTime")
+
+        return {
+            "operation": change.get("operationType"),
+            "log_id": str(change.get("documentKey", {}).get("_id")),
+            "date": log_date,
+            "cluster_time": cluster_time.as_datetime().isoformat() if cluster_time else None,
+            "updated_fields": list(change.get("updateDescription", {}).get("updatedFields", {}).keys()),
+            "document": document
+        }
+
+    async def _load_resume_token(self) -> Optional[dict]:
+        checkpoint = await self.db.change_stream_checkpoints.find_one({"_id": self.CHECKPOINT_ID})
+        return checkpoint.get("resume_token") if checkpoint else None
+
+    async def _save_resume_token(self, force: bool = False):
+        if self.db is None:
+            return
+
+        loop_time = asyncio.get_running_loop().time()
+        if not force and loop_time - self._last_checkpoint < self.checkpoint_interval_seconds:
+            return
+
+        await self.db.change_stream_checkpoints.update_one(
+            {"_id": self.CHECKPOINT_ID},
+            {"$set": {"resume_token": self._resume_token, "updated_at": datetime.utcnow()}},
+            upsert=True
+        )
+        self._last_checkpoint = loop_time
+
+
+# Global harvest feed instance
+harvest_feed = HarvestFeedService()
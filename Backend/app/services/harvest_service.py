@@ -1,13 +1,93 @@
 """Harvest log service - business logic for daily harvest operations"""
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from bson import ObjectId
-from typing import Optional, List
+from typing import Optional, List, Tuple
 from datetime import datetime, date, timedelta
+import time
 
 from ..models.harvest_log import (
     HarvestLog, HarvestLogCreate, HarvestLogUpdate, 
-    HarvestLogResponse, EquipmentUsage
+    HarvestLogResponse, EquipmentUsage, HARVEST_LOG_FIELDS
 )
+from .data_versions import bump_data_version, get_data_version
+
+
+CROP_HECTARE_FIELDS = [
+    "wheat_harvested_hectares",
+    "sunflower_harvested_hectares",
+    "beans_harvested_hectares",
+    "tomatoes_harvested_hectares",
+]
+
+CROP_KG_FIELDS = [
+    "wheat_harvested_kg",
+    "sunflower_harvested_kg",
+    "beans_harvested_kg",
+    "tomatoes_harvested_kg",
+]
+
+# Totals added by _add_computed_fields / _computed_fields_stage
+COMPUTED_FIELDS = (
+    "total_hectares_harvested",
+    "total_kg_harvested",
+    "total_work_hours",
+    "total_fuel_consumed",
+    "fuel_cost",
+)
+
+
+class StatisticsCache:
+    """
+    In-process cache for aggregated harvest statistics.
+    
+    Entries are keyed by (statistic, start_date, end_date, data_version).
+    The harvest_logs data version is bumped on every write, so an entry of
+    another worker process stops matching as well; local entries are also
+    dropped right away by the write paths and the harvest feed.
+    """
+    
+    def __init__(self, ttl_seconds: float = 300.0, max_entries: int = 256):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: dict = {}
+    
+    def get(self, key: Tuple) -> Optional[dict]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            self._entries.pop(key, None)
+            return None
+        
+        return value
+    
+    def set(self, key: Tuple, value: dict) -> None:
+        if len(self._entries) >= self.max_entries:
+            # Drop the entry closest to expiry
+            oldest_key = min(self._entries, key=lambda k: self._entries[k][0])
+            self._entries.pop(oldest_key, None)
+        
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+    
+    def invalidate(self, event: Optional[dict] = None) -> None:
+        """Drop entries affected by a harvest feed event (all entries when the date is unknown)"""
+        changed = event.get("date") if event else None
+        if not changed:
+            self._entries.clear()
+            return
+        
+        changed_date = date.fromisoformat(changed)
+        for key in list(self._entries):
+            _, start_date, end_date, _ = key
+            if (start_date is None or start_date <= changed_date) and \
+                    (end_date is None or changed_date <= end_date):
+                self._entries.pop(key, None)
+
+
+# Shared by all HarvestService instances, invalidated by the harvest feed
+statistics_cache = StatisticsCache()
 
 
 class HarvestService:
@@ -44,6 +124,8 @@ class HarvestService:
             ]
         
         result = await self.collection.insert_one(harvest_dict)
+        await self._refresh_employee_daily_hours(harvest_dict["date"])
+        await self._harvest_logs_changed(harvest_dict["date"])
         
         created_log = await self.collection.find_one({"_id": result.inserted_id})
         created_log["_id"] = str(created_log["_id"])
@@ -96,14 +178,7 @@ class HarvestService:
         limit: int = 100
     ) -> List[HarvestLogResponse]:
         """List harvest logs with optional date range filtering"""
-        query = {}
-        
-        if start_date or end_date:
-            query["date"] = {}
-            if start_date:
-                query["date"]["$gte"] = datetime.combine(start_date, datetime.min.time())
-            if end_date:
-                query["date"]["$lte"] = datetime.combine(end_date, datetime.max.time())
+        query = self._date_range_query(start_date, end_date)
         
         cursor = self.collection.find(query).sort("date", -1).skip(skip).limit(limit)
         logs = []
@@ -115,6 +190,37 @@ class HarvestService:
         
         return logs
     
+    async def list_harvest_logs_raw(
+        self,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        skip: int = 0,
+        limit: int = 100,
+        fields: Optional[List[str]] = None
+    ) -> List[dict]:
+        """
+        List harvest logs as JSON-ready dicts (lean read path).
+        
+        Computed totals, id and date formatting are done inside the
+        aggregation pipeline, so documents come back in their response shape
+        and skip the per-row Pydantic model construction.
+        """
+        projection = self._build_projection(fields)
+        
+        pipeline = [
+            {"$match": self._date_range_query(start_date, end_date)},
+            {"$sort": {"date": -1}},
+            {"$skip": skip},
+            {"$limit": limit},
+        ]
+        
+        computed = self._computed_fields_stage(projection)
+        if computed:
+            pipeline.append({"$addFields": computed})
+        pipeline.append({"$project": projection})
+        
+        return await self.collection.aggregate(pipeline).to_list(limit)
+    
     async def update_harvest_log(
         self,
         log_id: str,
@@ -149,14 +255,33 @@ class HarvestService:
         if result.matched_count == 0:
             return None
         
-        return await self.get_harvest_log(log_id)
+        updated_log = await self.get_harvest_log(log_id)
+        if updated_log is None:
+            # Deleted between the update and the read: the delete path refreshes its own day
+            await self._harvest_logs_changed(None)
+            return None
+        
+        if "equipment" in update_data:
+            await self._refresh_employee_daily_hours(updated_log.date)
+        await self._harvest_logs_changed(updated_log.date)
+        
+        return updated_log
     
     async def delete_harvest_log(self, log_id: str) -> bool:
         """Delete harvest log"""
         if not ObjectId.is_valid(log_id):
             return False
         
+        log = await self.collection.find_one({"_id": ObjectId(log_id)}, {"date": 1})
+        if not log:
+            return False
+        
         result = await self.collection.delete_one({"_id": ObjectId(log_id)})
+        if result.deleted_count > 0:
+            if log.get("date"):
+                await self._refresh_employee_daily_hours(log["date"])
+            await self._harvest_logs_changed(log.get("date"))
+        
         return result.deleted_count > 0
     
     async def get_harvest_statistics(
@@ -165,18 +290,24 @@ class HarvestService:
         end_date: Optional[date] = None
     ) -> dict:
         """Get harvest statistics for a date range"""
-        query = {}
-        
-        if start_date or end_date:
-            query["date"] = {}
-            if start_date:
-                query["date"]["$gte"] = datetime.combine(start_date, datetime.min.time())
-            if end_date:
-                query["date"]["$lte"] = datetime.combine(end_date, datetime.max.time())
-        
+        version = await get_data_version(self.db, "harvest_logs")
+        cache_key = ("overview", start_date, end_date, version)
+        cached = statistics_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        stats = await self._compute_harvest_statistics(start_date, end_date)
+        statistics_cache.set(cache_key, stats)
+        return stats
+    
+    async def _compute_harvest_statistics(
+        self,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None
+    ) -> dict:
         # Aggregate statistics
         pipeline = [
-            {"$match": query},
+            {"$match": self._date_range_query(start_date, end_date)},
             {"$unwind": {"path": "$equipment", "preserveNullAndEmptyArrays": True}},
             {"$group": {
                 "_id": None,
@@ -240,17 +371,23 @@ class HarvestService:
         end_date: Optional[date] = None
     ) -> dict:
         """Get equipment usage statistics"""
-        query = {}
-        
-        if start_date or end_date:
-            query["date"] = {}
-            if start_date:
-                query["date"]["$gte"] = datetime.combine(start_date, datetime.min.time())
-            if end_date:
-                query["date"]["$lte"] = datetime.combine(end_date, datetime.max.time())
-        
+        version = await get_data_version(self.db, "harvest_logs")
+        cache_key = ("equipment", start_date, end_date, version)
+        cached = statistics_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        stats = await self._compute_equipment_usage_stats(start_date, end_date)
+        statistics_cache.set(cache_key, stats)
+        return stats
+    
+    async def _compute_equipment_usage_stats(
+        self,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None
+    ) -> dict:
         pipeline = [
-            {"$match": query},
+            {"$match": self._date_range_query(start_date, end_date)},
             {"$unwind": "$equipment"},
             {"$group": {
                 "_id": "$equipment.equipment_type",
@@ -311,6 +448,226 @@ class HarvestService:
                 f"The following farmer_ids in equipment do not exist in farmers database: {', '.join(invalid_farmer_ids)}"
             )
     
+    async def _harvest_logs_changed(self, log_date: Optional[date]) -> None:
+        """
+        Invalidate statistics and bump the harvest_logs data version after a write.
+        
+        Done here as well as in the harvest feed: on a standalone mongod there
+        is no change stream, and the feed never sees these writes.
+        """
+        if isinstance(log_date, datetime):
+            log_date = log_date.date()
+        statistics_cache.invalidate({"date": log_date.isoformat()} if log_date else None)
+        await bump_data_version(self.db, "harvest_logs")
+    
+    async def _refresh_employee_daily_hours(self, log_date: date) -> None:
+        """Recompute the precomputed employee_daily_hours rows for one day"""
+        day_start = datetime.combine(
+            log_date.date() if isinstance(log_date, datetime) else log_date,
+            datetime.min.time()
+        )
+        day_end = day_start + timedelta(days=1)
+        
+        await self.db.employee_daily_hours.delete_many({"date": {"$gte": day_start, "$lt": day_end}})
+        
+        pipeline = self.employee_daily_hours_pipeline(day_start, day_end) + [
+            {"$set": {"updated_at": "$$NOW"}},
+            {"$merge": {
+                "into": "employee_daily_hours",
+                "whenMatched": "replace",
+                "whenNotMatched": "insert"
+            }}
+        ]
+        await self.collection.aggregate(pipeline).to_list(None)
+    
+    async def rebuild_employee_daily_hours(self) -> int:
+        """
+        Rebuild the whole employee_daily_hours collection from harvest_logs.
+        
+        Needed after harvest logs are written around this service (seed
+        imports, migrations). Returns the number of (day, employee) rows.
+        """
+        await self.db.employee_daily_hours.delete_many({})
+        
+        pipeline = self.employee_daily_hours_pipeline() + [
+            {"$set": {"updated_at": "$$NOW"}},
+            {"$merge": {
+                "into": "employee_daily_hours",
+                "whenMatched": "replace",
+                "whenNotMatched": "insert"
+            }}
+        ]
+        await self.collection.aggregate(pipeline).to_list(None)
+        await self.db.employee_daily_hours.create_index("date")
+        
+        return await self.db.employee_daily_hours.count_documents({})
+    
+    async def ensure_employee_daily_hours(self) -> Optional[int]:
+        """
+        Build employee_daily_hours when it is empty but harvest logs exist.
+        
+        The MCP employees tools only read the precomputed collection, so a
+        fresh database must not leave it empty. Returns the row count when
+        a rebuild ran, None otherwise.
+        """
+        if await self.db.employee_daily_hours.find_one({}, {"_id": 1}):
+            return None
+        if not await self.collection.find_one({}, {"_id": 1}):
+            return None
+        return await self.rebuild_employee_daily_hours()
+    
+    @staticmethod
+    def employee_daily_hours_pipeline(
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> List[dict]:
+        """
+        harvest_logs -> one row per (day, employee) with the hours per equipment type.
+        
+        The only definition of the employee_daily_hours document shape: the
+        MCP employees tools read the collection and never rebuild it.
+        """
+        match = {}
+        if start or end:
+            match["date"] = {}
+            if start:
+                match["date"]["$gte"] = start
+            if end:
+                match["date"]["$lt"] = end
+        
+        return [
+            {"$match": match},
+            {"$unwind": "$equipment"},
+            {"$match": {"equipment.farmer_id": {"$nin": [None, ""]}}},
+            {"$group": {
+                "_id": {
+                    "day": {"$dateToString": {"format": "%Y-%m-%d", "date": "$date"}},
+                    "farmer_id": "$equipment.farmer_id",
+                    "equipment_type": {"$ifNull": ["$equipment.equipment_type", "Unknown"]}
+                },
+                "date": {"$first": "$date"},
+                "work_hours": {"$sum": {"$ifNull": ["$equipment.work_hours", 0]}}
+            }},
+            {"$sort": {"_id.equipment_type": 1}},
+            {"$group": {
+                "_id": {"day": "$_id.day", "farmer_id": "$_id.farmer_id"},
+                "date": {"$first": "$date"},
+                "tasks": {"$push": {"equipment_type": "$_id.equipment_type", "work_hours": "$work_hours"}},
+                "total_work_hours_for_day": {"$sum": "$work_hours"}
+            }}
+        ]
+    
+    @staticmethod
+    def _date_range_query(
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None
+    ) -> dict:
+        """Build the $match filter for an optional date range"""
+        query = {}
+        
+        if start_date or end_date:
+            query["date"] = {}
+            if start_date:
+                query["date"]["$gte"] = datetime.combine(start_date, datetime.min.time())
+            if end_date:
+                query["date"]["$lte"] = datetime.combine(end_date, datetime.max.time())
+        
+        return query
+    
+    @staticmethod
+    def _build_projection(fields: Optional[List[str]] = None) -> dict:
+        """
+        Build the $project stage for the lean read path.
+        
+        Values are rendered exactly as HarvestLogResponse serializes them:
+        model defaults for missing fields (null notes, 0.0 amounts, empty
+        equipment), floats as doubles, equipment reduced to the
+        EquipmentUsage fields and timestamps in isoformat() form.
+        """
+        selected = list(HARVEST_LOG_FIELDS) if not fields else fields
+        
+        unknown = set(selected) - set(HARVEST_LOG_FIELDS)
+        if unknown:
+            raise ValueError(
+                f"Unknown harvest log fields requested: {', '.join(sorted(unknown))}"
+            )
+        
+        projection = {"_id": {"$toString": "$_id"}}
+        for field in selected:
+            if field == "_id":
+                continue
+            if field in COMPUTED_FIELDS:
+                # Filled in by _computed_fields_stage
+                projection[field] = 1
+            elif field == "date":
+                projection["date"] = {"$dateToString": {"format": "%Y-%m-%d", "date": "$date"}}
+            elif field in ("created_at", "updated_at"):
+                projection[field] = HarvestService._isoformat_expression(f"${field}")
+            elif field == "notes":
+                projection["notes"] = {"$ifNull": ["$notes", None]}
+            elif field == "equipment":
+                projection["equipment"] = {"$map": {
+                    "input": {"$ifNull": ["$equipment", []]},
+                    "as": "eq",
+                    "in": {
+                        "equipment_type": "$$eq.equipment_type",
+                        "farmer_id": "$$eq.farmer_id",
+                        "work_hours": {"$toDouble": "$$eq.work_hours"},
+                        "fuel_consumed_liters": {"$toDouble": "$$eq.fuel_consumed_liters"}
+                    }
+                }}
+            else:
+                projection[field] = {"$toDouble": {"$ifNull": [f"${field}", 0.0]}}
+        
+        return projection
+    
+    @staticmethod
+    def _isoformat_expression(value: str) -> dict:
+        """
+        datetime.isoformat() in aggregation: no fraction when it is zero,
+        otherwise microseconds (MongoDB stores milliseconds, so always NNN000)
+        """
+        return {"$cond": [
+            {"$eq": [{"$millisecond": value}, 0]},
+            {"$dateToString": {"format": "%Y-%m-%dT%H:%M:%S", "date": value}},
+            {"$concat": [
+                {"$dateToString": {"format": "%Y-%m-%dT%H:%M:%S.%L", "date": value}},
+                "000"
+            ]}
+        ]}
+    
+    @staticmethod
+    def _computed_fields_stage(projection: dict) -> dict:
+        """
+        Server-side equivalent of _add_computed_fields.
+        
+        Only the totals that survive the projection are computed.
+        """
+        fuel_liters = {"$sum": "$equipment.fuel_consumed_liters"}
+        expressions = {
+            "total_hectares_harvested": {
+                "$add": [{"$ifNull": [f"${f}", 0]} for f in CROP_HECTARE_FIELDS]
+            },
+            "total_kg_harvested": {
+                "$add": [{"$ifNull": [f"${f}", 0]} for f in CROP_KG_FIELDS]
+            },
+            "total_work_hours": {"$round": [{"$sum": "$equipment.work_hours"}, 2]},
+            "total_fuel_consumed": {"$round": [fuel_liters, 2]},
+            "fuel_cost": {
+                "$round": [
+                    {"$multiply": [fuel_liters, {"$ifNull": ["$oil_price_per_liter", 0]}]},
+                    2
+                ]
+            },
+        }
+        
+        # The response model declares every total as float
+        return {
+            field: {"$toDouble": expression}
+            for field, expression in expressions.items()
+            if field in projection
+        }
+    
     @staticmethod
     def _add_computed_fields(log_dict: dict) -> dict:
         """Calculate and add computed fields to log"""
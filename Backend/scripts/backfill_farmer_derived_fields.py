@@ -0,0 +1,56 @@
+"""
+Backfill the derived farmer fields used by the indexed employee lookups:
+`birth_month_day` (MMDD from the CNP) and an integer `payday` (blank or
+invalid values become null).
+
+The seed import fills both for new records; run this once for farmers that
+were inserted before the fields existed.
+
+Usage:
+    python scripts/backfill_farmer_derived_fields.py
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import UpdateOne
+
+from app.config.settings import settings
+from app.models.farmer import birth_month_day_from_cnp, payday_from_value
+from app.services.data_versions import bump_data_version
+
+
+async def main():
+    client = AsyncIOMotorClient(settings.MONGO_API_KEY)
+    db = client[settings.DATABASE_NAME]
+
+    print("Backfilling birth_month_day / payday on farmers...")
+    operations = []
+    async for farmer in db.farmers.find({}, {"cnp": 1, "payday": 1}):
+        update = {"birth_month_day": birth_month_day_from_cnp(farmer.get("cnp"))}
+
+        if "payday" in farmer:
+            update["payday"] = payday_from_value(farmer["payday"])
+
+        operations.append(UpdateOne({"_id": farmer["_id"]}, {"$set": update}))
+
+    if operations:
+        result = await db.farmers.bulk_write(operations, ordered=False)
+        print(f"✓ Farmers updated: {result.modified_count} of {len(operations)}")
+        if result.modified_count:
+            await bump_data_version(db, "farmers")
+    else:
+        print("No farmers found")
+
+    await db.farmers.create_index("birth_month_day")
+    await db.farmers.create_index("payday")
+    print("✓ Indexes on birth_month_day and payday ensured")
+
+    client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
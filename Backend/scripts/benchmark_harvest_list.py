@@ -0,0 +1,76 @@
+"""
+Benchmark the harvest log list endpoints: the model-based path
+(`list_harvest_logs`) against the lean aggregation path (`list_harvest_logs_raw`).
+
+Usage:
+    python scripts/benchmark_harvest_list.py [--limit 500] [--rounds 20] [--fields date,total_kg_harvested]
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from fastapi.encoders import jsonable_encoder
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from app.config.settings import settings
+from app.services.harvest_service import HarvestService
+
+
+async def run_model_path(service: HarvestService, limit: int) -> int:
+    """Current path: full documents -> _add_computed_fields -> HarvestLogResponse -> JSON"""
+    logs = await service.list_harvest_logs(limit=limit)
+    # FastAPI validates against response_model and encodes the result again
+    json.dumps(jsonable_encoder([log.model_dump(by_alias=True) for log in logs]))
+    return len(logs)
+
+
+async def run_lean_path(service: HarvestService, limit: int, fields) -> int:
+    """Lean path: aggregation pipeline -> dicts -> JSON"""
+    logs = await service.list_harvest_logs_raw(limit=limit, fields=fields)
+    json.dumps(logs)
+    return len(logs)
+
+
+async def measure(name: str, rounds: int, func) -> None:
+    # Warm up connection pool and server-side caches
+    await func()
+
+    total_docs = 0
+    start = time.perf_counter()
+    for _ in range(rounds):
+        total_docs += await func()
+    elapsed = time.perf_counter() - start
+
+    docs_per_second = total_docs / elapsed if elapsed > 0 else 0.0
+    print(f"{name:<28} {total_docs:>8} docs  {elapsed:>8.3f}s  {docs_per_second:>12.0f} docs/s")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--limit", type=int, default=500)
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--fields", type=str, default=None)
+    args = parser.parse_args()
+
+    fields = [f.strip() for f in args.fields.split(",")] if args.fields else None
+
+    client = AsyncIOMotorClient(settings.MONGO_API_KEY)
+    db = client[settings.DATABASE_NAME]
+    service = HarvestService(db)
+
+    print(f"Benchmarking harvest log listing (limit={args.limit}, rounds={args.rounds})\n")
+    await measure("model path", args.rounds, lambda: run_model_path(service, args.limit))
+    await measure("lean path (all fields)", args.rounds, lambda: run_lean_path(service, args.limit, None))
+    if fields:
+        await measure("lean path (projected)", args.rounds, lambda: run_lean_path(service, args.limit, fields))
+
+    client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
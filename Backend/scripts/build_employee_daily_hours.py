@@ -0,0 +1,36 @@
+"""
+Rebuild the precomputed employee_daily_hours collection from harvest_logs.
+
+HarvestService keeps the collection up to date on every harvest log write,
+and the API builds it on startup when it is empty; run this after writing
+harvest logs directly into MongoDB (migrations, manual fixes). The MCP
+employees tools read only this collection.
+
+Usage:
+    python scripts/build_employee_daily_hours.py
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from app.config.settings import settings
+from app.services.harvest_service import HarvestService
+
+
+async def main():
+    client = AsyncIOMotorClient(settings.MONGO_API_KEY)
+    db = client[settings.DATABASE_NAME]
+
+    print("Rebuilding employee_daily_hours from harvest_logs...")
+    count = await HarvestService(db).rebuild_employee_daily_hours()
+    print(f"✓ employee_daily_hours: {count} (day, employee) rows")
+
+    client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
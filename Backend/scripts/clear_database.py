@@ -1,5 +1,6 @@
 """
-Script to clear farmers and harvest_logs collections
+Script to clear farmers and harvest_logs collections (and employee_daily_hours,
+which is derived from harvest_logs)
 """
 import asyncio
 from pathlib import Path
@@ -10,6 +11,7 @@ import sys
 sys.path.append(str(Path(__file__).parent.parent))
 
 from app.config.settings import settings
+from app.services.data_versions import bump_data_version
 
 
 async def main():
@@ -40,6 +42,15 @@ async def main():
     result = await db.harvest_logs.delete_many({})
     print(f"[+] Deleted {result.deleted_count} harvest logs")
     
+    # Delete the per-(day, employee) hours precomputed from the harvest logs
+    print("\n[*] Deleting employee daily hours...")
+    result = await db.employee_daily_hours.delete_many({})
+    print(f"[+] Deleted {result.deleted_count} employee daily hours rows")
+    
+    # Drop the cached answers over both collections
+    await bump_data_version(db, "farmers")
+    await bump_data_version(db, "harvest_logs")
+    
     print("\n" + "="*60)
     print("DATABASE CLEANUP COMPLETE!")
     print("="*60 + "\n")
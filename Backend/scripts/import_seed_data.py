@@ -16,6 +16,9 @@ sys.path.append(str(Path(__file__).parent.parent))
 
 from motor.motor_asyncio import AsyncIOMotorClient
 from app.config.settings import settings
+from app.models.farmer import birth_month_day_from_cnp, payday_from_value
+from app.services.harvest_service import HarvestService
+from app.services.data_versions import bump_data_version
 
 
 async def load_json_file(file_path: Path) -> list:
@@ -40,7 +43,7 @@ async def import_workers_as_farmers(db, workers_data: list):
         worker_id = worker.get("id")
         name = worker.get("name", "")
         age = worker.get("age")
-        payday = worker.get("payday")
+        payday = payday_from_value(worker.get("payday"))
         role = worker.get("role", "")
         
         # Split name into first and last name
@@ -62,6 +65,7 @@ async def import_workers_as_farmers(db, workers_data: list):
                     "role": role,
                     "payday": payday,
                     "age": age,
+                    "birth_month_day": birth_month_day_from_cnp(existing.get("cnp")),
                     "updated_at": datetime.utcnow()
                 }}
             )
@@ -72,6 +76,7 @@ async def import_workers_as_farmers(db, workers_data: list):
                 "first_name": first_name,
                 "last_name": last_name,
                 "cnp": cnp,
+                "birth_month_day": birth_month_day_from_cnp(cnp),
                 "email": f"{first_name.lower()}.{last_name.lower()}@farm.ro",
                 "phone": f"07{worker_id:08d}",
                 "age": age,
@@ -231,6 +236,14 @@ async def main():
         # Import harvest logs
         logs_inserted, logs_updated = await import_harvest_logs(db, harvest_data)
         
+        # The logs were written around HarvestService: rebuild its precomputed rows
+        daily_hours_rows = await HarvestService(db).rebuild_employee_daily_hours()
+        print(f"✓ employee_daily_hours: {daily_hours_rows} (day, employee) rows")
+        
+        # Cached answers over farmers / harvest_logs (AI response cache, statistics) are stale now
+        await bump_data_version(db, "farmers")
+        await bump_data_version(db, "harvest_logs")
+        
         # Summary
         print("\n" + "=" * 60)
         print("📊 IMPORT SUMMARY")
@@ -1,17 +1,116 @@
 """
 Script to import weather data from JSON file directly into MongoDB
+
+Weather logs are stored with a native `date` (midnight UTC, same as
+harvest_logs), one document per (location, date), so range queries are
+index scans and weather can be joined to harvest logs with `$lookup`.
+
+Usage:
+    python scripts/import_weather_data.py            # import / upsert the JSON file (migrates string dates first)
+    python scripts/import_weather_data.py --migrate  # only convert existing "YYYY-MM-DD" string dates
 """
+import argparse
 import json
 import sys
 from pathlib import Path
 from datetime import datetime
 from pymongo import MongoClient, ASCENDING
-from pymongo.errors import DuplicateKeyError
+from pymongo.errors import OperationFailure
 
 # Add parent directory to path to import config
 sys.path.append(str(Path(__file__).parent.parent))
 from app.config.settings import settings
 
+# Index of the old schema (unique string date), replaced by (location, date)
+LEGACY_DATE_INDEX = "date_1"
+
+
+def ensure_weather_indexes(weather_collection):
+    """Compound (location, date) unique index plus a plain date index for location-less queries"""
+    existing = weather_collection.index_information()
+    if LEGACY_DATE_INDEX in existing and existing[LEGACY_DATE_INDEX].get("unique"):
+        print(f"Dropping legacy unique index {LEGACY_DATE_INDEX}...")
+        weather_collection.drop_index(LEGACY_DATE_INDEX)
+
+    print("Creating indexes on (location, date) and date...")
+    weather_collection.create_index([("location", ASCENDING), ("date", ASCENDING)], unique=True)
+    weather_collection.create_index([("date", ASCENDING)])
+
+
+def bump_weather_version(db):
+    """Invalidate downstream caches (MCP range cache) after the collection changed"""
+    db.data_versions.update_one(
+        {"_id": "weather_logs"},
+        {"$inc": {"version": 1}, "$set": {"updated_at": datetime.utcnow()}},
+        upsert=True
+    )
+
+
+def build_weather_document(day_data: dict, metadata: dict) -> dict:
+    """Map one day of the merged JSON file onto the weather_logs schema"""
+    data_sources = day_data.get("data_sources") or []
+
+    document = {
+        "location": metadata["location"],
+        "date": datetime.strptime(day_data["date"], "%Y-%m-%d"),
+        "max_temp_celsius": day_data["max_temp_celsius"],
+        "min_temp_celsius": day_data["min_temp_celsius"],
+        "weather_description": day_data.get("weather_description"),
+        "temperature_unit": metadata["temperature_unit"],
+        "data_sources": data_sources,
+        "imported_at": datetime.utcnow()
+    }
+
+    # Per-source readings, when the merged file keeps them next to the merged values
+    readings = {source: day_data[source] for source in data_sources if isinstance(day_data.get(source), dict)}
+    if readings:
+        document["source_readings"] = readings
+
+    return document
+
+
+def convert_string_dates(weather_collection) -> int:
+    """Convert the "YYYY-MM-DD" string dates of the old schema to native dates; returns the count"""
+    legacy_count = weather_collection.count_documents({"date": {"$type": "string"}})
+    print(f"Documents with string dates: {legacy_count}")
+    if not legacy_count:
+        return 0
+
+    result = weather_collection.update_many(
+        {"date": {"$type": "string"}},
+        [{"$set": {
+            "date": {"$dateFromString": {"dateString": "$date", "format": "%Y-%m-%d", "timezone": "UTC"}},
+            "imported_at": {"$cond": [
+                {"$eq": [{"$type": "$imported_at"}, "string"]},
+                {"$dateFromString": {"dateString": "$imported_at", "onError": "$$NOW"}},
+                "$imported_at"
+            ]}
+        }}]
+    )
+    print(f"[*] Converted: {result.modified_count}")
+    return result.modified_count
+
+
+def migrate_weather_dates():
+    """Convert string dates to native dates in place and switch to the new indexes"""
+    print("Connecting to MongoDB...")
+    client = MongoClient(settings.MONGO_API_KEY)
+    db = client[settings.DATABASE_NAME]
+    weather_collection = db['weather_logs']
+
+    convert_string_dates(weather_collection)
+
+    try:
+        ensure_weather_indexes(weather_collection)
+    except OperationFailure as e:
+        print(f"[!] Could not create the (location, date) index - duplicate days per location? {e}")
+        raise
+
+    bump_weather_version(db)
+    print("\n[OK] Weather data migration completed successfully!")
+    client.close()
+
+
 def import_weather_data():
     """Import weather data from merged_weather_timisoara.json into MongoDB"""
     
@@ -23,9 +122,13 @@ def import_weather_data():
     # Create weather_logs collection
     weather_collection = db['weather_logs']
     
-    # Create index on date field for faster queries
-    print("Creating index on date field...")
-    weather_collection.create_index([("date", ASCENDING)], unique=True)
+    # A legacy collection is migrated first: upserting native dates next to
+    # string dates would create a second document per day, and the unique
+    # (location, date) index could then never be built
+    migrated_count = convert_string_dates(weather_collection)
+    
+    # (location, date) for range queries and joins with harvest_logs
+    ensure_weather_indexes(weather_collection)
     
     # Read the JSON file
     json_file_path = Path(__file__).parent.parent / "merged_weather_timisoara.json"
@@ -50,19 +153,7 @@ def import_weather_data():
     print(f"Merged date: {metadata['merged_date']}\n")
     
     # Prepare documents for insertion
-    weather_logs = []
-    for day_data in weather_data.get("data", []):
-        document = {
-            "date": day_data["date"],
-            "max_temp_celsius": day_data["max_temp_celsius"],
-            "min_temp_celsius": day_data["min_temp_celsius"],
-            "data_sources": day_data["data_sources"],
-            "weather_description": day_data.get("weather_description"),
-            "location": metadata["location"],
-            "temperature_unit": metadata["temperature_unit"],
-            "imported_at": datetime.utcnow().isoformat()
-        }
-        weather_logs.append(document)
+    weather_logs = [build_weather_document(day_data, metadata) for day_data in weather_data.get("data", [])]
     
     # Insert documents
     print(f"Inserting {len(weather_logs)} weather records...")
@@ -71,24 +162,29 @@ def import_weather_data():
     skipped_count = 0
     
     for log in weather_logs:
+        day = log["date"].strftime("%Y-%m-%d")
         try:
-            weather_collection.insert_one(log)
-            inserted_count += 1
-            print(f"[+] Inserted: {log['date']} - {log['min_temp_celsius']}C to {log['max_temp_celsius']}C")
-        except DuplicateKeyError:
-            # Update existing record
+            # imported_at changes on every run, so compare only the weather fields
+            values = {k: v for k, v in log.items() if k != "imported_at"}
             result = weather_collection.update_one(
-                {"date": log["date"]},
-                {"$set": log}
+                {"location": log["location"], "date": log["date"]},
+                {"$set": values, "$setOnInsert": {"imported_at": log["imported_at"]}},
+                upsert=True
             )
-            if result.modified_count > 0:
+            if result.upserted_id is not None:
+                inserted_count += 1
+                print(f"[+] Inserted: {day} - {log['min_temp_celsius']}C to {log['max_temp_celsius']}C")
+            elif result.modified_count > 0:
                 updated_count += 1
-                print(f"[*] Updated: {log['date']} - {log['min_temp_celsius']}C to {log['max_temp_celsius']}C")
+                print(f"[*] Updated: {day} - {log['min_temp_celsius']}C to {log['max_temp_celsius']}C")
             else:
                 skipped_count += 1
-                print(f"[-] Skipped (no changes): {log['date']}")
+                print(f"[-] Skipped (no changes): {day}")
         except Exception as e:
-            print(f"[!] Error inserting {log['date']}: {str(e)}")
+            print(f"[!] Error inserting {day}: {str(e)}")
+    
+    if migrated_count or inserted_count or updated_count:
+        bump_weather_version(db)
     
     # Print summary
     print("\n" + "="*60)
@@ -106,12 +202,12 @@ def import_weather_data():
     print("\n1. Hottest day:")
     hottest = weather_collection.find_one(sort=[("max_temp_celsius", -1)])
     if hottest:
-        print(f"   {hottest['date']}: {hottest['max_temp_celsius']}°C")
+        print(f"   {hottest['date']:%Y-%m-%d}: {hottest['max_temp_celsius']}°C")
     
     print("\n2. Coldest day:")
     coldest = weather_collection.find_one(sort=[("min_temp_celsius", 1)])
     if coldest:
-        print(f"   {coldest['date']}: {coldest['min_temp_celsius']}°C")
+        print(f"   {coldest['date']:%Y-%m-%d}: {coldest['min_temp_celsius']}°C")
     
     print("\n3. Days with rain:")
     rainy_days = weather_collection.count_documents({
@@ -138,8 +234,16 @@ def import_weather_data():
     client.close()
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import or migrate weather_logs")
+    parser.add_argument("--migrate", action="store_true",
+                        help="convert existing string dates to native dates and rebuild the indexes")
+    args = parser.parse_args()
+
     try:
-        import_weather_data()
+        if args.migrate:
+            migrate_weather_dates()
+        else:
+            import_weather_data()
     except Exception as e:
         print(f"\n[ERROR] {str(e)}")
         import traceback
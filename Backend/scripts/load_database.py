@@ -14,6 +14,9 @@ import sys
 sys.path.append(str(Path(__file__).parent.parent))
 
 from app.config.settings import settings
+from app.models.farmer import birth_month_day_from_cnp, payday_from_value
+from app.services.harvest_service import HarvestService
+from app.services.data_versions import bump_data_version
 
 # Helper to generate Romanian CNP
 def generate_cnp(age: int) -> str:
@@ -98,11 +101,12 @@ async def load_farmers(db, oameni_data):
             "first_name": first_name,
             "last_name": last_name,
             "cnp": cnp,
+            "birth_month_day": birth_month_day_from_cnp(cnp),
             "email": email,
             "phone": phone,
             "age": person["age"],
             "role": person["role"],
-            "payday": person["payday"],
+            "payday": payday_from_value(person.get("payday")),
             "experience_years": random.randint(1, min(person["age"] - 18, 30)),
             "experience_level": random.choices(
                 ["beginner", "intermediate", "advanced", "expert"],
@@ -237,9 +241,19 @@ async def main():
     # Step 1: Load farmers
     worker_mapping = await load_farmers(db, oameni_data)
     
+    # Cached answers over farmers (AI response cache, birthday / payday tools) are stale now
+    await bump_data_version(db, "farmers")
+    
     # Step 2: Load harvest logs
     await load_harvest_logs(db, ferma_data, worker_mapping)
     
+    # The logs were written around HarvestService: rebuild its precomputed rows
+    daily_hours_rows = await HarvestService(db).rebuild_employee_daily_hours()
+    print(f"[+] employee_daily_hours: {daily_hours_rows} (day, employee) rows")
+    
+    # Cached answers over harvest_logs (AI response cache, statistics) are stale now
+    await bump_data_version(db, "harvest_logs")
+    
     # Summary
     print("\n" + "="*60)
     print("DATABASE LOADING COMPLETE!")
@@ -0,0 +1,51 @@
+"""
+Generate app/services/correlation.py from AI/mcp_server/correlation.py.
+
+The weather - harvest correlation statistics are shared by the MCP server and
+the API, which ship separately. The AI module is the source; the Backend copy
+is this script's output and is never edited by hand. Run it after changing the
+AI module (needs the AI directory next to Backend); --check only reports
+whether the copy is out of date.
+
+Usage:
+    python scripts/sync_correlation.py
+    python scripts/sync_correlation.py --check
+"""
+import argparse
+import sys
+from pathlib import Path
+
+BACKEND_ROOT = Path(__file__).resolve().parent.parent
+SOURCE = BACKEND_ROOT.parent / "AI" / "mcp_server" / "correlation.py"
+TARGET = BACKEND_ROOT / "app" / "services" / "correlation.py"
+
+GENERATED_HEADER = (
+    "# Generated from AI/mcp_server/correlation.py by Backend/scripts/sync_correlation.py - do not edit.\n"
+)
+
+
+def generated_source() -> bytes:
+    return GENERATED_HEADER.encode() + SOURCE.read_bytes()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate the Backend copy of the correlation module")
+    parser.add_argument("--check", action="store_true", help="Only check that the copy is up to date")
+    args = parser.parse_args()
+
+    expected = generated_source()
+    current = TARGET.read_bytes() if TARGET.exists() else b""
+
+    if args.check:
+        if current != expected:
+            print(f"✗ {TARGET.relative_to(BACKEND_ROOT)} is out of date: run scripts/sync_correlation.py")
+            sys.exit(1)
+        print(f"✓ {TARGET.relative_to(BACKEND_ROOT)} is up to date")
+        return
+
+    TARGET.write_bytes(expected)
+    print(f"✓ Wrote {TARGET.relative_to(BACKEND_ROOT)}")
+
+
+if __name__ == "__main__":
+    main()